@@ -5,19 +5,167 @@ Uses Backboard API to orchestrate LLM analysis for claim verification.
 import os
 import json
 import asyncio
-from typing import Dict, Any, List
+import logging
+import re
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Dict, Any, List, Callable, Optional
 
 try:
     from backboard import BackboardClient
 except ImportError:
     BackboardClient = None
 
+from pydantic import ValidationError
+
 from app.models import (
     WitnessClaim, 
     VideoAnalysis, 
     ComparisonResult, 
-    CredibilityReport
+    CredibilityReport,
+    StructuredAnalysis
 )
+from app.config import get_settings
+from app.deadline import NO_DEADLINE, Deadline, DeadlineExceeded
+from app.models_twelvelabs.jobs import JobStage
+from app.prompt_builder import EvidencePromptBuilder
+from app.services.evidence_index import EvidenceIndex
+from app.services.llm_cache import get_llm_cache, llm_cache_key
+
+logger = logging.getLogger(__name__)
+
+ASSISTANT_NAME = "NoirVision Claim Analyzer"
+ASSISTANT_DESCRIPTION = "Forensic video analysis assistant that compares witness claims with video evidence"
+
+# "stepwise": one LLM call per report step; "structured": one JSON response for the whole report
+ANALYSIS_MODES = ("stepwise", "structured")
+# Pool threads one analysis takes: the claim parse, the comparison (reused for the
+# recommendation), the detective note and the case title
+THREADS_PER_ANALYSIS = 4
+
+
+class StructuredOutputError(ValueError):
+    """The LLM did not return valid structured JSON within the repair budget."""
+
+
+def _extract_json(response: str, open_char: str, close_char: str) -> str:
+    """Slice the outermost JSON object/array out of an LLM reply (which may wrap it in prose)."""
+    start = response.find(open_char)
+    end = response.rfind(close_char) + 1
+    if start == -1 or end <= start:
+        raise ValueError(f"No JSON {open_char}...{close_char} found in response")
+    return response[start:end]
+
+
+class AssistantPool:
+    """
+    One long-lived Backboard assistant plus a queue of pre-created threads.
+
+    Threads hold conversation history, so each analysis takes a fresh one. Used
+    threads are deleted and replacements created in background tasks, off the
+    request path. With size=0, threads are created on demand.
+    """
+
+    def __init__(self, client, *, size: int):
+        self.client = client
+        self.size = size
+        self._assistant_id: Optional[str] = None
+        self._assistant_lock: Optional[asyncio.Lock] = None
+        self._threads: List[str] = []
+        self._creating = 0
+        self._background: set = set()
+        self._closed = False
+
+    async def _get_assistant_id(self) -> str:
+        if self._assistant_id:
+            return self._assistant_id
+        if self._assistant_lock is None:
+            self._assistant_lock = asyncio.Lock()
+        async with self._assistant_lock:
+            if not self._assistant_id:
+                assistant = await self.client.create_assistant(
+                    name=ASSISTANT_NAME,
+                    description=ASSISTANT_DESCRIPTION,
+                )
+                self._assistant_id = assistant.assistant_id
+                logger.info("Backboard assistant %s created", self._assistant_id)
+        return self._assistant_id
+
+    async def _create_thread(self) -> str:
+        thread = await self.client.create_thread(await self._get_assistant_id())
+        return thread.thread_id
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _replenish(self) -> None:
+        if self._closed:
+            return
+        for _ in range(self.size - len(self._threads) - self._creating):
+            self._creating += 1
+            self._spawn(self._prewarm_one())
+
+    async def _prewarm_one(self) -> None:
+        try:
+            thread_id = await self._create_thread()
+        except Exception as e:
+            logger.warning("Backboard thread pre-warm failed: %s: %s", type(e).__name__, e)
+            return
+        finally:
+            self._creating -= 1
+        if self._closed:
+            await self._delete_thread(thread_id)
+        else:
+            self._threads.append(thread_id)
+
+    async def _delete_thread(self, thread_id: str) -> None:
+        try:
+            await self.client.delete_thread(thread_id)
+        except Exception as e:
+            logger.warning("Backboard thread cleanup failed (non-critical): %s", e)
+
+    def start(self) -> None:
+        """Begin pre-warming threads (call from a running event loop, e.g. app startup)."""
+        self._closed = False
+        self._replenish()
+
+    async def acquire(self) -> str:
+        """Take a pre-warmed thread, or create one if the pool is empty."""
+        if self._threads:
+            thread_id = self._threads.pop(0)
+        else:
+            thread_id = await self._create_thread()
+        self._replenish()
+        return thread_id
+
+    def release(self, thread_id: str) -> None:
+        """Delete a used thread in the background."""
+        self._spawn(self._delete_thread(thread_id))
+
+    @asynccontextmanager
+    async def thread(self) -> AsyncIterator[str]:
+        thread_id = await self.acquire()
+        try:
+            yield thread_id
+        finally:
+            self.release(thread_id)
+
+    async def aclose(self) -> None:
+        """Wait for background work, then delete idle threads and the assistant."""
+        self._closed = True
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        idle, self._threads = self._threads, []
+        for thread_id in idle:
+            await self._delete_thread(thread_id)
+        if self._assistant_id:
+            try:
+                await self.client.delete_assistant(self._assistant_id)
+            except Exception as e:
+                logger.warning("Backboard assistant cleanup failed (non-critical): %s", e)
+            self._assistant_id = None
+        self._assistant_lock = None
 
 
 class BackboardAnalyzer:
@@ -35,23 +183,40 @@ class BackboardAnalyzer:
         
         # Initialize Backboard client
         self.client = BackboardClient(api_key=self.api_key)
-        # Don't store assistant/thread at class level - create fresh for each request
-    
-    async def _ensure_assistant(self):
-        """Create a new assistant for this analysis."""
-        assistant = await self.client.create_assistant(
-            name="NoirVision Claim Analyzer",
-            description="Forensic video analysis assistant that compares witness claims with video evidence"
-        )
-        return assistant
+        # One shared assistant; each analysis gets its own (pre-warmed) threads
+        settings = get_settings()
+        pool_size = settings.backboard_thread_pool_size
+        if pool_size is None:
+            # Enough for a full batch of concurrent analyses without creating threads inline
+            pool_size = THREADS_PER_ANALYSIS * settings.backboard_max_concurrent_claims
+        self.pool = AssistantPool(self.client, size=pool_size)
     
-    async def _create_thread(self, assistant_id: str):
-        """Create a new conversation thread."""
-        thread = await self.client.create_thread(assistant_id)
-        return thread
-    
-    async def _send_message(self, thread_id: str, content: str, model: str = "gpt-4o-mini") -> str:
-        """Send a message and get response."""
+    async def _send_message(
+        self,
+        thread_id: str,
+        content: str,
+        model: str = "gpt-4o-mini",
+        cacheable: bool = True,
+        parse: Optional[Callable[[str], Any]] = None
+    ) -> Any:
+        """
+        Send a message and get response (or parse(response) when parse is given; its
+        errors propagate).
+        Identical (model, prompt) pairs are answered from the LLM cache; pass cacheable=False
+        for messages whose answer depends on earlier turns in the thread. Replies are only
+        cached once parse accepts them; a cached reply it rejects is evicted and re-asked.
+        """
+        cache = get_llm_cache() if cacheable else None
+        if cache is not None:
+            key = llm_cache_key(model, content)
+            cached = await cache.aget(key)
+            if cached is not None:
+                if parse is None:
+                    return cached
+                try:
+                    return parse(cached)
+                except Exception:
+                    await cache.adelete(key)
         try:
             response = await self.client.add_message(
                 thread_id=thread_id,
@@ -62,15 +227,24 @@ class BackboardAnalyzer:
             )
             
             # Extract content from MessageResponse
-            return response.content if hasattr(response, 'content') else str(response)
+            text = response.content if hasattr(response, 'content') else str(response)
         except Exception as e:
             print(f"Error in _send_message: {type(e).__name__}: {str(e)}")
             raise
+        result = parse(text) if parse is not None else text
+        if cache is not None and text:
+            await cache.aput(key, model, text)
+        return result
     
     async def analyze_claim_vs_video(
         self, 
         claim: WitnessClaim, 
-        video_analysis: VideoAnalysis
+        video_analysis: VideoAnalysis,
+        on_stage: Optional[Callable[[str], None]] = None,
+        mode: Optional[str] = None,
+        evidence_index: Optional[EvidenceIndex] = None,
+        parsed_claim: Optional[Awaitable[Dict[str, Any]]] = None,
+        deadline: Deadline = NO_DEADLINE
     ) -> CredibilityReport:
         """
         Main analysis function using Backboard.io to coordinate LLMs.
@@ -78,33 +252,188 @@ class BackboardAnalyzer:
         Args:
             claim: Witness claim/statement
             video_analysis: Video analysis data (from TwelveLabs or mock)
+            on_stage: Optional progress callback (JobStage.PARSING_CLAIM, COMPARING)
+            mode: "stepwise" or "structured" (default: BACKBOARD_ANALYSIS_MODE)
+            evidence_index: Optional index over the video's evidence; when given, the
+                comparison prompt only carries the segments retrieved for the claim facts
+            parsed_claim: Optional awaitable of the claim's structured facts, started
+                earlier (see parse_claim); stepwise analysis then skips its own parse step
+            deadline: Request time budget. Optional steps past it are skipped (report
+                marked partial); the comparison raises DeadlineExceeded
             
         Returns:
             Complete credibility report
         """
-        return await self._analyze_async(claim, video_analysis)
+        mode = mode or get_settings().backboard_analysis_mode
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode {mode!r}; expected one of {', '.join(ANALYSIS_MODES)}")
+        if mode == "structured":
+            try:
+                return await self._analyze_structured(
+                    claim, video_analysis, on_stage=on_stage, evidence_index=evidence_index, deadline=deadline
+                )
+            except StructuredOutputError as e:
+                logger.warning("Structured analysis failed, falling back to stepwise: %s", e)
+        return await self._analyze_async(
+            claim, video_analysis, on_stage=on_stage, evidence_index=evidence_index, parsed_claim=parsed_claim,
+            deadline=deadline
+        )
+    
+    async def _analyze_structured(
+        self,
+        claim: WitnessClaim,
+        video_analysis: VideoAnalysis,
+        on_stage: Optional[Callable[[str], None]] = None,
+        evidence_index: Optional[EvidenceIndex] = None,
+        deadline: Deadline = NO_DEADLINE
+    ) -> CredibilityReport:
+        """
+        Whole report from one JSON response, validated against StructuredAnalysis.
+        Invalid replies get up to BACKBOARD_STRUCTURED_MAX_REPAIRS repair requests on the
+        same thread; raises StructuredOutputError if none validates.
+        """
+        if on_stage:
+            on_stage(JobStage.COMPARING)
+        async with self.pool.thread() as thread_id:
+            prompt_video = video_analysis
+            if evidence_index is not None:
+                # No parsed facts in this mode; retrieve per claim sentence
+                queries = [claim.claim_text, *re.split(r"(?<=[.!?;])\s+", claim.claim_text)]
+                prompt_video = evidence_index.focus(video_analysis, queries, get_settings().evidence_index_top_k)
+            prompt = self._structured_prompt(claim.claim_text, prompt_video)
+            max_repairs = get_settings().backboard_structured_max_repairs
+            for attempt in range(max_repairs + 1):
+                # Repair prompts only make sense after this thread's previous reply
+                try:
+                    analysis = await deadline.run(
+                        self._send_message(
+                            thread_id, prompt, cacheable=attempt == 0, parse=self._parse_structured
+                        ),
+                        "structured analysis"
+                    )
+                    break
+                except (ValueError, ValidationError) as e:
+                    error = str(e)
+                    logger.info("Structured reply invalid (attempt %d/%d): %s", attempt + 1, max_repairs + 1, error[:200])
+                    prompt = f"""Your previous reply was not valid for the required JSON format.
+
+Problems:
+{error[:1500]}
+
+Reply again with ONLY the corrected JSON object, no other text."""
+            else:
+                raise StructuredOutputError(f"No valid structured reply after {max_repairs + 1} attempts: {error[:300]}")
+        
+        comparisons = analysis.comparisons
+        credibility_score = self._calculate_credibility_score(comparisons)
+        verdict = self._generate_verdict(credibility_score, comparisons)
+        
+        return CredibilityReport(
+            case_id=claim.case_id or self._generate_case_id(),
+            case_title=self._clean_case_title(analysis.case_title),
+            witness_claim=claim.claim_text,
+            video_analysis=video_analysis,
+            comparisons=comparisons,
+            credibility_score=credibility_score,
+            verdict=verdict,
+            recommendation=analysis.recommendation.strip(),
+            evidence_summary=self._generate_evidence_summary(
+                analysis.claim_facts.model_dump(), video_analysis, comparisons
+            ),
+            detective_note=analysis.detective_note.strip().strip('"')
+        )
+    
+    @staticmethod
+    def _parse_structured(response: str) -> StructuredAnalysis:
+        return StructuredAnalysis.model_validate_json(_extract_json(response, "{", "}"))
+    
+    def _structured_prompt(self, claim_text: str, video_analysis: VideoAnalysis) -> str:
+        return f"""You are a forensic analyst comparing a witness claim with video evidence.
+Produce the whole case file in ONE reply.
+
+WITNESS CLAIM:
+{claim_text}
+
+VIDEO EVIDENCE:
+{self._format_video_evidence(video_analysis, claim_text)}
+
+Return ONLY a JSON object with exactly this structure:
+{{
+  "claim_facts": {{
+    "time": "extracted time",
+    "location": "extracted location",
+    "suspect_description": "physical description",
+    "weapon": "weapon type or none",
+    "events": ["event1", "event2"]
+  }},
+  "comparisons": [
+    {{"category": "Time Match", "match": true, "explanation": "brief explanation"}},
+    {{"category": "Location Match", "match": true, "explanation": "brief explanation"}},
+    {{"category": "Suspect Description", "match": true, "explanation": "brief explanation"}},
+    {{"category": "Weapon Match", "match": true, "explanation": "brief explanation"}},
+    {{"category": "Event Sequence", "match": true, "explanation": "brief explanation"}}
+  ],
+  "recommendation": "1-3 lines for investigators, starting with \"→\"; mention key discrepancies",
+  "detective_note": "1-2 sentences in 1940s noir detective voice about the footage and the witness",
+  "case_title": "The [Adjective] [Noun]"
+}}
+
+Be strict: "match" is true ONLY if the video clearly supports that part of the claim."""
     
     async def _analyze_async(
         self,
         claim: WitnessClaim,
-        video_analysis: VideoAnalysis
+        video_analysis: VideoAnalysis,
+        on_stage: Optional[Callable[[str], None]] = None,
+        evidence_index: Optional[EvidenceIndex] = None,
+        parsed_claim: Optional[Awaitable[Dict[str, Any]]] = None,
+        deadline: Deadline = NO_DEADLINE
     ) -> CredibilityReport:
         """Async version of analysis."""
+        skipped: List[str] = []
         
-        # Create fresh assistant and thread for this analysis
-        assistant = await self._ensure_assistant()
-        thread = await self._create_thread(assistant.assistant_id)
-        
-        try:
+        async with self.pool.thread() as thread_id:
             # Step 1: Parse claim into structured facts using Backboard
-            structured_claim = await self._parse_claim(thread.thread_id, claim.claim_text)
+            # (or pick up the parse that was started while the video was indexed)
+            structured_claim = None
+            try:
+                if parsed_claim is not None:
+                    try:
+                        structured_claim = await deadline.run(parsed_claim, "claim parsing")
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        logger.warning("Speculative claim parse failed, parsing again: %s", e)
+                if structured_claim is None:
+                    if on_stage:
+                        on_stage(JobStage.PARSING_CLAIM)
+                    structured_claim = await deadline.run(
+                        self._parse_claim(thread_id, claim.claim_text), "claim parsing"
+                    )
+            except DeadlineExceeded as e:
+                # Compare against the raw claim text alone
+                logger.warning("%s; comparing without parsed facts", e)
+                structured_claim = self._unparsed_claim()
+                skipped.append("claim_parsing")
             
             # Step 2: Compare claim facts with video detections using Backboard
-            comparisons = await self._compare_claim_with_video(
-                thread.thread_id,
-                structured_claim, 
-                video_analysis,
-                claim.claim_text
+            if on_stage:
+                on_stage(JobStage.COMPARING)
+            prompt_video = video_analysis
+            if evidence_index is not None:
+                prompt_video = evidence_index.focus(
+                    video_analysis,
+                    self._claim_fact_queries(structured_claim, claim.claim_text),
+                    get_settings().evidence_index_top_k
+                )
+            comparisons = await deadline.run(
+                self._compare_claim_with_video(
+                    thread_id,
+                    structured_claim, 
+                    prompt_video,
+                    claim.claim_text
+                ),
+                "comparison"
             )
             
             # Step 3: Calculate credibility score
@@ -113,27 +442,41 @@ class BackboardAnalyzer:
             # Step 4: Generate verdict
             verdict = self._generate_verdict(credibility_score, comparisons)
             
-            # Step 5: Generate recommendations using Backboard
-            recommendation = await self._generate_recommendation(
-                thread.thread_id,
-                verdict, 
-                comparisons, 
-                credibility_score
+            # Steps 5-7: Recommendation, detective note and case title only need the
+            # verdict and comparisons, so run them at once (note and title on their own
+            # threads); each falls back to a canned text if it fails or times out.
+            recommendation, detective_note, case_title = await asyncio.gather(
+                self._generate_or_fallback(
+                    "recommendation",
+                    lambda tid: self._generate_recommendation(tid, verdict, comparisons, credibility_score),
+                    self._fallback_recommendation(verdict, comparisons),
+                    thread_id=thread_id,
+                    deadline=deadline,
+                    skipped=skipped,
+                ),
+                self._generate_or_fallback(
+                    "detective_note",
+                    lambda tid: self._generate_detective_note(tid, verdict, comparisons),
+                    self._fallback_detective_note(verdict, comparisons),
+                    deadline=deadline,
+                    skipped=skipped,
+                ),
+                self._generate_or_fallback(
+                    "case_title",
+                    lambda tid: self._generate_case_title(tid, claim.claim_text, verdict),
+                    self._fallback_case_title(verdict),
+                    deadline=deadline,
+                    skipped=skipped,
+                ),
             )
             
-            # Step 6: Generate evidence summary
+            # Step 8: Generate evidence summary
             evidence_summary = self._generate_evidence_summary(
                 structured_claim, 
                 video_analysis, 
                 comparisons
             )
             
-            # Step 7: Generate noir detective note using Backboard
-            detective_note = await self._generate_detective_note(thread.thread_id, verdict, comparisons)
-            
-            # Step 8: Generate case title using Backboard
-            case_title = await self._generate_case_title(thread.thread_id, claim.claim_text, verdict)
-            
             # Generate case ID if not provided
             case_id = claim.case_id or self._generate_case_id()
             
@@ -147,18 +490,22 @@ class BackboardAnalyzer:
                 verdict=verdict,
                 recommendation=recommendation,
                 evidence_summary=evidence_summary,
-                detective_note=detective_note
+                detective_note=detective_note,
+                partial=bool(skipped),
+                skipped_stages=skipped
             )
             
             return report
-            
-        finally:
-            # Cleanup (don't fail if cleanup errors)
-            try:
-                await self.client.delete_thread(thread.thread_id)
-                await self.client.delete_assistant(assistant.assistant_id)
-            except Exception as cleanup_error:
-                print(f"Warning: Cleanup failed (non-critical): {cleanup_error}")
+    
+    async def parse_claim(self, claim_text: str) -> Dict[str, Any]:
+        """
+        Parse a claim into structured facts on a pool thread of its own.
+        
+        Needs only the claim text, so callers can start it before the video evidence
+        exists and hand the result to analyze_claim_vs_video(parsed_claim=...).
+        """
+        async with self.pool.thread() as thread_id:
+            return await self._parse_claim(thread_id, claim_text)
     
     async def _parse_claim(self, thread_id: str, claim_text: str) -> Dict[str, Any]:
         """
@@ -180,20 +527,19 @@ Return format:
   "events": ["event1", "event2", ...]
 }}"""
         
-        response = await self._send_message(thread_id, prompt)
-        
         # Try to extract JSON from response
         try:
-            # Look for JSON in the response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-        except:
+            return await self._send_message(
+                thread_id, prompt, parse=lambda response: json.loads(_extract_json(response, "{", "}"))
+            )
+        except ValueError:
             pass
         
         # Fallback: parse manually if JSON extraction fails
+        return self._unparsed_claim()
+    
+    @staticmethod
+    def _unparsed_claim() -> Dict[str, Any]:
         return {
             "time": "unknown",
             "location": "unknown",
@@ -202,6 +548,17 @@ Return format:
             "events": []
         }
     
+    @staticmethod
+    def _claim_fact_queries(structured_claim: Dict[str, Any], claim_text: str) -> List[str]:
+        """One retrieval query per parsed fact (plus the whole claim)."""
+        queries = [claim_text]
+        for key in ("time", "location", "suspect_description", "weapon"):
+            value = str(structured_claim.get(key) or "")
+            if value and value.lower() not in ("unknown", "none"):
+                queries.append(value)
+        queries.extend(str(event) for event in structured_claim.get("events", []))
+        return queries
+    
     async def _compare_claim_with_video(
         self,
         thread_id: str,
@@ -212,27 +569,12 @@ Return format:
         """
         Use Backboard to compare structured claim with video detections.
         """
-        # Prepare video evidence summary
-        video_summary = f"""Video Source: {video_analysis.source}
-Duration: {video_analysis.duration}
-
-Detections:
-"""
-        for detection in video_analysis.detections:
-            video_summary += f"- {detection.timestamp}: {detection.description}\n"
-            if detection.objects:
-                video_summary += f"  Objects: {', '.join(detection.objects)}\n"
-        
-        if video_analysis.on_screen_text:
-            video_summary += f"\nOn-screen text: {video_analysis.on_screen_text}\n"
-        
-        if video_analysis.gps_metadata:
-            video_summary += f"GPS: {video_analysis.gps_metadata}\n"
-        
-        if video_analysis.speech_transcription:
-            video_summary += "\nSpeech transcription:\n"
-            for speech in video_analysis.speech_transcription:
-                video_summary += f"- {speech.get('speaker', 'Unknown')}: {speech.get('text', '')}\n"
+        claim_context = " ".join([
+            original_claim,
+            *(str(v) for k, v in structured_claim.items() if k != "events"),
+            *structured_claim.get("events", []),
+        ])
+        video_summary = self._format_video_evidence(video_analysis, claim_context)
         
         # Ask Backboard to compare
         prompt = f"""You are a forensic analyst comparing a witness claim with video evidence.
@@ -261,17 +603,17 @@ Analyze each aspect and return ONLY a JSON array with this exact format:
 
 Be strict. Mark as true ONLY if video clearly supports the claim."""
         
-        response = await self._send_message(thread_id, prompt, model="gpt-4o-mini")
-        
         # Parse response
         try:
-            start = response.find('[')
-            end = response.rfind(']') + 1
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                comparison_data = json.loads(json_str)
-                return [ComparisonResult(**item) for item in comparison_data]
-        except Exception as e:
+            return await self._send_message(
+                thread_id,
+                prompt,
+                model="gpt-4o-mini",
+                parse=lambda response: [
+                    ComparisonResult(**item) for item in json.loads(_extract_json(response, "[", "]"))
+                ]
+            )
+        except (ValueError, TypeError) as e:
             print(f"Error parsing comparison: {e}")
         
         # Fallback: return default comparisons
@@ -283,7 +625,23 @@ Be strict. Mark as true ONLY if video clearly supports the claim."""
             ComparisonResult(category="Event Sequence", match=False, explanation="Unable to compare")
         ]
     
-    def _calculate_credibility_score(self, comparisons: List[ComparisonResult]) -> int:
+    def _format_video_evidence(self, video_analysis: VideoAnalysis, claim_text: str = "") -> str:
+        """Evidence block for comparison prompts, within BACKBOARD_PROMPT_TOKEN_BUDGET."""
+        settings = get_settings()
+        built = EvidencePromptBuilder(
+            settings.backboard_prompt_token_budget,
+            dedupe_similarity=settings.backboard_prompt_dedupe_similarity,
+        ).build(video_analysis, claim_text)
+        if built.dropped:
+            logger.info(
+                "Evidence prompt: %d items, ~%d tokens; merged %d duplicates, dropped %d over budget",
+                built.included, built.tokens, built.merged, len(built.dropped) - built.merged,
+            )
+            logger.debug("Evidence left out of prompt: %s", built.dropped)
+        return built.text
+    
+    @staticmethod
+    def _calculate_credibility_score(comparisons: List[ComparisonResult]) -> int:
         """Calculate credibility score based on comparisons."""
         if not comparisons:
             return 50
@@ -291,8 +649,8 @@ Be strict. Mark as true ONLY if video clearly supports the claim."""
         matches = sum(1 for c in comparisons if c.match)
         return int((matches / len(comparisons)) * 100)
     
+    @staticmethod
     def _generate_verdict(
-        self, 
         credibility_score: int, 
         comparisons: List[ComparisonResult]
     ) -> str:
@@ -335,8 +693,8 @@ Use professional law enforcement language."""
         response = await self._send_message(thread_id, prompt, model="gpt-4o-mini")
         return response.strip()
     
+    @staticmethod
     def _generate_evidence_summary(
-        self,
         structured_claim: Dict[str, Any],
         video_analysis: VideoAnalysis,
         comparisons: List[ComparisonResult]
@@ -390,7 +748,10 @@ Format: "The [Adjective] [Noun]" (example: "The Midnight Frame", "The Shadow's T
 Be creative and match the noir detective theme. Just return the title, nothing else."""
         
         response = await self._send_message(thread_id, prompt, model="gpt-4o-mini")
-        
+        return self._clean_case_title(response)
+    
+    @staticmethod
+    def _clean_case_title(response: str) -> str:
         # Clean up the response
         title = response.strip().strip('"').strip("'")
         
@@ -400,7 +761,75 @@ Be creative and match the noir detective theme. Just return the title, nothing e
         
         return title
     
-    def _generate_case_id(self) -> str:
+    async def _generate_or_fallback(
+        self,
+        name: str,
+        generate: Callable[[str], Awaitable[str]],
+        fallback: str,
+        thread_id: Optional[str] = None,
+        deadline: Deadline = NO_DEADLINE,
+        skipped: Optional[List[str]] = None
+    ) -> str:
+        """
+        Run one generation step within BACKBOARD_GENERATION_TIMEOUT_SECONDS (and the
+        deadline), on thread_id or on a pool thread of its own. Returns fallback if the
+        step fails, times out or there is no time left; the step's name is then added
+        to skipped.
+        """
+        if deadline.expired:
+            logger.warning("No time left for Backboard %s, using fallback", name)
+            if skipped is not None:
+                skipped.append(name)
+            return fallback
+        
+        async def run() -> str:
+            if thread_id:
+                return await generate(thread_id)
+            async with self.pool.thread() as own_thread_id:
+                return await generate(own_thread_id)
+        
+        try:
+            return await asyncio.wait_for(
+                run(), timeout=deadline.cap(get_settings().backboard_generation_timeout_seconds)
+            )
+        except Exception as e:
+            logger.warning("Backboard %s failed, using fallback: %s: %s", name, type(e).__name__, e)
+            if skipped is not None:
+                skipped.append(name)
+            return fallback
+    
+    @staticmethod
+    def _fallback_recommendation(verdict: str, comparisons: List[ComparisonResult]) -> str:
+        mismatches = [c.category for c in comparisons if not c.match]
+        if verdict.startswith("CLAIM SUPPORTED"):
+            action = "→ Video corroborates the statement. Proceed with investigation."
+        elif verdict == "INCONCLUSIVE":
+            action = "→ Evidence is inconclusive. Seek additional footage or witnesses before proceeding."
+        else:
+            action = "→ Video contradicts the statement. Re-interview the witness before proceeding."
+        if mismatches:
+            action += f" Discrepancies: {', '.join(mismatches)}."
+        return action
+    
+    @staticmethod
+    def _fallback_detective_note(verdict: str, comparisons: List[ComparisonResult]) -> str:
+        matches = sum(1 for c in comparisons if c.match)
+        if verdict.startswith("CLAIM SUPPORTED"):
+            return f"The footage backs the story, {matches} of {len(comparisons)} details. Sometimes the witness tells it straight."
+        if verdict == "INCONCLUSIVE":
+            return f"The tape only gives up {matches} of {len(comparisons)} details. Not enough to hang a case on, not enough to walk away."
+        return f"The footage and the story part ways: {matches} of {len(comparisons)} details hold up. The tape doesn't lie, but people do."
+    
+    @staticmethod
+    def _fallback_case_title(verdict: str) -> str:
+        if verdict.startswith("CLAIM SUPPORTED"):
+            return "The Honest Witness"
+        if verdict == "INCONCLUSIVE":
+            return "The Grey Alibi"
+        return "The Crooked Story"
+    
+    @staticmethod
+    def _generate_case_id() -> str:
         """Generate unique case ID."""
         from datetime import datetime
         import random
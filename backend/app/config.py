@@ -7,10 +7,10 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from dotenv import load_dotenv
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Load .env from backend/ first so COGNITO_* etc. are in os.environ (reliable with uvicorn --reload)
@@ -42,6 +42,11 @@ class Settings(BaseSettings):
         default=False,
         description="If True, skip real API and return deterministic EvidencePack for demo",
     )
+    twelvelabs_mock_delay_seconds: float = Field(
+        default=0.0,
+        ge=0,
+        description="Simulated indexing time in mock mode (load and concurrency testing)",
+    )
     twelvelabs_base_url: str = Field(
         default="https://api.twelvelabs.io/v1.3",
         description="TwelveLabs API base URL",
@@ -53,6 +58,312 @@ class Settings(BaseSettings):
         description="Max seconds to wait for indexing (e.g. 8–12 min)",
     )
 
+    # TwelveLabs task poller (one scheduler for all indexing tasks in the process)
+    twelvelabs_poll_interval_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="First delay between status polls of a task",
+    )
+    twelvelabs_poll_max_interval_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Backoff cap between status polls of a task",
+    )
+    twelvelabs_poll_jitter: float = Field(
+        default=0.2,
+        ge=0,
+        le=1,
+        description="Random +/- fraction applied to each poll delay",
+    )
+    twelvelabs_poll_tick_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Timer wheel slot width; polls due in the same slot are sent together",
+    )
+    twelvelabs_poll_batch_threshold: int = Field(
+        default=3,
+        ge=1,
+        description="Due tasks at or above this count are looked up with one list-tasks call",
+    )
+    twelvelabs_poll_batch_max_pages: int = Field(
+        default=2,
+        ge=1,
+        description="Max list-tasks pages (50 tasks each) fetched per batched poll",
+    )
+
+    # TwelveLabs HTTP connection pool (one AsyncClient per process)
+    twelvelabs_http_max_connections: int = Field(
+        default=50,
+        ge=1,
+        description="Max open connections to the TwelveLabs API",
+    )
+    twelvelabs_http_max_keepalive_connections: int = Field(
+        default=20,
+        ge=0,
+        description="Max idle keep-alive connections kept in the pool",
+    )
+    twelvelabs_http_keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds an idle keep-alive connection stays open",
+    )
+    twelvelabs_http2: bool = Field(
+        default=False,
+        description="Use HTTP/2 for TwelveLabs (needs the h2 package; falls back to HTTP/1.1)",
+    )
+    twelvelabs_connect_timeout_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description="TCP/TLS connect timeout for TwelveLabs requests",
+    )
+    twelvelabs_upload_timeout_seconds: float = Field(
+        default=120.0,
+        gt=0,
+        description="Timeout for create-task requests with a file upload",
+    )
+    twelvelabs_create_timeout_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Timeout for create-task requests from a URL",
+    )
+    twelvelabs_status_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Timeout for task status polls",
+    )
+    twelvelabs_summarize_timeout_seconds: float = Field(
+        default=120.0,
+        gt=0,
+        description="Timeout for summarize / analyze (LLM-backed) requests",
+    )
+    twelvelabs_evidence_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=4,
+        description="Max evidence sections (transcript/chapters/highlights/summary) fetched at once",
+    )
+    twelvelabs_section_timeout_seconds: float = Field(
+        default=150.0,
+        gt=0,
+        description="Per-section deadline when building an EvidencePack; a late section is left empty",
+    )
+
+    # Uploads (/analyze/complete video_file)
+    max_upload_bytes: int = Field(
+        default=2 * 1024**3,
+        ge=1,
+        description="Largest accepted video upload; larger requests get 413 before the body is read",
+    )
+    upload_chunk_bytes: int = Field(
+        default=1024 * 1024,
+        ge=4096,
+        description="Chunk size used when spooling uploads to disk",
+    )
+    upload_tmp_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for spooled uploads (default: system temp dir)",
+    )
+
+    # Direct uploads (browser → S3 presigned multipart, /api/videos/uploads)
+    direct_upload_max_bytes: int = Field(
+        default=50 * 1024**3,
+        ge=1,
+        description="Largest video accepted for a direct-to-S3 upload",
+    )
+    direct_upload_part_bytes: int = Field(
+        default=64 * 1024**2,
+        ge=5 * 1024**2,
+        description="Preferred part size (S3 minimum 5 MiB); raised for files that would need >10000 parts",
+    )
+    direct_upload_url_expires_seconds: int = Field(
+        default=3600,
+        ge=60,
+        le=7 * 24 * 3600,
+        description="Validity of presigned part URLs",
+    )
+
+    # EvidencePack cache (skip re-indexing identical videos)
+    evidence_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse EvidencePacks for identical uploads / YouTube videos",
+    )
+    evidence_cache_ttl_seconds: int = Field(
+        default=7 * 24 * 3600,
+        ge=60,
+        description="How long a cached EvidencePack is reused",
+    )
+    evidence_cache_max_entries: int = Field(
+        default=128,
+        ge=1,
+        description="In-memory tier size (LRU)",
+    )
+    evidence_cache_tier: str = Field(
+        default="disk",
+        description="Second cache tier: disk | s3 | none",
+    )
+    evidence_cache_dir: str = Field(
+        default="./evidence_cache",
+        description="Directory for the disk tier",
+    )
+    evidence_cache_disk_max_entries: int = Field(
+        default=2000,
+        ge=1,
+        description="Disk tier size; least recently used files are pruned beyond this",
+    )
+
+    # Evidence read cache (GET /api/videos/{video_id}/evidence; see app.services.evidence_read_cache)
+    evidence_read_cache_enabled: bool = Field(
+        default=True,
+        description="Serve evidence from a local cache, revalidated against S3 with ETags",
+    )
+    evidence_read_cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        description="In-memory tier size (LRU)",
+    )
+    evidence_read_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="In-memory tier size in bytes of cached response bodies",
+    )
+    evidence_read_cache_revalidate_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="Serve a cached pack without asking S3 for this long; then revalidate (0 = every request)",
+    )
+    evidence_read_cache_dir: str = Field(
+        default="",
+        description="Directory for an optional disk tier (empty = memory only)",
+    )
+    evidence_read_cache_disk_max_entries: int = Field(
+        default=2000,
+        ge=1,
+        description="Disk tier size; least recently used files are pruned beyond this",
+    )
+
+    # Overall time budget (deadline shared by indexing, evidence and Backboard steps)
+    analysis_deadline_seconds: float = Field(
+        default=0,
+        ge=0,
+        description="Budget per analysis request; past it a partial report is returned (0 = no budget)",
+    )
+    analysis_deadline_reserve_seconds: float = Field(
+        default=30,
+        ge=0,
+        description=(
+            "Part of the budget kept for Backboard analysis; evidence building stops this much "
+            "earlier (at most half the time left when it starts)"
+        ),
+    )
+
+    # Evidence retrieval (vector index over EvidencePack segments)
+    evidence_index_enabled: bool = Field(
+        default=True,
+        description="Send only claim-relevant evidence segments to the comparison prompt",
+    )
+    evidence_index_min_segments: int = Field(
+        default=40,
+        ge=1,
+        description="Below this many segments all evidence is sent and no index is built",
+    )
+    evidence_index_top_k: int = Field(
+        default=6,
+        ge=1,
+        description="Segments retrieved per claim fact",
+    )
+    evidence_index_dim: int = Field(
+        default=512,
+        ge=64,
+        description="Dimension of the hashing embedder",
+    )
+    evidence_index_max_entries: int = Field(
+        default=2000,
+        ge=1,
+        description="Saved indexes kept under EVIDENCE_CACHE_DIR/index; least recently used are pruned beyond this",
+    )
+
+    # Backboard claim analysis
+    triage_tier: Literal["llm", "fast", "auto"] = Field(
+        default="llm",
+        description=(
+            "llm: Backboard comparison; fast: rule-based only; auto: rules, Backboard when "
+            "INCONCLUSIVE or a contradiction rests on facts the claim does not mention"
+        ),
+    )
+    backboard_analysis_mode: Literal["stepwise", "structured"] = Field(
+        default="stepwise",
+        description="stepwise: one LLM call per report step; structured: one JSON reply for the whole report",
+    )
+    backboard_structured_max_repairs: int = Field(
+        default=1,
+        ge=0,
+        le=3,
+        description="Repair requests sent when a structured reply fails validation (then stepwise is used)",
+    )
+    backboard_speculative_parse: bool = Field(
+        default=True,
+        description="Parse the claim while the video is still being indexed (/analyze/complete and its jobs)",
+    )
+    backboard_thread_pool_size: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description=(
+            "Pre-created Backboard threads kept ready on the shared assistant (0 = create on demand). "
+            "An analysis takes up to 4; default: 4 x BACKBOARD_MAX_CONCURRENT_CLAIMS"
+        ),
+    )
+    backboard_prompt_token_budget: int = Field(
+        default=6000,
+        ge=500,
+        description="Approximate token budget for the video evidence section of comparison prompts",
+    )
+    backboard_prompt_dedupe_similarity: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        description="Word-overlap (Jaccard) at which two nearby detections are merged in prompts",
+    )
+    backboard_generation_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Deadline for each report text step (recommendation, note, title) before its fallback is used",
+    )
+    backboard_max_concurrent_claims: int = Field(
+        default=4,
+        ge=1,
+        description="Claims evaluated at once by /analyze/batch (each is its own LLM conversation)",
+    )
+    batch_max_claims: int = Field(
+        default=20,
+        ge=1,
+        description="Most claims accepted in one /analyze/batch request",
+    )
+
+    # LLM response cache (Backboard calls keyed by model + prompt)
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse Backboard responses for identical prompts",
+    )
+    llm_cache_ttl_seconds: int = Field(
+        default=7 * 24 * 3600,
+        ge=60,
+        description="How long a cached LLM response is reused",
+    )
+    llm_cache_max_entries: int = Field(
+        default=512,
+        ge=1,
+        description="In-memory tier size (LRU)",
+    )
+    llm_cache_path: str = Field(
+        default="./llm_cache.db",
+        description="SQLite file for the persistent tier (empty = memory only)",
+    )
+    llm_cache_disk_max_entries: int = Field(
+        default=20000,
+        ge=1,
+        description="SQLite tier size; least recently used entries are evicted beyond this",
+    )
+
     # AWS / S3
     s3_bucket: str = Field(
         default="",
@@ -70,6 +381,66 @@ class Settings(BaseSettings):
         default=None,
         description="AWS secret key (optional if using instance/profile)",
     )
+    aws_endpoint_url: Optional[str] = Field(
+        default=None,
+        description="Override the S3/DynamoDB endpoint (LocalStack, MinIO, moto server)",
+    )
+
+    # Object storage backend (see app.services.object_store)
+    storage_backend: str = Field(
+        default="s3",
+        pattern="^(s3|local)$",
+        description="s3 | local (files under STORAGE_LOCAL_ROOT; no AWS needed, no direct uploads)",
+    )
+    storage_local_root: str = Field(
+        default="./object_store",
+        description="Root directory of the local storage backend",
+    )
+    storage_mmap_min_bytes: int = Field(
+        default=1024 * 1024,
+        ge=1,
+        description="Local backend: objects at least this large are read via mmap",
+    )
+
+    # S3 JSON objects (EvidencePacks, job results; see app.services.evidence_codec)
+    s3_json_compression: str = Field(
+        default="gzip",
+        pattern="^(none|gzip|zstd)$",
+        description="Compression for JSON written to S3: none | gzip | zstd (zstd needs the zstandard package)",
+    )
+    s3_json_compression_level: int = Field(
+        default=0,
+        ge=0,
+        le=22,
+        description="Compression level (0 = codec default: gzip 6, zstd 3); gzip accepts 1-9, zstd 1-22",
+    )
+    s3_json_compress_min_bytes: int = Field(
+        default=1024,
+        ge=0,
+        description="Objects smaller than this are stored uncompressed",
+    )
+
+    # AWS client pool (one S3 client per process, one DynamoDB resource per thread)
+    aws_max_pool_connections: int = Field(
+        default=50,
+        ge=1,
+        description="HTTP connections kept per boto3 client; should cover the threads calling AWS at once",
+    )
+    aws_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Attempts per AWS call, with adaptive retry mode (client-side rate limiting on throttling)",
+    )
+    aws_connect_timeout_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        description="Connect timeout for AWS calls",
+    )
+    aws_read_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Read timeout for AWS calls",
+    )
 
     # App
     environment: str = Field(default="development", description="development | staging | production")
@@ -77,6 +448,73 @@ class Settings(BaseSettings):
         default="sqlite:///./noirvision_jobs.db",
         description="SQLite DB for job metadata",
     )
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000,
+        ge=0,
+        description="How long a connection waits for another writer before 'database is locked'",
+    )
+    sqlite_synchronous: str = Field(
+        default="NORMAL",
+        pattern="^(?i:OFF|NORMAL|FULL|EXTRA)$",
+        description="PRAGMA synchronous; NORMAL is durable in WAL mode except for the last commits on power loss",
+    )
+    sqlite_pool_size: int = Field(
+        default=8,
+        ge=1,
+        description="Pooled SQLite connections kept open (threads polling/writing jobs at once)",
+    )
+    sqlite_max_overflow: int = Field(
+        default=24,
+        ge=0,
+        description="Extra connections opened under load beyond SQLITE_POOL_SIZE",
+    )
+    job_events_poll_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="How often job event streams re-read job progress from the DB",
+    )
+    job_events_keepalive_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        description="Idle interval before an SSE keep-alive comment is sent",
+    )
+
+    # Job queue (/api/videos/analyze jobs on the jobs table; see app.job_queue)
+    job_workers: int = Field(
+        default=2,
+        ge=0,
+        description="Queue workers inside the API process (0 = API only enqueues; run python -m app.worker)",
+    )
+    job_worker_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Jobs run at once by a standalone worker process (python -m app.worker)",
+    )
+    job_lease_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Visibility timeout: a job whose lease is not renewed within this is claimable again",
+    )
+    job_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Attempts per job before it is marked failed",
+    )
+    job_retry_backoff_seconds: float = Field(
+        default=15.0,
+        ge=0,
+        description="Delay before the first retry; doubles with each further attempt",
+    )
+    job_retry_max_backoff_seconds: float = Field(
+        default=600.0,
+        ge=0,
+        description="Cap on the retry delay",
+    )
+    job_poll_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        description="How often idle workers check the queue (jobs submitted in-process wake them at once)",
+    )
 
     # DynamoDB – user profile and incidents (keyed by Cognito sub)
     dynamodb_table_name: str = Field(
@@ -117,6 +555,12 @@ class Settings(BaseSettings):
         alt = getenv("TWELVE_LABS_API_KEY")
         return alt or v
 
+    @model_validator(mode="after")
+    def compression_level_fits_codec(self):
+        if self.s3_json_compression == "gzip" and self.s3_json_compression_level > 9:
+            raise ValueError("S3_JSON_COMPRESSION_LEVEL must be 0-9 for gzip (10-22 are zstd only)")
+        return self
+
     def require_twelvelabs(self) -> None:
         """Call at startup if TwelveLabs is needed (non-mock)."""
         if self.twelvelabs_mock:
@@ -133,8 +577,8 @@ class Settings(BaseSettings):
             )
 
     def require_s3(self) -> None:
-        """Call at startup if S3 is required."""
-        if not self.s3_bucket:
+        """Call when object storage is required (S3, unless STORAGE_BACKEND=local)."""
+        if self.storage_backend == "s3" and not self.s3_bucket:
             raise ValueError("Missing required env: S3_BUCKET")
 
 
@@ -1,55 +1,147 @@
 """
 SQLite job storage via SQLModel.
 Single table for analyze jobs.
+
+File databases run in WAL mode so status polls (the busiest endpoint) read while
+workers write; writers wait up to SQLITE_BUSY_TIMEOUT_MS instead of failing with
+"database is locked".
 """
 from __future__ import annotations
 
 from contextlib import contextmanager
 from datetime import datetime
+import threading
 from typing import Generator, Optional
 import uuid
 
-from sqlmodel import Session, SQLModel, create_engine, Field as SqlField
+from sqlalchemy import Index, event, or_, tuple_, update
+from sqlalchemy.engine import make_url
+from sqlmodel import Session, SQLModel, create_engine, select, Field as SqlField
 
 from app.config import get_settings
-from app.models_twelvelabs.jobs import JobStatus
+from app.models_twelvelabs.jobs import JobKind, JobStatus
 
 
 class Job(SQLModel, table=True):
     __tablename__ = "jobs"
+    # Newest-first listings (list_jobs) and queue claims (oldest pending first) walk
+    # these in order; job_id makes the keyset order total.
+    __table_args__ = (
+        Index("ix_jobs_project_created", "project_id", "created_at", "job_id"),
+        Index("ix_jobs_status_created", "status", "created_at", "job_id"),
+        Index("ix_jobs_created", "created_at", "job_id"),
+    )
 
     job_id: str = SqlField(primary_key=True)
-    project_id: str = SqlField(index=True)
+    project_id: str = SqlField()
     claim: str = SqlField()
-    status: str = SqlField(index=True)
-    video_id: Optional[str] = SqlField(default=None)
+    status: str = SqlField()
+    kind: str = SqlField(default=JobKind.EVIDENCE)
+    stage: Optional[str] = SqlField(default=None)
+    video_id: Optional[str] = SqlField(default=None, index=True)
     source_type: Optional[str] = SqlField(default=None)
     source_url: Optional[str] = SqlField(default=None)
     error_message: Optional[str] = SqlField(default=None)
     created_at: datetime = SqlField(default_factory=datetime.utcnow)
     updated_at: datetime = SqlField(default_factory=datetime.utcnow)
-
+    # Queue bookkeeping (see app.job_queue)
+    attempts: int = SqlField(default=0)
+    available_at: Optional[datetime] = SqlField(default=None)
+    lease_owner: Optional[str] = SqlField(default=None)
+    lease_expires_at: Optional[datetime] = SqlField(default=None)
+
+
+# Columns added after the first release; create_all() does not alter existing tables.
+_ADDED_COLUMNS = {
+    "kind": f"VARCHAR NOT NULL DEFAULT '{JobKind.EVIDENCE}'",
+    "stage": "VARCHAR",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "available_at": "DATETIME",
+    "lease_owner": "VARCHAR",
+    "lease_expires_at": "DATETIME",
+}
 
 _engine = None
+_engine_lock = threading.Lock()
+
+
+def _ensure_schema(engine) -> None:
+    """Add columns and indexes missing from a jobs table created by an older version."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        existing = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(jobs)")}
+        for name, ddl in _ADDED_COLUMNS.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE jobs ADD COLUMN {name} {ddl}")
+        for index in Job.__table__.indexes:
+            columns = ", ".join(column.name for column in index.columns)
+            conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {index.name} ON jobs ({columns})")
+
+
+def _is_file_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _create_engine(url_str: str):
+    settings = get_settings()
+    url = make_url(url_str)
+    if not _is_file_sqlite(url):
+        return create_engine(url_str, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url_str,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.sqlite_busy_timeout_ms / 1000,
+        },
+        # One connection per thread that touches the DB (asyncio.to_thread workers,
+        # sync endpoints); SQLite connections are cheap but re-running pragmas is not free.
+        pool_size=settings.sqlite_pool_size,
+        max_overflow=settings.sqlite_max_overflow,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record) -> None:
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.close()
+
+    return engine
 
 
 def get_engine():
     global _engine
     if _engine is None:
-        url = get_settings().sqlite_database_url
-        _engine = create_engine(url, connect_args={"check_same_thread": False})
-        SQLModel.metadata.create_all(_engine)
+        # Threads hitting a cold engine at once must not race create_all()
+        with _engine_lock:
+            if _engine is None:
+                engine = _create_engine(get_settings().sqlite_database_url)
+                SQLModel.metadata.create_all(engine)
+                _ensure_schema(engine)
+                _engine = engine
     return _engine
 
 
 @contextmanager
 def session() -> Generator[Session, None, None]:
     engine = get_engine()
-    with Session(engine) as s:
+    # Objects stay readable after commit without another SELECT per row
+    with Session(engine, expire_on_commit=False) as s:
         yield s
 
 
-def create_job(project_id: str, claim: str, source_type: str, source_url: str) -> Job:
+def create_job(
+    project_id: str,
+    claim: str,
+    source_type: str,
+    source_url: str,
+    *,
+    kind: str = JobKind.EVIDENCE,
+    stage: Optional[str] = None,
+) -> Job:
     job_id = str(uuid.uuid4())
     with session() as s:
         job = Job(
@@ -57,12 +149,13 @@ def create_job(project_id: str, claim: str, source_type: str, source_url: str) -
             project_id=project_id,
             claim=claim,
             status=JobStatus.PENDING,
+            kind=kind,
+            stage=stage,
             source_type=source_type,
             source_url=source_url,
         )
         s.add(job)
         s.commit()
-        s.refresh(job)
     return job
 
 
@@ -90,16 +183,54 @@ def update_job_status(
             job.error_message = error_message
         s.add(job)
         s.commit()
-        s.refresh(job)
     return job
 
 
+def update_job_stage(job_id: str, stage: str) -> bool:
+    """
+    Record pipeline progress (see JobStage) for a processing job. Repeats of the current
+    stage (e.g. COMPARING once per claim in a batch) are coalesced into no write at all.
+    Returns True if the stage changed.
+    """
+    with session() as s:
+        result = s.exec(
+            update(Job)
+            .where(Job.job_id == job_id, or_(Job.stage.is_(None), Job.stage != stage))
+            .values(stage=stage, updated_at=datetime.utcnow())
+        )
+        s.commit()
+    return result.rowcount == 1
+
+
 def get_job_by_video_id(video_id: str, project_id: Optional[str] = None) -> Optional[Job]:
     """Find a job by video_id; optionally restrict to project_id."""
-    from sqlmodel import select
     with session() as s:
         stmt = select(Job).where(Job.video_id == video_id)
         if project_id:
             stmt = stmt.where(Job.project_id == project_id)
         stmt = stmt.limit(1)
         return s.exec(stmt).first()
+
+
+def list_jobs(
+    *,
+    project_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 50,
+    after: Optional[tuple[datetime, str]] = None,
+) -> list[Job]:
+    """
+    Jobs newest first, optionally filtered by project and/or status. Keyset pagination:
+    pass the (created_at, job_id) of the last job of the previous page as `after`, so
+    each page is an index range scan however deep it is.
+    """
+    stmt = select(Job)
+    if project_id:
+        stmt = stmt.where(Job.project_id == project_id)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if after is not None:
+        stmt = stmt.where(tuple_(Job.created_at, Job.job_id) < tuple_(*after))
+    stmt = stmt.order_by(Job.created_at.desc(), Job.job_id.desc()).limit(limit)
+    with session() as s:
+        return list(s.exec(stmt).all())
@@ -0,0 +1,87 @@
+"""
+Per-request time budget shared by every pipeline stage.
+
+A Deadline is created once per request (ANALYSIS_DEADLINE_SECONDS) and passed down to
+TwelveLabs indexing, evidence building and each Backboard step. Stages cap their own
+timeouts with `cap()`; optional stages check `expired` and are skipped (the report is
+then marked partial), required ones raise DeadlineExceeded.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out before a required stage finished."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Time budget exhausted during {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """Absolute point on the monotonic clock; unbounded when created with no budget."""
+
+    def __init__(self, expires_at: float = math.inf):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> "Deadline":
+        """Deadline `seconds` from now; None or 0 means no budget."""
+        if not seconds:
+            return cls()
+        return cls(time.monotonic() + seconds)
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at != math.inf
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: Optional[float]) -> Optional[float]:
+        """The smaller of timeout and the time left (None stays None when unbounded)."""
+        if not self.bounded:
+            return timeout
+        return self.remaining() if timeout is None else min(timeout, self.remaining())
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """
+        Earlier deadline that leaves `seconds` of the budget for later stages. The reserve
+        is capped at half the time left, so the current stage always gets a share.
+        """
+        if not self.bounded:
+            return self
+        return Deadline(self.expires_at - min(seconds, self.remaining() / 2))
+
+    def check(self, stage: str) -> None:
+        if self.expired:
+            raise DeadlineExceeded(stage)
+
+    async def run(self, aw: Awaitable[T], stage: str, timeout: Optional[float] = None) -> T:
+        """Await aw within min(timeout, time left); DeadlineExceeded if the budget ran out."""
+        if self.expired:
+            if asyncio.iscoroutine(aw):
+                aw.close()
+            raise DeadlineExceeded(stage)
+        try:
+            return await asyncio.wait_for(aw, timeout=self.cap(timeout))
+        except asyncio.TimeoutError:
+            if self.expired:
+                raise DeadlineExceeded(stage) from None
+            raise
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s)" if self.bounded else "Deadline(unbounded)"
+
+
+NO_DEADLINE = Deadline()
@@ -0,0 +1,332 @@
+"""
+Rule-based claim triage: compares a witness claim with an EvidencePack without any LLM.
+Produces the same five ComparisonResult categories as BackboardAnalyzer._compare_claim_with_video
+using lexical matching (time of day, places, descriptors, weapons) and the order of actions on
+the evidence timeline. Runs in milliseconds; meant for pre-screening, with LLM escalation for
+inconclusive or weakly grounded results (tier "auto", see needs_escalation).
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from app.backboard_agent import BackboardAnalyzer
+from app.models import ComparisonResult, CredibilityReport, VideoAnalysis, WitnessClaim
+from app.models_twelvelabs.evidence import EvidencePack
+
+# "llm": Backboard only; "fast": rules only; "auto": rules, then Backboard if needs_escalation
+TRIAGE_TIERS = ("llm", "fast", "auto")
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_CLOCK = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?(?=\W|$)")
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "by", "for", "with",
+    "from", "into", "onto", "near", "was", "were", "is", "are", "be", "been", "it", "he", "she",
+    "they", "i", "we", "me", "him", "her", "them", "his", "their", "my", "our", "that", "this",
+    "then", "there", "who", "which", "what", "saw", "see", "seen", "around", "about", "just",
+    "some", "very", "had", "has", "have", "did", "do", "does", "not", "no", "while", "when",
+}
+
+_PERIOD_TERMS = {
+    "night": {"night", "nighttime", "dark", "darkness", "midnight", "streetlight", "streetlights",
+              "headlights", "moonlight", "late"},
+    "morning": {"morning", "dawn", "sunrise", "daylight"},
+    "afternoon": {"afternoon", "noon", "midday", "daylight", "sunny", "daytime"},
+    "evening": {"evening", "dusk", "sunset", "twilight"},
+}
+
+_PLACES = {
+    "alley", "street", "road", "avenue", "highway", "intersection", "parking", "lot", "garage",
+    "store", "shop", "bank", "park", "station", "building", "house", "apartment", "bar",
+    "restaurant", "gas", "corner", "sidewalk", "bridge", "school", "office", "warehouse",
+    "mall", "market", "hotel", "motel", "club", "church", "yard", "driveway", "entrance",
+    "doorway", "stairs", "elevator", "lobby", "platform", "bus", "train", "subway", "car",
+}
+_PLACE_PREPOSITIONS = {"at", "in", "near", "outside", "inside", "behind", "across"}
+
+_DESCRIPTORS = {
+    "man", "woman", "male", "female", "boy", "girl", "tall", "short", "heavy", "thin", "skinny",
+    "young", "old", "older", "bald", "beard", "mustache", "glasses", "tattoo", "mask", "masked",
+    "hood", "hoodie", "hooded", "jacket", "coat", "shirt", "jeans", "pants", "hat", "cap",
+    "beanie", "backpack", "sneakers", "boots", "gloves", "red", "blue", "black", "white",
+    "green", "yellow", "gray", "grey", "brown", "orange", "purple", "dark", "light", "blond",
+    "blonde",
+}
+
+_WEAPON_GROUPS = {
+    "firearm": {"gun", "guns", "pistol", "handgun", "revolver", "rifle", "shotgun", "firearm", "shot",
+                "shots", "shooting", "armed"},
+    "blade": {"knife", "knives", "blade", "machete", "stabbed", "stabbing", "dagger"},
+    "blunt": {"bat", "club", "crowbar", "pipe", "hammer", "baton"},
+}
+_UNARMED = {"unarmed", "no weapon", "without a weapon", "empty-handed", "empty handed"}
+
+# Mismatches that only mean the claim says nothing about the category
+_NO_TIME = "Claim gives no time to check"
+_NO_LOCATION = "Claim names no location"
+_NO_DESCRIPTION = "Claim gives no suspect description"
+_NO_WEAPON = "Claim does not address a weapon"
+_NO_ACTIONS = "Claim describes no actions"
+_UNADDRESSED = {_NO_TIME, _NO_LOCATION, _NO_DESCRIPTION, _NO_WEAPON, _NO_ACTIONS}
+
+_ACTION_SUFFIXES = ("ing", "ed", "es", "s")
+_ACTIONS = {
+    "run", "walk", "enter", "exit", "leave", "grab", "steal", "hit", "punch", "kick", "push",
+    "shove", "fight", "chase", "flee", "drive", "jump", "climb", "break", "smash", "shoot",
+    "stab", "point", "threaten", "attack", "fall", "drop", "throw", "open", "close", "stop",
+    "hide", "park", "crash", "yell", "shout", "scream", "approach", "follow", "escape",
+}
+_IRREGULAR_VERBS = {
+    "ran": "run", "left": "leave", "stole": "steal", "fled": "flee", "drove": "drive",
+    "broke": "break", "shot": "shoot", "fell": "fall", "threw": "throw", "hid": "hide",
+}
+
+
+@dataclass
+class _Evidence:
+    """Lowercased evidence text plus time-sorted (time, stemmed tokens) entries for ordering."""
+
+    text: str
+    tokens: set[str]
+    timeline: list[tuple[float, list[str]]] = field(default_factory=list)
+
+
+def _tokens(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _stem(token: str) -> str:
+    """Crude verb stem so "grabbed", "grabs" and "grab" (and "ran"/"runs") compare equal."""
+    token = _IRREGULAR_VERBS.get(token, token)
+    for suffix in _ACTION_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[: -len(suffix)]
+            break
+    if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiouls":
+        token = token[:-1]  # grabb -> grab, runn -> run
+    if len(token) > 3 and token.endswith("e") and not token.endswith("ee"):
+        token = token[:-1]  # drive / driv(es) -> driv
+    return token
+
+
+_ACTION_STEMS = {_stem(action) for action in _ACTIONS}
+
+
+def _collect_evidence(evidence: EvidencePack) -> _Evidence:
+    parts = [evidence.transcript]
+    timeline: list[tuple[float, list[str]]] = []
+    for event in evidence.events:
+        line = f"{event.label} {event.evidence}"
+        parts.append(line)
+        timeline.append((event.t, [_stem(t) for t in _tokens(line)]))
+    for chapter in evidence.chapters:
+        parts.append(chapter.summary)
+        timeline.append((chapter.start, [_stem(t) for t in _tokens(chapter.summary)]))
+    for quote in evidence.key_quotes:
+        parts.append(quote.text)
+        timeline.append((quote.t, [_stem(t) for t in _tokens(quote.text)]))
+    timeline.sort(key=lambda item: item[0])
+    text = " ".join(parts).lower()
+    return _Evidence(text=text, tokens=set(_tokens(text)), timeline=timeline)
+
+
+def _found(terms: Iterable[str], evidence: _Evidence) -> list[str]:
+    return sorted(t for t in set(terms) if t in evidence.tokens)
+
+
+# ---------- Categories ----------
+
+
+def _claim_period(claim_text: str, words: list[str]) -> Optional[str]:
+    for match in _CLOCK.finditer(claim_text.lower()):
+        hour, minute, meridiem = match.groups()
+        if not meridiem and not minute:
+            continue  # a bare number is not a time
+        hour = int(hour) % 12 if meridiem else int(hour)
+        if meridiem and meridiem.startswith("p"):
+            hour += 12
+        if hour >= 20 or hour < 5:
+            return "night"
+        if hour < 12:
+            return "morning"
+        return "afternoon" if hour < 17 else "evening"
+    for period, terms in _PERIOD_TERMS.items():
+        if period in words or (terms & set(words)) - {"late", "dark"}:
+            return period
+    return None
+
+
+def _compare_time(claim_text: str, words: list[str], evidence: _Evidence) -> ComparisonResult:
+    period = _claim_period(claim_text, words)
+    if period is None:
+        return ComparisonResult(category="Time Match", match=False, explanation=_NO_TIME)
+    hits = _found(_PERIOD_TERMS[period], evidence)
+    if hits:
+        return ComparisonResult(
+            category="Time Match", match=True,
+            explanation=f"Claim places it in the {period}; footage mentions {', '.join(hits)}",
+        )
+    return ComparisonResult(
+        category="Time Match", match=False,
+        explanation=f"Claim places it in the {period}; no matching time-of-day cues in footage",
+    )
+
+
+def _claim_places(words: list[str]) -> set[str]:
+    places = {w for w in words if w in _PLACES}
+    for i, word in enumerate(words):
+        if word in _PLACE_PREPOSITIONS:
+            for follower in words[i + 1:i + 3]:
+                if follower not in _STOPWORDS and not follower.isdigit():
+                    places.add(follower)
+                    break
+    return places
+
+
+def _compare_location(words: list[str], evidence: _Evidence) -> ComparisonResult:
+    places = _claim_places(words)
+    if not places:
+        return ComparisonResult(category="Location Match", match=False, explanation=_NO_LOCATION)
+    hits = _found(places, evidence)
+    if hits:
+        return ComparisonResult(
+            category="Location Match", match=True,
+            explanation=f"Footage shows the named place: {', '.join(hits)}",
+        )
+    return ComparisonResult(
+        category="Location Match", match=False,
+        explanation=f"No sign of {', '.join(sorted(places))} in footage",
+    )
+
+
+def _compare_suspect(words: list[str], evidence: _Evidence) -> ComparisonResult:
+    descriptors = {w for w in words if w in _DESCRIPTORS}
+    if not descriptors:
+        return ComparisonResult(
+            category="Suspect Description", match=False, explanation=_NO_DESCRIPTION,
+        )
+    hits = _found(descriptors, evidence)
+    missing = sorted(descriptors - set(hits))
+    if hits and len(hits) * 2 >= len(descriptors):
+        detail = f"Footage matches {', '.join(hits)}"
+        if missing:
+            detail += f"; not seen: {', '.join(missing)}"
+        return ComparisonResult(category="Suspect Description", match=True, explanation=detail)
+    return ComparisonResult(
+        category="Suspect Description", match=False,
+        explanation=f"Description not supported by footage (not seen: {', '.join(missing)})",
+    )
+
+
+def _weapon_groups(tokens: set[str]) -> set[str]:
+    return {group for group, terms in _WEAPON_GROUPS.items() if terms & tokens}
+
+
+def _compare_weapon(claim_text: str, words: list[str], evidence: _Evidence) -> ComparisonResult:
+    claimed = _weapon_groups(set(words))
+    shown = _weapon_groups(evidence.tokens)
+    unarmed = any(phrase in claim_text.lower() for phrase in _UNARMED)
+    if claimed:
+        if claimed & shown:
+            return ComparisonResult(
+                category="Weapon Match", match=True,
+                explanation=f"Footage shows a {', '.join(sorted(claimed & shown))} as claimed",
+            )
+        return ComparisonResult(
+            category="Weapon Match", match=False,
+            explanation=f"Claimed {', '.join(sorted(claimed))} not seen in footage",
+        )
+    if shown:
+        return ComparisonResult(
+            category="Weapon Match", match=False,
+            explanation=f"Footage shows a {', '.join(sorted(shown))} the claim does not mention",
+        )
+    return ComparisonResult(
+        category="Weapon Match", match=unarmed,
+        explanation="No weapon in claim or footage" if unarmed else _NO_WEAPON,
+    )
+
+
+def _compare_sequence(words: list[str], evidence: _Evidence) -> ComparisonResult:
+    actions: list[str] = []
+    for word in words:
+        stem = _stem(word)
+        if stem in _ACTION_STEMS and stem not in actions:
+            actions.append(stem)
+    if not actions:
+        return ComparisonResult(category="Event Sequence", match=False, explanation=_NO_ACTIONS)
+    # First sighting of each action as (time, word position), so two actions in one
+    # chapter summary are still ordered
+    times: list[tuple[str, float]] = []
+    sightings: list[tuple[float, int]] = []
+    for action in actions:
+        for t, stems in evidence.timeline:
+            if action in stems:
+                times.append((action, t))
+                sightings.append((t, stems.index(action)))
+                break
+    in_order = all(a <= b for a, b in zip(sightings, sightings[1:]))
+    if times and len(times) * 2 >= len(actions) and in_order:
+        return ComparisonResult(
+            category="Event Sequence", match=True,
+            explanation="Actions appear in claimed order: " + " → ".join(f"{a} ({t:.0f}s)" for a, t in times),
+        )
+    if times and not in_order:
+        detail = "Actions appear out of claimed order: " + ", ".join(f"{a} at {t:.0f}s" for a, t in times)
+    else:
+        detail = f"Only {len(times)} of {len(actions)} claimed actions found in footage"
+    return ComparisonResult(category="Event Sequence", match=False, explanation=detail)
+
+
+# ---------- Public API ----------
+
+
+def triage_claim(claim_text: str, evidence: EvidencePack) -> List[ComparisonResult]:
+    """Compare a claim with evidence; same categories as the Backboard comparison."""
+    words = _tokens(claim_text)
+    ev = _collect_evidence(evidence)
+    return [
+        _compare_time(claim_text, words, ev),
+        _compare_location(words, ev),
+        _compare_suspect(words, ev),
+        _compare_weapon(claim_text, words, ev),
+        _compare_sequence(words, ev),
+    ]
+
+
+def needs_escalation(report: CredibilityReport) -> bool:
+    """
+    Whether tier "auto" should ask Backboard: the verdict is INCONCLUSIVE, or it is a
+    contradiction that rests on categories the claim never mentions.
+    """
+    if report.verdict == "INCONCLUSIVE":
+        return True
+    return report.verdict.startswith("CLAIM CONTRADICTED") and any(
+        not c.match and c.explanation in _UNADDRESSED for c in report.comparisons
+    )
+
+
+def build_fast_report(
+    claim: WitnessClaim,
+    evidence: EvidencePack,
+    video_analysis: VideoAnalysis,
+) -> CredibilityReport:
+    """Full CredibilityReport from rules only; texts use BackboardAnalyzer's deterministic fallbacks."""
+    comparisons = triage_claim(claim.claim_text, evidence)
+    score = BackboardAnalyzer._calculate_credibility_score(comparisons)
+    verdict = BackboardAnalyzer._generate_verdict(score, comparisons)
+    return CredibilityReport(
+        case_id=claim.case_id or BackboardAnalyzer._generate_case_id(),
+        case_title=BackboardAnalyzer._fallback_case_title(verdict),
+        witness_claim=claim.claim_text,
+        video_analysis=video_analysis,
+        comparisons=comparisons,
+        credibility_score=score,
+        verdict=verdict,
+        recommendation=BackboardAnalyzer._fallback_recommendation(verdict, comparisons),
+        evidence_summary=BackboardAnalyzer._generate_evidence_summary({}, video_analysis, comparisons),
+        detective_note=BackboardAnalyzer._fallback_detective_note(verdict, comparisons),
+        analysis_tier="fast",
+    )
@@ -0,0 +1,311 @@
+"""
+Durable job queue on the jobs table.
+
+A worker claims a pending job by taking a lease (lease_owner, lease_expires_at) in one
+conditional UPDATE, renews it while the job runs and releases it when done. A job whose
+lease expires (worker crashed or was killed) becomes claimable again: the lease is the
+visibility timeout. Failures are retried with exponential backoff (available_at) up to
+JOB_MAX_ATTEMPTS, then the job is marked failed.
+
+Only EVIDENCE jobs are queued. COMPLETE jobs (/analyze/complete/jobs) hold a spooled
+upload in the API process, so they take a lease for liveness but cannot move to another
+worker; one whose lease expired is marked failed.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Optional, Sequence
+
+from sqlalchemy import and_, or_, update
+from sqlmodel import select
+
+from app.config import get_settings
+from app.db import Job, session, update_job_stage
+from app.models_twelvelabs.jobs import JobKind, JobStatus
+
+logger = logging.getLogger(__name__)
+
+QUEUED_KINDS: tuple[str, ...] = (JobKind.EVIDENCE,)
+
+
+class LeaseLost(Exception):
+    """Another worker took the job over (our lease expired before it was renewed)."""
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt, after `attempts` failed ones."""
+    s = get_settings()
+    return min(s.job_retry_backoff_seconds * 2 ** max(attempts - 1, 0), s.job_retry_max_backoff_seconds)
+
+
+def claim_job(worker_id: str, kinds: Sequence[str] = QUEUED_KINDS) -> Optional[Job]:
+    """
+    Lease the oldest runnable job (pending and due, or processing with an expired lease).
+    Returns the claimed job, or None if there is nothing to do.
+    """
+    s = get_settings()
+    now = datetime.utcnow()
+    runnable = or_(
+        and_(
+            Job.status == JobStatus.PENDING,
+            or_(Job.available_at.is_(None), Job.available_at <= now),
+        ),
+        and_(Job.status == JobStatus.PROCESSING, Job.lease_expires_at < now),
+    )
+    _fail_exhausted(now)
+    with session() as db:
+        candidates = db.exec(
+            select(Job.job_id)
+            .where(Job.kind.in_(kinds), runnable, Job.attempts < s.job_max_attempts)
+            .order_by(Job.created_at)
+            .limit(5)
+        ).all()
+        for job_id in candidates:
+            # Conditional update: only one worker wins a given job
+            result = db.exec(
+                update(Job)
+                .where(Job.job_id == job_id, runnable)
+                .values(
+                    status=JobStatus.PROCESSING,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=s.job_lease_seconds),
+                    attempts=Job.attempts + 1,
+                    updated_at=now,
+                )
+            )
+            db.commit()
+            if result.rowcount == 1:
+                return db.get(Job, job_id, populate_existing=True)
+    return None
+
+
+def _fail_exhausted(now: datetime) -> None:
+    """Fail jobs whose lease expired on their last attempt, and orphaned COMPLETE jobs."""
+    s = get_settings()
+    expired = and_(Job.status == JobStatus.PROCESSING, Job.lease_expires_at < now)
+    with session() as db:
+        # Idle workers call this on every poll; only take SQLite's write lock when needed
+        if db.exec(select(Job.job_id).where(expired).limit(1)).first() is None:
+            return
+        db.exec(
+            update(Job)
+            .where(expired, Job.kind.in_(QUEUED_KINDS), Job.attempts >= s.job_max_attempts)
+            .values(
+                status=JobStatus.FAILED,
+                error_message=f"Worker lost the job {s.job_max_attempts} times (lease expired)",
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+        )
+        db.exec(
+            update(Job)
+            .where(expired, Job.kind.not_in(QUEUED_KINDS))
+            .values(
+                status=JobStatus.FAILED,
+                error_message="Interrupted: the server running this job stopped",
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+        )
+        db.commit()
+
+
+def take_lease(job_id: str, worker_id: str) -> bool:
+    """Lease a specific pending job (COMPLETE jobs run where they were submitted)."""
+    now = datetime.utcnow()
+    with session() as db:
+        result = db.exec(
+            update(Job)
+            .where(Job.job_id == job_id, Job.status == JobStatus.PENDING)
+            .values(
+                status=JobStatus.PROCESSING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=get_settings().job_lease_seconds),
+                attempts=Job.attempts + 1,
+                updated_at=now,
+            )
+        )
+        db.commit()
+        return result.rowcount == 1
+
+
+def renew_lease(job_id: str, worker_id: str) -> bool:
+    """Extend our lease; False if the job is no longer ours."""
+    now = datetime.utcnow()
+    with session() as db:
+        result = db.exec(
+            update(Job)
+            .where(Job.job_id == job_id, Job.lease_owner == worker_id, Job.status == JobStatus.PROCESSING)
+            .values(lease_expires_at=now + timedelta(seconds=get_settings().job_lease_seconds))
+        )
+        db.commit()
+        return result.rowcount == 1
+
+
+def _finish(job_id: str, worker_id: str, **values) -> bool:
+    values.setdefault("lease_owner", None)
+    values.setdefault("lease_expires_at", None)
+    values["updated_at"] = datetime.utcnow()
+    with session() as db:
+        result = db.exec(
+            update(Job).where(Job.job_id == job_id, Job.lease_owner == worker_id).values(**values)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+
+def complete_job(job_id: str, worker_id: str, *, video_id: Optional[str] = None) -> bool:
+    values = {"status": JobStatus.DONE, "error_message": None}
+    if video_id is not None:
+        values["video_id"] = video_id
+    return _finish(job_id, worker_id, **values)
+
+
+def fail_job(job_id: str, worker_id: str, error: str, *, retry: bool = True) -> bool:
+    """Schedule a retry with backoff, or mark failed once attempts are used up."""
+    attempts = get_job_attempts(job_id) if retry else None
+    if attempts is not None and attempts < get_settings().job_max_attempts:
+        delay = retry_delay(attempts)
+        logger.info("Job %s attempt %d failed; retrying in %.0fs: %s", job_id, attempts, delay, error)
+        return _finish(
+            job_id,
+            worker_id,
+            status=JobStatus.PENDING,
+            available_at=datetime.utcnow() + timedelta(seconds=delay),
+            error_message=error,
+        )
+    return _finish(job_id, worker_id, status=JobStatus.FAILED, error_message=error)
+
+
+def release_job(job_id: str, worker_id: str) -> bool:
+    """Give an unfinished job back (worker shutting down); the attempt is not counted."""
+    return _finish(
+        job_id,
+        worker_id,
+        status=JobStatus.PENDING,
+        available_at=None,
+        attempts=Job.attempts - 1,
+    )
+
+
+def get_job_attempts(job_id: str) -> Optional[int]:
+    with session() as db:
+        return db.exec(select(Job.attempts).where(Job.job_id == job_id)).first()
+
+
+def recover_jobs() -> int:
+    """
+    Startup recovery: EVIDENCE jobs left 'processing' without a lease (run in-process
+    by an older version) go back to pending. Jobs with expired leases are picked up by
+    claim_job; COMPLETE jobs whose process is gone are marked failed. Returns the number
+    of jobs requeued.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=get_settings().job_lease_seconds)
+    with session() as db:
+        result = db.exec(
+            update(Job)
+            .where(
+                Job.status == JobStatus.PROCESSING,
+                Job.lease_owner.is_(None),
+                Job.kind.in_(QUEUED_KINDS),
+            )
+            .values(status=JobStatus.PENDING, available_at=None, updated_at=now)
+        )
+        requeued = result.rowcount
+        # COMPLETE jobs never leased (or from an older version) and not touched for a lease period
+        db.exec(
+            update(Job)
+            .where(
+                Job.status.in_((JobStatus.PENDING, JobStatus.PROCESSING)),
+                Job.lease_owner.is_(None),
+                Job.kind.not_in(QUEUED_KINDS),
+                Job.updated_at < stale,
+            )
+            .values(status=JobStatus.FAILED, error_message="Interrupted by server restart", updated_at=now)
+        )
+        db.commit()
+    _fail_exhausted(now)
+    if requeued:
+        logger.info("Requeued %d interrupted jobs", requeued)
+    return requeued
+
+
+@asynccontextmanager
+async def keep_lease(job_id: str, worker_id: str) -> AsyncIterator[None]:
+    """
+    Renew the lease every third of JOB_LEASE_SECONDS while the body runs. If the lease
+    is lost, the body is cancelled and LeaseLost raised.
+    """
+    interval = get_settings().job_lease_seconds / 3
+    body = asyncio.current_task()
+    lost = False
+
+    async def heartbeat() -> None:
+        nonlocal lost
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await asyncio.to_thread(renew_lease, job_id, worker_id)
+            except Exception as e:
+                logger.warning("Lease renewal for job %s failed: %s", job_id, e)
+                continue
+            if not renewed:
+                lost = True
+                body.cancel()
+                return
+
+    task = asyncio.create_task(heartbeat())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if lost:
+            body.uncancel()
+            raise LeaseLost(f"Lease on job {job_id} was lost") from None
+        raise
+    finally:
+        task.cancel()
+
+
+class StageRecorder:
+    """
+    on_stage callback for a job running on the event loop. Each stage is written with
+    update_job_stage in a worker thread, in call order; on_change runs on the loop after
+    a write that changed the stage. Await flush() before finishing the job.
+    """
+
+    def __init__(self, job_id: str, on_change: Optional[Callable[[], None]] = None):
+        self.job_id = job_id
+        self.on_change = on_change
+        self._last: Optional[asyncio.Task] = None  # each write waits for the one before
+
+    def __call__(self, stage: str) -> None:
+        self._last = asyncio.get_running_loop().create_task(self._write(stage, self._last))
+
+    async def _write(self, stage: str, previous: Optional[asyncio.Task]) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            changed = await asyncio.to_thread(update_job_stage, self.job_id, stage)
+        except Exception as e:
+            logger.warning("Recording stage %s for job %s failed: %s", stage, self.job_id, e)
+            return
+        if changed and self.on_change is not None:
+            self.on_change()
+
+    async def flush(self) -> None:
+        """Wait for the stages recorded so far to be written."""
+        if self._last is not None:
+            await asyncio.wait([self._last])
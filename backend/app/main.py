@@ -4,27 +4,40 @@ FastAPI server with both Backboard AI analysis and TwelveLabs video processing.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
-from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 
+from app.deadline import Deadline, DeadlineExceeded
+from app import job_queue
+from app.db import create_job, get_job, update_job_status
+from app.fast_triage import TRIAGE_TIERS
 from app.models import CredibilityReport
+from app.models_twelvelabs.jobs import JobKind, JobStage, JobStatus, JobStatusResponse
+from app.pipeline import run_batch_analysis, run_complete_analysis
 from app.report_generator import ReportGenerator
-from app.services.twelvelabs_client import run_analysis
+from app.services import job_events, s3_store, twelvelabs_client
+from app.services.aws_clients import open_aws_clients, reset_aws_clients
+from app.services.llm_cache import get_llm_cache, llm_cache_bypass
+from app.services.task_poller import get_task_poller
+from app.services.uploads import MaxUploadSizeMiddleware, SpooledUpload, SpoolingRoute, UploadTooLarge, spool_upload
 from app.config import get_settings
 from app.routers import users, videos
+from app.worker import start_job_worker, stop_job_worker
 
 _backboard_err = None
 _noirvision_err = None
 try:
-    from app.backboard_agent import BackboardAnalyzer
+    from app.backboard_agent import ANALYSIS_MODES, BackboardAnalyzer
 except ImportError as e:
+    ANALYSIS_MODES = ()
     BackboardAnalyzer = None
     _backboard_err = e
 
@@ -56,7 +69,24 @@ async def lifespan(app: FastAPI):
     logger.info("NoirVision backend starting; Cognito configured=%s", cognito_ok)
     if not cognito_ok:
         logger.warning("Set COGNITO_USER_POOL_ID (and COGNITO_REGION) in backend/.env for /api/users/me/*")
-    yield
+    await twelvelabs_client.open_http_client()
+    await asyncio.to_thread(open_aws_clients)
+    get_task_poller().start()
+    if analyzer is not None:
+        analyzer.pool.start()
+    await start_job_worker()
+    try:
+        yield
+    finally:
+        await stop_job_worker()
+        for task in list(_complete_jobs):
+            task.cancel()
+        await asyncio.gather(*_complete_jobs, return_exceptions=True)
+        if analyzer is not None:
+            await analyzer.pool.aclose()
+        await get_task_poller().stop()
+        await twelvelabs_client.close_http_client()
+        reset_aws_clients()
 
 
 app = FastAPI(
@@ -65,6 +95,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+# Multipart uploads are written to disk once, straight into the file spool_upload keeps
+app.router.route_class = SpoolingRoute
 
 # Add CORS middleware (explicit origins required when allow_credentials=True)
 cors_origins = os.getenv(
@@ -80,13 +112,14 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+app.add_middleware(MaxUploadSizeMiddleware)
 
 # Initialize analyzers
 try:
     if BackboardAnalyzer is None:
         raise ValueError("BackboardAnalyzer not available - backboard package may not be installed")
     analyzer = BackboardAnalyzer()
-    noirvision = NoirVisionAnalyzer() if NoirVisionAnalyzer else None
+    noirvision = NoirVisionAnalyzer(backboard=analyzer) if NoirVisionAnalyzer else None
     logger.info("NoirVision analyzer initialized with Backboard AI")
 except (ValueError, ImportError) as e:
     logger.error("Failed to initialize: %s", e)
@@ -116,25 +149,21 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    llm_cache = get_llm_cache()
     return {
         "status": "healthy",
         "backboard_configured": analyzer is not None,
-        "twelvelabs_configured": not get_settings().twelvelabs_mock
+        "twelvelabs_configured": not get_settings().twelvelabs_mock,
+        "llm_cache": llm_cache.stats() if llm_cache else None
     }
 
 
-@app.post("/analyze/complete")
-async def analyze_complete(
-    claim: str = Form(..., description="Witness claim/statement"),
-    video_url: Optional[str] = Form(None, description="YouTube or public video URL"),
-    video_file: Optional[UploadFile] = File(None, description="Video file upload"),
-    case_id: Optional[str] = Form(None, description="Optional case ID")
-):
-    """
-    Complete end-to-end analysis: Video → TwelveLabs → Backboard → Credibility Report.
-
-    Provide EITHER video_url OR video_file (not both).
-    """
+def _validate_complete_request(
+    video_url: Optional[str],
+    video_file: Optional[UploadFile],
+    analysis_mode: Optional[str] = None,
+    tier: Optional[str] = None,
+) -> None:
     if not noirvision:
         raise HTTPException(
             status_code=500,
@@ -153,60 +182,283 @@ async def analyze_complete(
             detail="Provide only one: video_url OR video_file, not both"
         )
 
-    try:
-        logger.info("Starting complete analysis for claim: %s...", claim[:50])
-
-        # Step 1: Process video with TwelveLabs
-        if video_file:
-            temp_path = Path(f"/tmp/noirvision_{video_file.filename}")
-            with open(temp_path, "wb") as f:
-                f.write(await video_file.read())
-
-            logger.info("Processing uploaded video: %s", video_file.filename)
-            evidence = run_analysis(
-                video_file_path=str(temp_path),
-                source_type="s3",
-                source_url_for_pack=video_file.filename
-            )
+    if analysis_mode and analysis_mode not in ANALYSIS_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"analysis_mode must be one of: {', '.join(ANALYSIS_MODES)}"
+        )
+
+    if tier and tier not in TRIAGE_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"tier must be one of: {', '.join(TRIAGE_TIERS)}"
+        )
 
-            temp_path.unlink(missing_ok=True)
-        else:
-            logger.info("Processing video URL: %s", video_url)
-            source_type = "youtube" if "youtube.com" in video_url or "youtu.be" in video_url else "youtube"
-            evidence = run_analysis(
-                video_url=video_url,
-                source_type=source_type,
-                source_url_for_pack=video_url
-            )
 
-        logger.info("TwelveLabs analysis complete, video_id=%s", evidence.video_id)
+@app.post("/analyze/complete")
+async def analyze_complete(
+    claim: str = Form(..., description="Witness claim/statement"),
+    video_url: Optional[str] = Form(None, description="YouTube or public video URL"),
+    video_file: Optional[UploadFile] = File(None, description="Video file upload"),
+    case_id: Optional[str] = Form(None, description="Optional case ID"),
+    analysis_mode: Optional[str] = Form(None, description="stepwise | structured (default: BACKBOARD_ANALYSIS_MODE)"),
+    tier: Optional[str] = Form(None, description="llm | fast | auto (default: TRIAGE_TIER)"),
+    no_cache: bool = Form(False, description="Ignore cached LLM responses for this request")
+):
+    """
+    Complete end-to-end analysis: Video → TwelveLabs → Backboard → Credibility Report.
 
-        # Step 2: Analyze with Backboard AI
-        logger.info("Starting Backboard AI credibility analysis...")
-        report = await noirvision.analyze_video_with_claim(
-            evidence=evidence,
-            claim_text=claim,
-            case_id=case_id
+    Provide EITHER video_url OR video_file (not both). With ANALYSIS_DEADLINE_SECONDS set,
+    the budget starts now and a partial report (see skipped_stages) is returned when it runs out.
+    """
+    deadline = Deadline.after(get_settings().analysis_deadline_seconds)
+    _validate_complete_request(video_url, video_file, analysis_mode, tier)
+
+    upload = None
+    if video_file:
+        try:
+            upload = await spool_upload(video_file)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        with llm_cache_bypass(no_cache):
+            return await run_complete_analysis(
+                noirvision,
+                claim=claim,
+                case_id=case_id,
+                video_url=video_url,
+                upload=upload,
+                analysis_mode=analysis_mode,
+                tier=tier,
+                deadline=deadline,
+            )
+    except DeadlineExceeded as e:
+        logger.error("Analysis out of time: %s", e)
+        raise HTTPException(status_code=504, detail=f"Analysis failed: {e}")
+    except Exception as e:
+        logger.error("Analysis failed: %s", type(e).__name__ + ": " + str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Analysis failed: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
 
-        # Step 3: Generate formatted report
-        formatted_report = noirvision.generate_formatted_report(report)
 
-        logger.info("Complete analysis done, case_id=%s, score=%d",
-                   report.case_id, report.credibility_score)
+@app.post("/analyze/batch")
+async def analyze_batch(
+    claims: List[str] = Form(..., description="Witness claims; repeat the field once per claim"),
+    video_url: Optional[str] = Form(None, description="YouTube or public video URL"),
+    video_file: Optional[UploadFile] = File(None, description="Video file upload"),
+    case_id: Optional[str] = Form(None, description="Optional case ID shared by all reports"),
+    analysis_mode: Optional[str] = Form(None, description="stepwise | structured (default: BACKBOARD_ANALYSIS_MODE)"),
+    tier: Optional[str] = Form(None, description="llm | fast | auto (default: TRIAGE_TIER)"),
+    no_cache: bool = Form(False, description="Ignore cached LLM responses for this request")
+):
+    """
+    Verify several witness claims against one video: the video is indexed once and
+    the claims are evaluated concurrently (BACKBOARD_MAX_CONCURRENT_CLAIMS at a time).
 
-        return {
-            "report": report.model_dump(),
-            "formatted_report": formatted_report,
-            "video_id": evidence.video_id
-        }
+    Returns one result per claim, in request order; a claim that fails has "error"
+    instead of "report".
+    """
+    deadline = Deadline.after(get_settings().analysis_deadline_seconds)
+    _validate_complete_request(video_url, video_file, analysis_mode, tier)
+    claims = [c for c in claims if c.strip()]
+    if not claims:
+        raise HTTPException(status_code=400, detail="Provide at least one claim")
+    max_claims = get_settings().batch_max_claims
+    if len(claims) > max_claims:
+        raise HTTPException(status_code=400, detail=f"At most {max_claims} claims per batch")
+
+    upload = None
+    if video_file:
+        try:
+            upload = await spool_upload(video_file)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
+    try:
+        with llm_cache_bypass(no_cache):
+            return await run_batch_analysis(
+                noirvision,
+                claims=claims,
+                case_id=case_id,
+                video_url=video_url,
+                upload=upload,
+                analysis_mode=analysis_mode,
+                tier=tier,
+                deadline=deadline,
+            )
+    except DeadlineExceeded as e:
+        logger.error("Batch analysis out of time: %s", e)
+        raise HTTPException(status_code=504, detail=f"Analysis failed: {e}")
     except Exception as e:
-        logger.error("Analysis failed: %s", type(e).__name__ + ": " + str(e))
+        logger.error("Batch analysis failed: %s", type(e).__name__ + ": " + str(e))
         raise HTTPException(
             status_code=500,
             detail=f"Analysis failed: {str(e)}"
         )
+    finally:
+        if upload:
+            upload.cleanup()
+
+
+# ---------- /analyze/complete as a background job with SSE progress ----------
+
+# Strong references so running jobs are not garbage-collected mid-flight
+_complete_jobs: set[asyncio.Task] = set()
+# Lease owner for COMPLETE jobs run by this process (they cannot move to another worker)
+_instance_id = job_queue.new_worker_id()
+
+
+async def _run_complete_job(
+    job_id: str,
+    project_id: str,
+    *,
+    claim: str,
+    case_id: Optional[str],
+    video_url: Optional[str],
+    upload: Optional[SpooledUpload],
+    analysis_mode: Optional[str] = None,
+    tier: Optional[str] = None,
+) -> None:
+    """
+    Run the complete pipeline for a job; store the result in S3 and mark the job done/failed.
+    The job is leased to this process while it runs, so a restart can tell it was orphaned.
+    """
+    try:
+        if not await asyncio.to_thread(job_queue.take_lease, job_id, _instance_id):
+            # No longer pending (e.g. failed by recover_jobs): someone else decided its fate
+            logger.warning("Complete analysis job %s is not pending; not running it", job_id)
+            return
+        job_events.publish(job_id)
+        stages = job_queue.StageRecorder(job_id, on_change=lambda: job_events.publish(job_id))
+        async with job_queue.keep_lease(job_id, _instance_id):
+            result = await run_complete_analysis(
+                noirvision,
+                claim=claim,
+                case_id=case_id,
+                video_url=video_url,
+                upload=upload,
+                on_stage=stages,
+                analysis_mode=analysis_mode,
+                tier=tier,
+            )
+            await stages.flush()
+        await asyncio.to_thread(s3_store.put_json, s3_store.job_artifact_key(project_id, job_id), result)
+        await asyncio.to_thread(job_queue.complete_job, job_id, _instance_id, video_id=result["video_id"])
+    except asyncio.CancelledError:
+        # Shielded so a second cancel during shutdown can't lose the failure
+        await asyncio.shield(asyncio.to_thread(
+            job_queue.fail_job, job_id, _instance_id, "Interrupted by server shutdown", retry=False
+        ))
+        raise
+    except Exception as e:
+        logger.exception("Complete analysis job %s failed", job_id)
+        await asyncio.to_thread(job_queue.fail_job, job_id, _instance_id, str(e), retry=False)
+    finally:
+        if upload:
+            upload.cleanup()
+        job_events.publish(job_id)
+
+
+async def _get_complete_job(job_id: str):
+    job = await asyncio.to_thread(get_job, job_id)
+    if not job or job.kind != JobKind.COMPLETE:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/analyze/complete/jobs", status_code=202)
+async def analyze_complete_job(
+    claim: str = Form(..., description="Witness claim/statement"),
+    video_url: Optional[str] = Form(None, description="YouTube or public video URL"),
+    video_file: Optional[UploadFile] = File(None, description="Video file upload"),
+    case_id: Optional[str] = Form(None, description="Optional case ID"),
+    project_id: str = Form("default", description="Project the job belongs to"),
+    analysis_mode: Optional[str] = Form(None, description="stepwise | structured (default: BACKBOARD_ANALYSIS_MODE)"),
+    tier: Optional[str] = Form(None, description="llm | fast | auto (default: TRIAGE_TIER)"),
+    no_cache: bool = Form(False, description="Ignore cached LLM responses for this request"),
+):
+    """
+    Same as /analyze/complete, but returns a job_id immediately.
+    Follow progress at /analyze/complete/jobs/{job_id}/events (SSE) or poll /analyze/complete/jobs/{job_id}.
+    """
+    _validate_complete_request(video_url, video_file, analysis_mode, tier)
+    try:
+        get_settings().require_s3()
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    job = await asyncio.to_thread(
+        create_job,
+        project_id,
+        claim,
+        "s3" if video_file else "youtube",
+        video_file.filename if video_file else video_url,
+        kind=JobKind.COMPLETE,
+        stage=JobStage.UPLOADING if video_file else None,
+    )
+    upload = None
+    if video_file:
+        try:
+            upload = await spool_upload(video_file)
+        except UploadTooLarge as e:
+            await asyncio.to_thread(update_job_status, job.job_id, JobStatus.FAILED, error_message=str(e))
+            raise HTTPException(status_code=413, detail=str(e))
+
+    # The task copies the current context, so the cache bypass applies to the whole job
+    with llm_cache_bypass(no_cache):
+        task = asyncio.create_task(_run_complete_job(
+            job.job_id,
+            project_id,
+            claim=claim,
+            case_id=case_id,
+            video_url=video_url,
+            upload=upload,
+            analysis_mode=analysis_mode,
+            tier=tier,
+        ))
+    _complete_jobs.add(task)
+    task.add_done_callback(_complete_jobs.discard)
+    return {
+        "job_id": job.job_id,
+        "status": JobStatus.PENDING,
+        "status_url": f"/analyze/complete/jobs/{job.job_id}",
+        "events_url": f"/analyze/complete/jobs/{job.job_id}/events",
+    }
+
+
+@app.get("/analyze/complete/jobs/{job_id}")
+async def get_complete_job(job_id: str):
+    """Job status and stage; includes the report once the job is done."""
+    job = await _get_complete_job(job_id)
+    body = JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        stage=job.stage,
+        video_id=job.video_id,
+        error=job.error_message,
+    ).model_dump()
+    if job.status == JobStatus.DONE:
+        body["result"] = await asyncio.to_thread(
+            s3_store.get_json, s3_store.job_artifact_key(job.project_id, job.job_id)
+        )
+    return body
+
+
+@app.get("/analyze/complete/jobs/{job_id}/events")
+async def complete_job_events(job_id: str):
+    """Server-Sent Events: "progress" on each stage change, then "done" or "failed"."""
+    await _get_complete_job(job_id)
+    return StreamingResponse(
+        job_events.stream_job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 if __name__ == "__main__":
@@ -2,9 +2,18 @@
 Data models for NoirVision backend.
 """
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+# Categories every claim/video comparison covers, in report order
+COMPARISON_CATEGORIES = (
+    "Time Match",
+    "Location Match",
+    "Suspect Description",
+    "Weapon Match",
+    "Event Sequence",
+)
+
 
 class VideoDetection(BaseModel):
     """Individual detection from video analysis."""
@@ -39,6 +48,44 @@ class ComparisonResult(BaseModel):
     explanation: str = Field(..., description="Explanation of match/mismatch")
 
 
+class ClaimFacts(BaseModel):
+    """Structured facts extracted from a witness claim."""
+    time: str = Field("unknown", description="When the incident happened")
+    location: str = Field("unknown", description="Where it happened")
+    suspect_description: str = Field("unknown", description="Physical description of the suspect")
+    weapon: str = Field("none", description="Weapon type or none")
+    events: List[str] = Field(default_factory=list, description="Key actions in sequence")
+
+
+class StructuredAnalysis(BaseModel):
+    """Single-shot Backboard response (analysis mode "structured")."""
+    claim_facts: ClaimFacts = Field(..., description="Facts extracted from the claim")
+    comparisons: List[ComparisonResult] = Field(..., min_length=1, description="Comparison results")
+    recommendation: str = Field(..., min_length=1, description="Investigation recommendation")
+    detective_note: str = Field(..., min_length=1, description="Noir-styled detective commentary")
+    case_title: str = Field(..., min_length=1, description="Noir-style case title")
+
+    @field_validator("comparisons")
+    @classmethod
+    def _one_per_category(cls, comparisons: List[ComparisonResult]) -> List[ComparisonResult]:
+        """A partial reply would be scored as a full report, so require each category exactly once."""
+        seen = [c.category.strip().casefold() for c in comparisons]
+        problems = [
+            f"{name!r} appears {seen.count(name.casefold())} times"
+            for name in COMPARISON_CATEGORIES
+            if seen.count(name.casefold()) != 1
+        ]
+        known = {name.casefold() for name in COMPARISON_CATEGORIES}
+        extra = sorted({c.category for c in comparisons if c.category.strip().casefold() not in known})
+        if extra:
+            problems.append(f"unknown categories {extra}")
+        if problems:
+            raise ValueError(
+                f"comparisons need each of {list(COMPARISON_CATEGORIES)} exactly once: {'; '.join(problems)}"
+            )
+        return comparisons
+
+
 class CredibilityReport(BaseModel):
     """Complete credibility report output."""
     case_id: str = Field(..., description="Unique case identifier")
@@ -51,6 +98,12 @@ class CredibilityReport(BaseModel):
     recommendation: str = Field(..., description="Investigation recommendation")
     evidence_summary: Dict[str, Any] = Field(..., description="Key evidence points")
     detective_note: str = Field(..., description="Noir-styled detective commentary")
+    analysis_tier: str = Field("llm", description="How comparisons were made: llm (Backboard) or fast (rules)")
+    partial: bool = Field(False, description="Some stages were skipped or fell back (time budget, failures)")
+    skipped_stages: List[str] = Field(
+        default_factory=list,
+        description="Stages missing from this report, e.g. detective_note, llm_comparison, evidence_transcript",
+    )
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
@@ -5,7 +5,7 @@ from .evidence import (
     EvidenceEvent,
     EvidenceKeyQuote,
 )
-from .jobs import JobStatus, JobRecord, JobStatusResponse, AnalyzeRequest
+from .jobs import JobStatus, JobKind, JobStage, JobRecord, JobListResponse, JobStatusResponse, AnalyzeRequest
 
 __all__ = [
     "EvidencePack",
@@ -14,7 +14,10 @@ __all__ = [
     "EvidenceEvent",
     "EvidenceKeyQuote",
     "JobStatus",
+    "JobKind",
+    "JobStage",
     "JobRecord",
+    "JobListResponse",
     "JobStatusResponse",
     "AnalyzeRequest",
 ]
@@ -4,7 +4,7 @@ Job and analyze request/response models.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,22 @@ class JobStatus:
     FAILED = "failed"
 
 
+class JobKind:
+    EVIDENCE = "evidence"  # /api/videos/analyze: TwelveLabs only, EvidencePack to S3
+    COMPLETE = "complete"  # /analyze/complete/jobs: TwelveLabs + Backboard report
+
+
+class JobStage:
+    """Progress within a processing job, in pipeline order."""
+
+    UPLOADING = "uploading"
+    INDEXING = "indexing"
+    BUILDING_EVIDENCE = "building_evidence"
+    PARSING_CLAIM = "parsing_claim"
+    COMPARING = "comparing"
+    RENDERING = "rendering"
+
+
 class AnalyzeRequest(BaseModel):
     project_id: str = Field(..., min_length=1, description="Project identifier")
     claim: str = Field(..., description="Claim to evaluate (stored, not scored here)")
@@ -42,10 +58,13 @@ class JobRecord(BaseModel):
     project_id: str
     claim: str
     status: str  # pending | processing | done | failed
+    kind: str = JobKind.EVIDENCE
+    stage: Optional[str] = None
     video_id: Optional[str] = None
     source_type: Optional[str] = None  # youtube | s3
     source_url: Optional[str] = None
     error_message: Optional[str] = None
+    attempts: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -53,5 +72,12 @@ class JobRecord(BaseModel):
 class JobStatusResponse(BaseModel):
     job_id: str
     status: str
+    stage: Optional[str] = None
     video_id: Optional[str] = None
     error: Optional[str] = None
+    attempts: int = 0
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobRecord]
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page; None on the last page
@@ -0,0 +1,55 @@
+"""
+Direct-to-S3 multipart upload request/response models.
+"""
+from __future__ import annotations
+
+from typing import Annotated, List
+
+from pydantic import BaseModel, Field
+
+# S3 allows part numbers 1..10000
+MAX_PARTS = 10000
+
+
+class CreateUploadRequest(BaseModel):
+    project_id: str = Field(..., pattern=r"^[A-Za-z0-9_.-]{1,128}$", description="Project identifier")
+    filename: str = Field(default="video.mp4", max_length=255, description="Only the extension is kept")
+    content_type: str = Field(default="video/mp4", pattern=r"^video/[A-Za-z0-9.+-]+$")
+    size_bytes: int = Field(..., gt=0, description="Total file size; decides part size and count")
+
+
+class CreateUploadResponse(BaseModel):
+    upload_id: str
+    s3_key: str = Field(..., description="Pass as s3_key to POST /api/videos/analyze once completed")
+    part_size: int = Field(..., description="Bytes per part (the last part may be smaller)")
+    part_count: int
+
+
+class SignPartsRequest(BaseModel):
+    s3_key: str
+    part_numbers: List[Annotated[int, Field(ge=1, le=MAX_PARTS)]] = Field(..., min_length=1, max_length=1000)
+
+
+class SignedPart(BaseModel):
+    part_number: int
+    url: str = Field(..., description="PUT the part's bytes here; keep the ETag response header")
+
+
+class SignPartsResponse(BaseModel):
+    parts: List[SignedPart]
+    expires_in: int = Field(..., description="Seconds the URLs stay valid")
+
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=MAX_PARTS)
+    etag: str = Field(..., min_length=1)
+
+
+class CompleteUploadRequest(BaseModel):
+    s3_key: str
+    parts: List[CompletedPart] = Field(..., min_length=1, max_length=MAX_PARTS)
+
+
+class CompleteUploadResponse(BaseModel):
+    s3_key: str
+    etag: str
@@ -2,12 +2,18 @@
 Complete integration of TwelveLabs video analysis with Backboard AI claim verification.
 This module bridges TwelveLabs EvidencePack with Backboard credibility analysis.
 """
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Awaitable, Dict, Any, List, Callable, Optional, Union
+from app.config import get_settings
 from app.models_twelvelabs.evidence import EvidencePack
 from app.models import VideoAnalysis, VideoDetection, WitnessClaim, CredibilityReport
 from app.backboard_agent import BackboardAnalyzer
+from app.deadline import NO_DEADLINE, Deadline, DeadlineExceeded
+from app.fast_triage import build_fast_report, needs_escalation
+from app.models_twelvelabs.jobs import JobStage
 from app.report_generator import ReportGenerator
+from app.services.evidence_index import EvidenceIndex, chunk_evidence, get_or_build_index
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +23,8 @@ class NoirVisionAnalyzer:
     Complete end-to-end analyzer that integrates TwelveLabs and Backboard.
     """
     
-    def __init__(self):
-        self.backboard = BackboardAnalyzer()
+    def __init__(self, backboard: Optional[BackboardAnalyzer] = None):
+        self.backboard = backboard or BackboardAnalyzer()
     
     def convert_evidence_to_video_analysis(self, evidence: EvidencePack) -> VideoAnalysis:
         """
@@ -80,7 +86,12 @@ class NoirVisionAnalyzer:
         self,
         evidence: EvidencePack,
         claim_text: str,
-        case_id: str = None
+        case_id: str = None,
+        on_stage: Optional[Callable[[str], None]] = None,
+        analysis_mode: Optional[str] = None,
+        tier: Optional[str] = None,
+        parsed_claim: Optional[Awaitable[Dict[str, Any]]] = None,
+        deadline: Deadline = NO_DEADLINE
     ) -> CredibilityReport:
         """
         Complete analysis: TwelveLabs evidence + witness claim → credibility report.
@@ -89,6 +100,11 @@ class NoirVisionAnalyzer:
             evidence: EvidencePack from TwelveLabs
             claim_text: Witness statement
             case_id: Optional case ID
+            on_stage: Optional progress callback, passed to the Backboard analyzer
+            analysis_mode: "stepwise" or "structured" (default: BACKBOARD_ANALYSIS_MODE)
+            tier: "llm", "fast" or "auto" (default: TRIAGE_TIER)
+            parsed_claim: Optional claim parse already in flight (see start_claim_parse)
+            deadline: Request time budget; past it the report is partial (skipped_stages)
             
         Returns:
             Complete credibility report with verdict and recommendations
@@ -99,10 +115,134 @@ class NoirVisionAnalyzer:
         # Create witness claim
         claim = WitnessClaim(claim_text=claim_text, case_id=case_id)
         
-        # Analyze with Backboard
-        report = await self.backboard.analyze_claim_vs_video(claim, video_analysis)
+        return await self._analyze_claim(
+            evidence, video_analysis, claim, on_stage=on_stage, analysis_mode=analysis_mode, tier=tier,
+            parsed_claim=parsed_claim, deadline=deadline
+        )
+    
+    def start_claim_parse(
+        self,
+        claim_text: str,
+        analysis_mode: Optional[str] = None,
+        tier: Optional[str] = None
+    ) -> Optional[asyncio.Task]:
+        """
+        Start parsing the claim now, ahead of the video evidence, if the analysis will
+        use a stepwise parse (not for the fast tier, structured mode, or when
+        BACKBOARD_SPECULATIVE_PARSE=false). Returns the task, or None.
+        """
+        settings = get_settings()
+        if not settings.backboard_speculative_parse:
+            return None
+        if (tier or settings.triage_tier) == "fast":
+            return None
+        if (analysis_mode or settings.backboard_analysis_mode) != "stepwise":
+            return None
+        return asyncio.create_task(self.backboard.parse_claim(claim_text))
+    
+    async def _analyze_claim(
+        self,
+        evidence: EvidencePack,
+        video_analysis: VideoAnalysis,
+        claim: WitnessClaim,
+        on_stage: Optional[Callable[[str], None]] = None,
+        analysis_mode: Optional[str] = None,
+        tier: Optional[str] = None,
+        evidence_index: Optional[EvidenceIndex] = None,
+        parsed_claim: Optional[Awaitable[Dict[str, Any]]] = None,
+        deadline: Deadline = NO_DEADLINE
+    ) -> CredibilityReport:
+        """
+        Rule-based triage and/or Backboard analysis, depending on tier. If the deadline
+        passes before Backboard has compared the claim, the rule-based comparison is used.
+        """
+        tier = tier or get_settings().triage_tier
+        triage = None
+        if tier in ("fast", "auto"):
+            if on_stage:
+                on_stage(JobStage.COMPARING)
+            triage = build_fast_report(claim, evidence, video_analysis)
         
-        return report
+        if triage is not None and (tier == "fast" or not needs_escalation(triage)):
+            report = triage
+        else:
+            if triage is not None:
+                logger.info(
+                    "Fast triage not conclusive (%s, score=%d), escalating to Backboard",
+                    triage.verdict, triage.credibility_score
+                )
+            # Analyze with Backboard
+            if evidence_index is None:
+                evidence_index = await self._evidence_index(evidence)
+            try:
+                report = await self.backboard.analyze_claim_vs_video(
+                    claim, video_analysis, on_stage=on_stage, mode=analysis_mode, evidence_index=evidence_index,
+                    parsed_claim=parsed_claim, deadline=deadline
+                )
+            except DeadlineExceeded as e:
+                logger.warning("%s; using the rule-based comparison", e)
+                report = (triage or build_fast_report(claim, evidence, video_analysis)).model_copy(
+                    update={"skipped_stages": ["llm_comparison"]}
+                )
+        return self._mark_evidence_gaps(evidence, report)
+    
+    @staticmethod
+    def _mark_evidence_gaps(evidence: EvidencePack, report: CredibilityReport) -> CredibilityReport:
+        """Add evidence sections TwelveLabs could not deliver to skipped_stages; set partial."""
+        degraded = (evidence.raw_twelvelabs or {}).get("degraded_sections") or {}
+        skipped = [f"evidence_{name}" for name in degraded] + report.skipped_stages
+        if not skipped:
+            return report
+        return report.model_copy(update={"partial": True, "skipped_stages": skipped})
+    
+    @staticmethod
+    async def _evidence_index(evidence: EvidencePack) -> Optional[EvidenceIndex]:
+        """Vector index over the evidence, or None when disabled or the video is short."""
+        settings = get_settings()
+        if not settings.evidence_index_enabled:
+            return None
+        if len(chunk_evidence(evidence)) < settings.evidence_index_min_segments:
+            return None
+        return await asyncio.to_thread(get_or_build_index, evidence)
+    
+    async def analyze_video_with_claims(
+        self,
+        evidence: EvidencePack,
+        claim_texts: List[str],
+        case_id: str = None,
+        max_concurrency: Optional[int] = None,
+        analysis_mode: Optional[str] = None,
+        tier: Optional[str] = None,
+        deadline: Deadline = NO_DEADLINE
+    ) -> List[Union[CredibilityReport, Exception]]:
+        """
+        Evaluate several witness claims against the same evidence.
+        
+        The EvidencePack is converted once; claims run concurrently, at most
+        max_concurrency (default BACKBOARD_MAX_CONCURRENT_CLAIMS) at a time.
+        All reports share one case ID (the incident).
+        
+        Returns:
+            One entry per claim, in order: the report, or the exception that claim raised
+        """
+        video_analysis = self.convert_evidence_to_video_analysis(evidence)
+        case_id = case_id or self.backboard._generate_case_id()
+        limit = asyncio.Semaphore(max_concurrency or get_settings().backboard_max_concurrent_claims)
+        # Built once, shared by every claim (only needed if a claim reaches Backboard)
+        evidence_index = None if (tier or get_settings().triage_tier) == "fast" else await self._evidence_index(evidence)
+        
+        async def analyze_one(claim_text: str) -> CredibilityReport:
+            async with limit:
+                claim = WitnessClaim(claim_text=claim_text, case_id=case_id)
+                return await self._analyze_claim(
+                    evidence, video_analysis, claim, analysis_mode=analysis_mode, tier=tier,
+                    evidence_index=evidence_index, deadline=deadline
+                )
+        
+        return await asyncio.gather(
+            *(analyze_one(text) for text in claim_texts),
+            return_exceptions=True
+        )
     
     def generate_formatted_report(self, report: CredibilityReport) -> str:
         """Generate ASCII art report."""
@@ -0,0 +1,167 @@
+"""
+End-to-end pipeline behind /analyze/complete, its job variant and /analyze/batch:
+Video → TwelveLabs EvidencePack → Backboard credibility report(s) → ASCII report(s).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from app.config import get_settings
+from app.deadline import Deadline
+from app.models_twelvelabs.evidence import EvidencePack
+from app.models_twelvelabs.jobs import JobStage
+from app.services.twelvelabs_client import run_analysis_async
+from app.services.uploads import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+
+async def _index_video(
+    *,
+    video_url: Optional[str],
+    upload: Optional[SpooledUpload],
+    on_stage: Optional[Callable[[str], None]] = None,
+    deadline: Deadline,
+) -> EvidencePack:
+    if upload:
+        logger.info("Processing uploaded video: %s (%d bytes)", upload.filename, upload.size)
+        evidence = await run_analysis_async(
+            video_file_path=str(upload.path),
+            source_type="s3",
+            source_url_for_pack=upload.filename,
+            cache_key=upload.cache_key,
+            on_stage=on_stage,
+            deadline=deadline,
+        )
+    else:
+        logger.info("Processing video URL: %s", video_url)
+        evidence = await run_analysis_async(
+            video_url=video_url,
+            source_type="youtube",
+            source_url_for_pack=video_url,
+            on_stage=on_stage,
+            deadline=deadline,
+        )
+    logger.info("TwelveLabs analysis complete, video_id=%s", evidence.video_id)
+    return evidence
+
+
+def _discard(task: Optional[asyncio.Task]) -> None:
+    """Cancel a speculative task nobody awaited (indexing failed, fast triage sufficed)."""
+    if task is None:
+        return
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()  # mark retrieved; a failed parse was already retried or is moot
+
+
+async def run_complete_analysis(
+    noirvision,
+    *,
+    claim: str,
+    case_id: Optional[str] = None,
+    video_url: Optional[str] = None,
+    upload: Optional[SpooledUpload] = None,
+    on_stage: Optional[Callable[[str], None]] = None,
+    analysis_mode: Optional[str] = None,
+    tier: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict[str, Any]:
+    """
+    Run the full pipeline for one claim against one video (URL or spooled upload).
+    Returns {"report", "formatted_report", "video_id"}; on_stage receives JobStage values.
+    deadline defaults to ANALYSIS_DEADLINE_SECONDS from now; past it the report is partial.
+    """
+    logger.info("Starting complete analysis for claim: %s...", claim[:50])
+    deadline = deadline or Deadline.after(get_settings().analysis_deadline_seconds)
+
+    # Claim parsing needs only the text: run it alongside upload and indexing
+    parsed_claim = noirvision.start_claim_parse(claim, analysis_mode=analysis_mode, tier=tier)
+    try:
+        # Step 1: Process video with TwelveLabs
+        evidence = await _index_video(video_url=video_url, upload=upload, on_stage=on_stage, deadline=deadline)
+
+        # Step 2: Analyze with Backboard AI
+        logger.info("Starting Backboard AI credibility analysis...")
+        report = await noirvision.analyze_video_with_claim(
+            evidence=evidence,
+            claim_text=claim,
+            case_id=case_id,
+            on_stage=on_stage,
+            analysis_mode=analysis_mode,
+            tier=tier,
+            parsed_claim=parsed_claim,
+            deadline=deadline,
+        )
+    finally:
+        _discard(parsed_claim)
+
+    # Step 3: Generate formatted report
+    if on_stage:
+        on_stage(JobStage.RENDERING)
+    formatted_report = noirvision.generate_formatted_report(report)
+
+    logger.info("Complete analysis done, case_id=%s, score=%d",
+               report.case_id, report.credibility_score)
+
+    return {
+        "report": report.model_dump(),
+        "formatted_report": formatted_report,
+        "video_id": evidence.video_id,
+    }
+
+
+async def run_batch_analysis(
+    noirvision,
+    *,
+    claims: list[str],
+    case_id: Optional[str] = None,
+    video_url: Optional[str] = None,
+    upload: Optional[SpooledUpload] = None,
+    max_concurrency: Optional[int] = None,
+    analysis_mode: Optional[str] = None,
+    tier: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict[str, Any]:
+    """
+    Index the video once, then evaluate every claim against the same evidence.
+    A failing claim gets an "error" entry; the other claims still get reports.
+    All claims share one deadline (default ANALYSIS_DEADLINE_SECONDS from now).
+    """
+    logger.info("Starting batch analysis of %d claims", len(claims))
+    deadline = deadline or Deadline.after(get_settings().analysis_deadline_seconds)
+    evidence = await _index_video(video_url=video_url, upload=upload, deadline=deadline)
+
+    outcomes = await noirvision.analyze_video_with_claims(
+        evidence,
+        claims,
+        case_id=case_id,
+        max_concurrency=max_concurrency,
+        analysis_mode=analysis_mode,
+        tier=tier,
+        deadline=deadline,
+    )
+
+    results = []
+    for claim, outcome in zip(claims, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Claim analysis failed: %s: %s", type(outcome).__name__, outcome)
+            results.append({"claim": claim, "error": str(outcome)})
+            continue
+        results.append({
+            "claim": claim,
+            "report": outcome.model_dump(),
+            "formatted_report": noirvision.generate_formatted_report(outcome),
+        })
+
+    failed = sum(1 for r in results if "error" in r)
+    logger.info("Batch analysis done, video_id=%s, %d/%d claims failed",
+               evidence.video_id, failed, len(claims))
+
+    return {
+        "video_id": evidence.video_id,
+        "results": results,
+    }
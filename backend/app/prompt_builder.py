@@ -0,0 +1,228 @@
+"""
+Token-budgeted evidence section for Backboard comparison prompts.
+
+Long videos produce hundreds of detections (chapters and highlights often describe the
+same moment twice). The builder merges near-duplicates, ranks what is left by relevance
+to the claim, keeps the best items that fit the token budget, and renders them in
+chronological order. Everything left out is recorded in BuiltPrompt.dropped.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional
+
+from app.models import VideoAnalysis
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "by", "for", "with", "from",
+    "is", "are", "was", "were", "be", "it", "he", "she", "they", "his", "her", "their", "this",
+    "that", "scene", "unknown", "none", "person",
+}
+# Evidence this close in time to a relevant item is kept as context
+NEIGHBOR_SECONDS = 10.0
+# Roughly 4 characters per token for English prose (OpenAI tokenizer average)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _terms(text: str) -> set[str]:
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1}
+
+
+def _seconds(timestamp: Optional[str]) -> Optional[float]:
+    if not timestamp:
+        return None
+    try:
+        parts = [float(p) for p in timestamp.split(":")]
+    except ValueError:
+        return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+
+@dataclass
+class EvidenceItem:
+    """One candidate line (or line pair) of the evidence section."""
+
+    section: str  # detections | speech
+    order: int
+    timestamp: Optional[str]
+    text: str
+    objects: List[str] = field(default_factory=list)
+    speaker: str = "Unknown"
+    terms: set[str] = field(default_factory=set)
+    score: float = 0.0
+
+    def render(self) -> str:
+        if self.section == "speech":
+            return f"- {self.speaker}: {self.text}"
+        line = f"- {self.timestamp}: {self.text}"
+        if self.objects:
+            line += f"\n  Objects: {', '.join(self.objects)}"
+        return line
+
+    def describe(self, reason: str) -> dict[str, Any]:
+        return {"section": self.section, "timestamp": self.timestamp, "text": self.text, "reason": reason}
+
+
+@dataclass
+class BuiltPrompt:
+    text: str
+    tokens: int
+    included: int
+    merged: int = 0
+    dropped: List[dict[str, Any]] = field(default_factory=list)
+
+
+class EvidencePromptBuilder:
+    """
+    Build the VIDEO EVIDENCE block of a prompt within budget_tokens.
+
+    Items whose word sets overlap by at least dedupe_similarity (Jaccard) within
+    dedupe_window_seconds of each other are merged into the longer one.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        *,
+        dedupe_similarity: float = 0.8,
+        dedupe_window_seconds: float = 60.0,
+    ):
+        self.budget_tokens = budget_tokens
+        self.dedupe_similarity = dedupe_similarity
+        self.dedupe_window_seconds = dedupe_window_seconds
+
+    def build(self, video_analysis: VideoAnalysis, claim_text: str = "") -> BuiltPrompt:
+        header = [f"Video Source: {video_analysis.source}", f"Duration: {video_analysis.duration}"]
+        footer: list[str] = []
+        if video_analysis.on_screen_text:
+            footer.append(f"On-screen text: {video_analysis.on_screen_text}")
+        if video_analysis.gps_metadata:
+            footer.append(f"GPS: {video_analysis.gps_metadata}")
+
+        items, merged_away = self._dedupe(self._items(video_analysis))
+        claim_terms = _terms(claim_text)
+        for item in items:
+            item.score = self._relevance(item, claim_terms)
+        self._boost_neighbors(items)
+
+        # Fixed parts (header, section titles, footer) always go in
+        used = estimate_tokens("\n".join(header + footer)) + 12
+        selected: list[EvidenceItem] = []
+        dropped = [item.describe("duplicate") for item in merged_away]
+        budget_dropped = 0
+        for item in sorted(items, key=lambda i: (-i.score, i.order)):
+            cost = estimate_tokens(item.render()) + 1
+            if used + cost <= self.budget_tokens:
+                selected.append(item)
+                used += cost
+            else:
+                dropped.append(item.describe("budget"))
+                budget_dropped += 1
+
+        selected.sort(key=lambda i: i.order)
+        lines = header + ["", "Detections:"]
+        lines.extend(i.render() for i in selected if i.section == "detections")
+        if footer:
+            lines.append("")
+            lines.extend(footer)
+        speech = [i.render() for i in selected if i.section == "speech"]
+        if speech:
+            lines.extend(["", "Speech transcription:"])
+            lines.extend(speech)
+        if budget_dropped:
+            lines.extend(["", f"({budget_dropped} lower-relevance evidence items omitted for length)"])
+        text = "\n".join(lines) + "\n"
+        return BuiltPrompt(
+            text=text,
+            tokens=estimate_tokens(text),
+            included=len(selected),
+            merged=len(merged_away),
+            dropped=dropped,
+        )
+
+    @staticmethod
+    def _items(video_analysis: VideoAnalysis) -> list[EvidenceItem]:
+        items = []
+        for detection in video_analysis.detections:
+            items.append(EvidenceItem(
+                section="detections",
+                order=len(items),
+                timestamp=detection.timestamp,
+                text=detection.description,
+                objects=list(detection.objects),
+                terms=_terms(detection.description),
+            ))
+        for speech in video_analysis.speech_transcription or []:
+            text = speech.get("text", "")
+            items.append(EvidenceItem(
+                section="speech",
+                order=len(items),
+                timestamp=speech.get("timestamp"),
+                text=text,
+                speaker=speech.get("speaker", "Unknown"),
+                terms=_terms(text),
+            ))
+        return items
+
+    def _dedupe(self, items: list[EvidenceItem]) -> tuple[list[EvidenceItem], list[EvidenceItem]]:
+        kept: list[EvidenceItem] = []
+        merged_away: list[EvidenceItem] = []
+        for item in items:
+            twin = self._find_duplicate(item, kept)
+            if twin is None:
+                kept.append(item)
+                continue
+            # Keep the more detailed wording; union the objects
+            more_detailed = (len(item.terms), len(item.text)) > (len(twin.terms), len(twin.text))
+            keep, drop = (item, twin) if more_detailed else (twin, item)
+            keep.objects = list(dict.fromkeys(keep.objects + drop.objects))
+            keep.order, keep.timestamp = twin.order, twin.timestamp  # first sighting
+            if keep is item:
+                kept[kept.index(twin)] = item
+            merged_away.append(drop)
+        return kept, merged_away
+
+    def _find_duplicate(self, item: EvidenceItem, kept: Iterable[EvidenceItem]) -> Optional[EvidenceItem]:
+        if not item.terms:
+            return None
+        t = _seconds(item.timestamp)
+        for other in kept:
+            if other.section != item.section or not other.terms:
+                continue
+            other_t = _seconds(other.timestamp)
+            if t is not None and other_t is not None and abs(t - other_t) > self.dedupe_window_seconds:
+                continue
+            overlap = len(item.terms & other.terms) / len(item.terms | other.terms)
+            if overlap >= self.dedupe_similarity:
+                return other
+        return None
+
+    def _boost_neighbors(self, items: list[EvidenceItem]) -> None:
+        """Items within NEIGHBOR_SECONDS of a relevant one inherit half its score (context)."""
+        anchors = [(t, item.score) for item in items if item.score > 0 and (t := _seconds(item.timestamp)) is not None]
+        if not anchors:
+            return
+        for item in items:
+            t = _seconds(item.timestamp)
+            if t is None:
+                continue
+            inherited = max((score / 2 for at, score in anchors if abs(at - t) <= NEIGHBOR_SECONDS), default=0.0)
+            item.score = max(item.score, inherited)
+
+    @staticmethod
+    def _relevance(item: EvidenceItem, claim_terms: set[str]) -> float:
+        if not claim_terms or not item.terms:
+            return 0.0
+        terms = item.terms | {o.lower() for o in item.objects}
+        hits = len(terms & claim_terms)
+        return hits / math.sqrt(len(terms))
@@ -25,6 +25,11 @@ class ReportGenerator:
         lines.extend(ReportGenerator._generate_header(report))
         lines.append("")
         
+        # Partial report notice
+        if report.partial:
+            lines.extend(ReportGenerator._generate_partial_notice(report))
+            lines.append("")
+        
         # Witness Claim
         lines.extend(ReportGenerator._generate_claim_section(report))
         lines.append("")
@@ -61,6 +66,14 @@ class ReportGenerator:
             "╚══════════════════════════════════════════════════════════════╝"
         ]
     
+    @staticmethod
+    def _generate_partial_notice(report: CredibilityReport) -> list:
+        """Generate the notice listing stages missing from a partial report."""
+        lines = ["  ⚠ PARTIAL REPORT – skipped:"]
+        for line in ReportGenerator._wrap_text(", ".join(report.skipped_stages), 58):
+            lines.append(f"    {line.rstrip()}")
+        return lines
+    
     @staticmethod
     def _generate_claim_section(report: CredibilityReport) -> list:
         """Generate witness claim section."""
@@ -1,28 +1,36 @@
 """
-Video analysis API: POST analyze, GET job status, GET evidence pack.
+Video analysis API: POST analyze, GET job status, GET job listing, GET evidence pack,
+and presigned multipart uploads so videos go from the browser straight to S3.
+Analyze jobs go on the durable queue (app.job_queue) and are run by app.worker.
 """
 from __future__ import annotations
 
+import base64
+import binascii
 import logging
-from typing import Optional
+import math
+from datetime import datetime
+from typing import Literal, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 
 from app.config import get_settings
-from app.db import (
-    create_job,
-    get_job,
-    get_job_by_video_id,
-    update_job_status,
-)
+from app.db import Job, create_job, get_job, get_job_by_video_id, list_jobs
 from app.models_twelvelabs.evidence import EvidencePack
-from app.models_twelvelabs.jobs import (
-    AnalyzeRequest,
-    JobStatus,
-    JobStatusResponse,
+from app.models_twelvelabs.jobs import AnalyzeRequest, JobListResponse, JobRecord, JobStatusResponse
+from app.models_twelvelabs.uploads import (
+    MAX_PARTS,
+    CompleteUploadRequest,
+    CompleteUploadResponse,
+    CreateUploadRequest,
+    CreateUploadResponse,
+    SignedPart,
+    SignPartsRequest,
+    SignPartsResponse,
 )
 from app.services import s3_store
-from app.services.twelvelabs_client import run_analysis
+from app.services.evidence_read_cache import etag_matches, get_evidence_read_cache
+from app.worker import get_job_worker
 
 logger = logging.getLogger(__name__)
 
@@ -44,55 +52,11 @@ def _validate_analyze_request(body: AnalyzeRequest) -> None:
         )
 
 
-def _run_analysis_task(job_id: str) -> None:
-    """Background task: load job, run TwelveLabs, save evidence to S3, update job."""
-    job = get_job(job_id)
-    if not job or job.status not in (JobStatus.PENDING, JobStatus.PROCESSING):
-        logger.warning("Job %s not found or not runnable", job_id)
-        return
-
-    update_job_status(job_id, JobStatus.PROCESSING)
-    project_id = job.project_id
-    source_type = job.source_type or "youtube"
-    source_url = job.source_url or ""
-
-    try:
-        settings = get_settings()
-        if source_type == "youtube":
-            video_url = source_url
-        else:
-            # S3: TwelveLabs needs a publicly accessible URL; use presigned (long expiry)
-            video_url = s3_store.get_presigned_url(source_url, expires=7200)
-            if not video_url:
-                raise RuntimeError("Failed to generate presigned URL for S3 key")
-
-        pack = run_analysis(
-            video_url=video_url,
-            source_type=source_type,
-            source_url_for_pack=source_url,
-        )
-        video_id = pack.video_id
-
-        # Persist evidence to S3
-        settings.require_s3()
-        key = s3_store.evidence_key(project_id, video_id)
-        s3_store.put_json(key, pack.model_dump(mode="json"))
-
-        update_job_status(job_id, JobStatus.DONE, video_id=video_id)
-        logger.info("Job %s done, video_id=%s", job_id, video_id)
-    except Exception as e:
-        logger.exception("Job %s failed: %s", job_id, e)
-        update_job_status(
-            job_id,
-            JobStatus.FAILED,
-            error_message=str(e),
-        )
-
-
 @router.post("/analyze")
-def analyze_videos(request: AnalyzeRequest, background_tasks: BackgroundTasks) -> dict:
+def analyze_videos(request: AnalyzeRequest) -> dict:
     """
     Submit a video for analysis. Returns job_id immediately; poll GET /analyze/{job_id} for status.
+    The job is queued; in-process workers (JOB_WORKERS) or `python -m app.worker` run it.
     Requires S3_BUCKET and (unless TWELVELABS_MOCK=true) TWELVELABS_API_KEY + TWELVELABS_INDEX_ID.
     """
     _validate_analyze_request(request)
@@ -109,36 +73,83 @@ def analyze_videos(request: AnalyzeRequest, background_tasks: BackgroundTasks) -
         source_type=source_type,
         source_url=source_url,
     )
-    background_tasks.add_task(_run_analysis_task, job.job_id)
+    worker = get_job_worker()
+    if worker is not None:
+        worker.wake()
     return {
         "job_id": job.job_id,
         "status": job.status,
-        "message": "Analysis started. Poll GET /api/videos/analyze/{job_id} for status.",
+        "message": "Analysis queued. Poll GET /api/videos/analyze/{job_id} for status.",
     }
 
 
 @router.get("/analyze/{job_id}", response_model=JobStatusResponse)
 def get_analyze_status(job_id: str) -> JobStatusResponse:
-    """Return job status; when status is 'done', video_id is set."""
+    """
+    Return job status; when status is 'done', video_id is set. A job being retried is
+    'pending' again with the last error and its attempt count.
+    """
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return JobStatusResponse(
         job_id=job.job_id,
         status=job.status,
+        stage=job.stage,
         video_id=job.video_id,
         error=job.error_message,
+        attempts=job.attempts,
+    )
+
+
+def _encode_cursor(job: Job) -> str:
+    raw = f"{job.created_at.isoformat()}|{job.job_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), job_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/jobs", response_model=JobListResponse)
+def list_analyze_jobs(
+    project_id: Optional[str] = Query(None, description="Only jobs of this project"),
+    status: Optional[Literal["pending", "processing", "done", "failed"]] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+) -> JobListResponse:
+    """
+    List jobs newest first. Pages are keyset-paginated: follow next_cursor until it is null.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    # One extra row tells whether another page exists
+    jobs = list_jobs(project_id=project_id, status=status, limit=limit + 1, after=after)
+    page = jobs[:limit]
+    return JobListResponse(
+        jobs=[JobRecord.model_validate(job.model_dump()) for job in page],
+        next_cursor=_encode_cursor(page[-1]) if len(jobs) > limit else None,
     )
 
 
-@router.get("/{video_id}/evidence")
+def _evidence_not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="Evidence not found (may still be processing)")
+
+
+@router.get("/{video_id}/evidence", response_model=EvidencePack)
 def get_evidence(
     video_id: str,
     project_id: Optional[str] = Query(None, description="Project ID (optional if unique)"),
-) -> EvidencePack:
+    if_none_match: Optional[str] = Header(None),
+) -> EvidencePack | Response:
     """
-    Return EvidencePack for the given video_id. Loads from S3.
+    Return EvidencePack for the given video_id. Loads from S3 through the evidence read cache.
     If project_id is omitted, the first job with this video_id is used.
+    Responses carry an ETag; send it back in If-None-Match to get 304 when unchanged.
     """
     job = get_job_by_video_id(video_id, project_id=project_id)
     if not job:
@@ -147,10 +158,119 @@ def get_evidence(
             detail="No job found for this video_id (and project_id)",
         )
     key = s3_store.evidence_key(job.project_id, video_id)
-    data = s3_store.get_json(key)
-    if not data:
+    cache = get_evidence_read_cache()
+    if cache is None:
+        data = s3_store.get_json(key)
+        if not data:
+            raise _evidence_not_found()
+        return EvidencePack.model_validate(data)
+
+    cached = cache.get(key)
+    if cached is None:
+        raise _evidence_not_found()
+    # no-cache: browsers keep the body but must revalidate (cheap 304) before reuse
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+# ---------- Direct-to-S3 multipart uploads ----------
+# Flow: POST /uploads → POST /uploads/{upload_id}/parts → PUT each part to its URL (in
+# parallel, from the browser) → POST /uploads/{upload_id}/complete → POST /analyze with s3_key.
+
+
+def _part_size(size_bytes: int, preferred: int) -> int:
+    """Preferred size, raised (in whole MiB) when the file would need more than MAX_PARTS parts."""
+    mib = 1024 * 1024
+    needed = math.ceil(size_bytes / MAX_PARTS)
+    return max(preferred, math.ceil(needed / mib) * mib)
+
+
+def _require_direct_uploads() -> None:
+    settings = get_settings()
+    if settings.storage_backend != "s3":
+        raise HTTPException(status_code=501, detail="Direct uploads need STORAGE_BACKEND=s3")
+    settings.require_s3()
+
+
+def _check_upload_key(s3_key: str) -> None:
+    if not s3_store.is_upload_key(s3_key):
+        raise HTTPException(status_code=400, detail="s3_key is not a direct upload key")
+
+
+def _upload_call(fn, *args):
+    try:
+        return fn(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.post("/uploads", response_model=CreateUploadResponse)
+def create_upload(request: CreateUploadRequest) -> CreateUploadResponse:
+    """Start a multipart upload of size_bytes; returns the S3 key, upload id and part layout."""
+    _require_direct_uploads()
+    settings = get_settings()
+    if request.size_bytes > settings.direct_upload_max_bytes:
         raise HTTPException(
-            status_code=404,
-            detail="Evidence not found (may still be processing)",
+            status_code=413,
+            detail=f"Video exceeds {settings.direct_upload_max_bytes} bytes",
         )
-    return EvidencePack.model_validate(data)
+    key = s3_store.upload_key(request.project_id, request.filename)
+    upload_id = _upload_call(s3_store.create_multipart_upload, key, request.content_type, request.size_bytes)
+    part_size = _part_size(request.size_bytes, settings.direct_upload_part_bytes)
+    return CreateUploadResponse(
+        upload_id=upload_id,
+        s3_key=key,
+        part_size=part_size,
+        part_count=math.ceil(request.size_bytes / part_size),
+    )
+
+
+@router.post("/uploads/{upload_id}/parts", response_model=SignPartsResponse)
+def sign_upload_parts(upload_id: str, request: SignPartsRequest) -> SignPartsResponse:
+    """Presigned PUT URLs for the given part numbers (ask again for fresh URLs on retry)."""
+    _require_direct_uploads()
+    _check_upload_key(request.s3_key)
+    expires = get_settings().direct_upload_url_expires_seconds
+    urls = _upload_call(
+        s3_store.presign_upload_parts, request.s3_key, upload_id, sorted(set(request.part_numbers)), expires
+    )
+    return SignPartsResponse(
+        parts=[SignedPart(part_number=n, url=url) for n, url in urls.items()],
+        expires_in=expires,
+    )
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=CompleteUploadResponse)
+def complete_upload(upload_id: str, request: CompleteUploadRequest) -> CompleteUploadResponse:
+    """
+    Assemble the uploaded parts; the returned s3_key can then be analyzed. Part URLs do not
+    bind sizes, so the assembled video is deleted (413) if it exceeds the size declared at
+    POST /uploads or DIRECT_UPLOAD_MAX_BYTES.
+    """
+    _require_direct_uploads()
+    _check_upload_key(request.s3_key)
+    parts = {p.part_number: p.etag for p in request.parts}
+    if len(parts) != len(request.parts):
+        raise HTTPException(status_code=400, detail="Duplicate part_number")
+    etag = _upload_call(s3_store.complete_multipart_upload, request.s3_key, upload_id, list(parts.items()))
+    size, declared = _upload_call(s3_store.uploaded_size, request.s3_key)
+    limit = get_settings().direct_upload_max_bytes
+    if declared is not None:
+        limit = min(limit, declared)
+    if size > limit:
+        _upload_call(s3_store.delete_object, request.s3_key)
+        raise HTTPException(status_code=413, detail=f"Uploaded {size} bytes; this upload allows at most {limit}")
+    return CompleteUploadResponse(s3_key=request.s3_key, etag=etag)
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+def abort_upload(upload_id: str, s3_key: str = Query(..., description="s3_key from POST /uploads")) -> Response:
+    """Abandon an upload so S3 discards the parts already stored."""
+    _require_direct_uploads()
+    _check_upload_key(s3_key)
+    _upload_call(s3_store.abort_multipart_upload, s3_key, upload_id)
+    return Response(status_code=204)
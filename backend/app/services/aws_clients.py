@@ -0,0 +1,110 @@
+"""
+Process-wide boto3 clients for S3 and DynamoDB.
+
+Building a client resolves credentials, loads the service model and opens a new
+connection pool, so it is done once: one S3 client per process (boto3 clients are
+thread-safe) and one DynamoDB resource per thread (resources are not). All of them
+come from a single boto3 Session and share one botocore Config (pool size, adaptive
+retries, timeouts).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Optional
+
+import boto3
+from botocore.config import Config
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_session: Optional[boto3.Session] = None
+_s3_client: Any = None
+# Bumped by reset_aws_clients() so threads drop resources built from an old session
+_generation = 0
+_local = threading.local()
+
+
+def _config() -> Config:
+    s = get_settings()
+    options: dict[str, Any] = {}
+    if s.aws_endpoint_url:
+        # Local stand-ins do not serve virtual-hosted bucket names
+        options["s3"] = {"addressing_style": "path"}
+    return Config(
+        max_pool_connections=s.aws_max_pool_connections,
+        retries={"mode": "adaptive", "total_max_attempts": s.aws_max_attempts},
+        connect_timeout=s.aws_connect_timeout_seconds,
+        read_timeout=s.aws_read_timeout_seconds,
+        **options,
+    )
+
+
+def _get_session() -> boto3.Session:
+    """Caller holds _lock (boto3 Sessions are not thread-safe)."""
+    global _session
+    if _session is None:
+        s = get_settings()
+        kwargs = {"region_name": s.aws_region}
+        if s.aws_access_key_id and s.aws_secret_access_key:
+            kwargs["aws_access_key_id"] = s.aws_access_key_id
+            kwargs["aws_secret_access_key"] = s.aws_secret_access_key
+        _session = boto3.Session(**kwargs)
+    return _session
+
+
+def get_s3_client():
+    """Shared S3 client."""
+    global _s3_client
+    client = _s3_client
+    if client is None:
+        with _lock:
+            if _s3_client is None:
+                _s3_client = _get_session().client(
+                    "s3",
+                    config=_config(),
+                    endpoint_url=get_settings().aws_endpoint_url,
+                )
+            client = _s3_client
+    return client
+
+
+def get_dynamodb_table(table_name: str):
+    """DynamoDB Table for table_name, from this thread's resource."""
+    if getattr(_local, "generation", None) != _generation:
+        _local.generation = _generation
+        _local.resource = None
+        _local.tables = {}
+    if _local.resource is None:
+        with _lock:
+            _local.resource = _get_session().resource(
+                "dynamodb",
+                config=_config(),
+                endpoint_url=get_settings().aws_endpoint_url,
+            )
+    table = _local.tables.get(table_name)
+    if table is None:
+        table = _local.tables[table_name] = _local.resource.Table(table_name)
+    return table
+
+
+def open_aws_clients() -> None:
+    """Create the shared clients up front (app lifespan) instead of on the first request."""
+    s = get_settings()
+    if s.storage_backend == "s3" and s.s3_bucket:
+        get_s3_client()
+        logger.info("S3 client ready")
+
+
+def reset_aws_clients() -> None:
+    """Close the shared clients; the next call builds new ones (settings changed, shutdown, tests)."""
+    global _session, _s3_client, _generation
+    with _lock:
+        if _s3_client is not None:
+            _s3_client.close()
+        _session = None
+        _s3_client = None
+        _generation += 1
@@ -8,10 +8,10 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 
 from app.config import get_settings
+from app.services.aws_clients import get_dynamodb_table
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +20,7 @@ SK_INCIDENT_PREFIX = "INCIDENT#"
 
 
 def _table():
-    settings = get_settings()
-    region = settings.aws_region
-    table_name = settings.dynamodb_table_name
-    kwargs = {"region_name": region}
-    if settings.aws_access_key_id and settings.aws_secret_access_key:
-        kwargs["aws_access_key_id"] = settings.aws_access_key_id
-        kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
-    dynamodb = boto3.resource("dynamodb", **kwargs)
-    return dynamodb.Table(table_name)
+    return get_dynamodb_table(get_settings().dynamodb_table_name)
 
 
 def _now_iso() -> str:
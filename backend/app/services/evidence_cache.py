@@ -0,0 +1,265 @@
+"""
+Content-addressed EvidencePack cache in front of run_analysis.
+
+Keys: "sha256:<hex>" of uploaded bytes (streamed), "youtube:<video id>" for any
+YouTube URL form, "s3:<key>" for uploaded objects, "url:<sha256>" for other URLs.
+Tiers: bounded in-memory LRU with TTL, then disk (JSON files) or S3 (JSON objects).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.config import get_settings
+from app.models_twelvelabs.evidence import EvidencePack
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+_YOUTUBE_PATH_PREFIXES = ("/shorts/", "/embed/", "/live/", "/v/")
+
+
+# ---------- Keys ----------
+
+
+def hash_stream(stream: BinaryIO) -> str:
+    """SHA-256 of a binary stream, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key_for_file(path: str | Path) -> str:
+    with open(path, "rb") as f:
+        return "sha256:" + hash_stream(f)
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """Extract the video id from any common YouTube URL form, or None."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host in ("youtu.be", "www.youtu.be"):
+        return parts.path.strip("/").split("/")[0] or None
+    if host in _YOUTUBE_HOSTS:
+        if parts.path == "/watch":
+            return dict(parse_qsl(parts.query)).get("v") or None
+        for prefix in _YOUTUBE_PATH_PREFIXES:
+            if parts.path.startswith(prefix):
+                return parts.path[len(prefix):].split("/")[0] or None
+    return None
+
+
+def cache_key_for_url(url: str) -> str:
+    video_id = youtube_video_id(url)
+    if video_id:
+        return "youtube:" + video_id
+    parts = urlsplit(url.strip())
+    canonical = urlunsplit((
+        parts.scheme.lower(),
+        (parts.hostname or "").lower() + (f":{parts.port}" if parts.port else ""),
+        parts.path or "/",
+        urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True))),
+        "",
+    ))
+    return "url:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cache_key_for_s3(s3_key: str) -> str:
+    return "s3:" + s3_key
+
+
+def _key_digest(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+# ---------- Second tiers ----------
+
+
+class DiskTier:
+    """JSON files in one directory, pruned to max_entries by last use; shared with evidence_read_cache."""
+
+    def __init__(self, directory: str | Path, max_entries: int):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{_key_digest(key)}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Evidence cache: unreadable entry %s: %s", path.name, e)
+            return None
+        os.utime(path)  # LRU: mtime tracks last use
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._prune()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _prune(self) -> None:
+        files = list(self.directory.glob("*.json"))
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:excess]:
+            path.unlink(missing_ok=True)
+
+
+class _S3Tier:
+    """Entries under cache/evidence/ in the app bucket; use a lifecycle rule for size control."""
+
+    prefix = "cache/evidence/"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{_key_digest(key)}.json"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        from app.services import s3_store
+
+        return s3_store.get_json(self._key(key))
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        from app.services import s3_store
+
+        s3_store.put_json(self._key(key), entry)
+
+    def delete(self, key: str) -> None:
+        pass  # expired entries are overwritten on the next put
+
+
+# ---------- Cache ----------
+
+
+class EvidenceCache:
+    """Two-tier EvidencePack cache with TTL and LRU eviction. Thread-safe."""
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int, tier=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.tier = tier
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[EvidencePack]:
+        entry = self._get_entry(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return EvidencePack.model_validate(entry["pack"])
+
+    def _get_entry(self, key: str) -> Optional[dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry["expires_at"] > now:
+                    self._memory.move_to_end(key)
+                    return entry
+                del self._memory[key]
+        if self.tier is None:
+            return None
+        try:
+            entry = self.tier.get(key)
+        except Exception as e:
+            logger.warning("Evidence cache tier read failed for %s: %s", key, e)
+            return None
+        if not entry or entry.get("key") != key:
+            return None
+        if entry.get("expires_at", 0) <= now:
+            self.tier.delete(key)
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, pack: EvidencePack) -> None:
+        now = time.time()
+        entry = {
+            "key": key,
+            "video_id": pack.video_id,
+            "cached_at": now,
+            "expires_at": now + self.ttl_seconds,
+            "pack": pack.model_dump(mode="json"),
+        }
+        self._remember(key, entry)
+        if self.tier is not None:
+            try:
+                self.tier.put(key, entry)
+            except Exception as e:
+                logger.warning("Evidence cache tier write failed for %s: %s", key, e)
+
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    async def aget(self, key: str) -> Optional[EvidencePack]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, pack: EvidencePack) -> None:
+        await asyncio.to_thread(self.put, key, pack)
+
+
+def _build_tier():
+    s = get_settings()
+    tier = (s.evidence_cache_tier or "none").lower()
+    if tier == "disk":
+        return DiskTier(s.evidence_cache_dir, s.evidence_cache_disk_max_entries)
+    if tier == "s3":
+        if s.storage_backend == "s3" and not s.s3_bucket:
+            logger.warning("EVIDENCE_CACHE_TIER=s3 but S3_BUCKET is not set; using memory only")
+            return None
+        return _S3Tier()
+    return None
+
+
+_cache: Optional[EvidenceCache] = None
+
+
+def get_evidence_cache() -> Optional[EvidenceCache]:
+    """Process-wide cache, or None when EVIDENCE_CACHE_ENABLED=false."""
+    global _cache
+    s = get_settings()
+    if not s.evidence_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = EvidenceCache(
+            ttl_seconds=s.evidence_cache_ttl_seconds,
+            max_entries=s.evidence_cache_max_entries,
+            tier=_build_tier(),
+        )
+    return _cache
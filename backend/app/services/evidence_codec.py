@@ -0,0 +1,106 @@
+"""
+Storage codec for JSON objects in S3 (EvidencePacks, job results, evidence cache entries).
+
+Objects are serialized with orjson when installed (stdlib json otherwise) and, above
+S3_JSON_COMPRESS_MIN_BYTES, compressed with gzip or zstd. The compression is recorded in
+the object's Content-Encoding and the codec version in its metadata, so readers never
+guess; objects written before the codec existed (plain JSON, no metadata) still decode.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CODEC_VERSION = "1"
+METADATA_KEY = "noirvision-codec"  # S3 user metadata (x-amz-meta-noirvision-codec)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+@dataclass
+class EncodedObject:
+    body: bytes
+    content_encoding: Optional[str] = None  # None = identity
+    metadata: dict[str, str] = field(default_factory=lambda: {METADATA_KEY: CODEC_VERSION})
+
+
+def dumps(data: Any) -> bytes:
+    """Compact JSON bytes; non-JSON values (datetimes, etc.) go through str() like json.dumps(default=str)."""
+    if orjson is not None:
+        try:
+            # Passthrough keeps datetimes as str(dt), exactly what the stdlib path writes
+            return orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib json handles them
+    return json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def loads(body: bytes | memoryview) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)  # reads memoryviews (mmap-backed bodies) without a copy
+    return json.loads(bytes(body))
+
+
+def _compression() -> str:
+    compression = get_settings().s3_json_compression.lower()
+    if compression == "zstd" and zstandard is None:
+        logger.warning("S3_JSON_COMPRESSION=zstd but zstandard is not installed; using gzip")
+        return "gzip"
+    return compression
+
+
+def encode(data: Any, *, compression: Optional[str] = None) -> EncodedObject:
+    """Serialize (and compress, when worthwhile) data for put_object."""
+    s = get_settings()
+    body = dumps(data)
+    compression = compression or _compression()
+    if compression == "none" or len(body) < s.s3_json_compress_min_bytes:
+        return EncodedObject(body)
+    if compression == "zstd":
+        compressed = zstandard.ZstdCompressor(level=s.s3_json_compression_level or 3).compress(body)
+    else:
+        # Levels above 9 are zstd-only (zstd may be configured but not installed)
+        level = min(s.s3_json_compression_level, 9) or 6
+        compressed = gzip.compress(body, compresslevel=level, mtime=0)
+    if len(compressed) >= len(body):
+        return EncodedObject(body)
+    return EncodedObject(compressed, content_encoding=compression)
+
+
+def decode(body: bytes | memoryview, content_encoding: Optional[str] = None) -> Any:
+    """
+    Parse an object body. Compression comes from Content-Encoding; bodies without one are
+    sniffed by magic bytes (JSON never starts with them) so legacy and re-uploaded objects
+    both read back.
+    """
+    encoding = (content_encoding or "").lower()
+    head = bytes(body[:4])
+    if encoding == "zstd" or (not encoding and head.startswith(_ZSTD_MAGIC)):
+        if zstandard is None:
+            raise RuntimeError("Object is zstd-compressed but zstandard is not installed")
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    elif encoding == "gzip" or (not encoding and head.startswith(_GZIP_MAGIC)):
+        body = gzip.decompress(body)
+    return loads(body)
@@ -0,0 +1,236 @@
+"""
+In-process vector index over EvidencePack segments for claim-relevant retrieval.
+
+The transcript, events, chapters and key quotes are chunked into timestamped segments,
+embedded with a local embedding function (default: a hashing embedder, no model download)
+and searched by cosine similarity with NumPy. Indexes are saved as .npz files under
+EVIDENCE_CACHE_DIR/index, keyed by video, content and embedder, so repeat claims on the same
+video skip re-embedding.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.config import get_settings
+from app.models import VideoAnalysis, VideoDetection
+from app.models_twelvelabs.evidence import EvidencePack
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+INDEX_VERSION = 1
+
+
+class Embedder(Protocol):
+    """Local embedding function: texts -> (n, dim) float32 array of L2-normalized rows."""
+
+    name: str
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """
+    Feature-hashing bag of words + bigrams. Deterministic, dependency-free and fast;
+    good at lexical overlap, which is most of what claim facts vs. evidence needs.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hash{dim}"
+
+    def _features(self, text: str) -> Iterable[str]:
+        words = _WORD.findall(text.lower())
+        yield from words
+        yield from (f"{a} {b}" for a, b in zip(words, words[1:]))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                vectors[row, value % self.dim] += 1.0 if value >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class Segment:
+    kind: str  # transcript | event | chapter | quote
+    text: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+
+def chunk_evidence(pack: EvidencePack, max_chars: int = 400) -> List[Segment]:
+    """Split an EvidencePack into retrievable segments (transcript in sentence windows)."""
+    segments: List[Segment] = []
+    chunk: list[str] = []
+    size = 0
+    for sentence in _SENTENCE.split(pack.transcript.strip()):
+        if not sentence:
+            continue
+        if chunk and size + len(sentence) > max_chars:
+            segments.append(Segment("transcript", " ".join(chunk)))
+            chunk, size = [], 0
+        chunk.append(sentence)
+        size += len(sentence) + 1
+    if chunk:
+        segments.append(Segment("transcript", " ".join(chunk)))
+    segments.extend(Segment("event", f"{e.label}: {e.evidence}", e.t, e.t) for e in pack.events)
+    segments.extend(Segment("chapter", c.summary, c.start, c.end) for c in pack.chapters)
+    segments.extend(Segment("quote", q.text, q.t, q.t) for q in pack.key_quotes)
+    return segments
+
+
+def _timestamp(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class EvidenceIndex:
+    def __init__(self, segments: List[Segment], vectors: np.ndarray, embedder: Embedder):
+        self.segments = segments
+        self.vectors = vectors
+        self.embedder = embedder
+
+    @classmethod
+    def build(cls, segments: List[Segment], embedder: Embedder) -> "EvidenceIndex":
+        vectors = embedder.embed([s.text for s in segments]) if segments else np.zeros((0, 1), np.float32)
+        return cls(segments, vectors, embedder)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def _top(self, query: str, k: int) -> List[tuple[int, float]]:
+        if not self.segments or not query.strip():
+            return []
+        scores = self.vectors @ self.embedder.embed([query])[0]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+    def search(self, query: str, k: int) -> List[tuple[Segment, float]]:
+        """Top-k segments by cosine similarity (only positive matches)."""
+        return [(self.segments[i], score) for i, score in self._top(query, k)]
+
+    def retrieve(self, queries: Iterable[str], k: int) -> List[Segment]:
+        """Union of the top-k segments per query, in time order (untimed transcript last)."""
+        chosen = {i for query in queries for i, _ in self._top(query, k)}
+        segments = [self.segments[i] for i in sorted(chosen)]
+        return sorted(segments, key=lambda s: (s.start is None, s.start or 0.0))
+
+    def focus(self, video_analysis: VideoAnalysis, queries: Iterable[str], k: int) -> VideoAnalysis:
+        """
+        Copy of video_analysis whose detections/speech are only the retrieved segments;
+        video_analysis itself when nothing matched (an empty prompt would fail every category).
+        """
+        segments = self.retrieve(queries, k)
+        if not segments:
+            return video_analysis
+        detections = [
+            VideoDetection(
+                timestamp=_timestamp(s.start),
+                description=("Scene: " if s.kind == "chapter" else "") + s.text,
+                objects=[s.kind],
+            )
+            for s in segments if s.kind != "quote"
+        ]
+        speech = [
+            {"timestamp": _timestamp(s.start), "speaker": "Person", "text": s.text}
+            for s in segments if s.kind == "quote"
+        ]
+        return video_analysis.model_copy(update={
+            "detections": detections,
+            "speech_transcription": speech or None,
+        })
+
+    # ---------- Persistence ----------
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    vectors=self.vectors,
+                    segments=np.array(json.dumps([asdict(s) for s in self.segments])),
+                    meta=np.array(json.dumps({"version": INDEX_VERSION, "embedder": self.embedder.name})),
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str | Path, embedder: Embedder) -> Optional["EvidenceIndex"]:
+        """Saved index, or None if missing, unreadable or built with another embedder."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("version") != INDEX_VERSION or meta.get("embedder") != embedder.name:
+                    return None
+                segments = [Segment(**s) for s in json.loads(str(data["segments"]))]
+                vectors = data["vectors"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Evidence index %s unreadable: %s", path, e)
+            return None
+        try:
+            os.utime(path)  # LRU: mtime tracks last use
+        except OSError:
+            pass
+        return cls(segments, vectors, embedder)
+
+
+def _index_path(video_id: str, segments: List[Segment], embedder: Embedder) -> Path:
+    # Keyed by video and segment content, so a re-analyzed video gets a fresh index
+    digest = hashlib.sha256(video_id.encode("utf-8"))
+    digest.update(json.dumps([asdict(s) for s in segments]).encode("utf-8"))
+    return Path(get_settings().evidence_cache_dir) / "index" / f"{digest.hexdigest()[:32]}-{embedder.name}.npz"
+
+
+def _prune(directory: Path, max_entries: int) -> None:
+    """Delete the least recently used saved indexes beyond max_entries."""
+    files = list(directory.glob("*.npz"))
+    excess = len(files) - max_entries
+    if excess <= 0:
+        return
+    files.sort(key=lambda p: p.stat().st_mtime)
+    for path in files[:excess]:
+        path.unlink(missing_ok=True)
+
+
+def get_or_build_index(pack: EvidencePack, embedder: Optional[Embedder] = None) -> EvidenceIndex:
+    """Load the saved index for this pack, or build and save it. Blocking; run in a thread."""
+    embedder = embedder or HashingEmbedder(get_settings().evidence_index_dim)
+    segments = chunk_evidence(pack)
+    path = _index_path(pack.video_id, segments, embedder)
+    index = EvidenceIndex.load(path, embedder)
+    if index is not None:
+        return index
+    index = EvidenceIndex.build(segments, embedder)
+    try:
+        index.save(path)
+        _prune(path.parent, get_settings().evidence_index_max_entries)
+    except OSError as e:
+        logger.warning("Could not save evidence index for %s: %s", pack.video_id, e)
+    return index
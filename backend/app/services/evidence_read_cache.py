@@ -0,0 +1,160 @@
+"""
+Read-through cache for GET /api/videos/{video_id}/evidence, keyed by evidence S3 key.
+
+Entries hold the validated, serialized response body, so a hit skips the S3 GET, the
+decode and the pydantic validation. Tiers: bounded in-memory LRU (entry count and
+bytes), then optionally disk (EVIDENCE_READ_CACHE_DIR). An entry older than
+EVIDENCE_READ_CACHE_REVALIDATE_SECONDS is revalidated with S3 If-None-Match, which
+costs a 304 and no body when the pack is unchanged.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import get_settings
+from app.models_twelvelabs.evidence import EvidencePack
+from app.services import s3_store
+from app.services.evidence_cache import DiskTier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedEvidence:
+    body: bytes  # EvidencePack JSON as served
+    etag: str  # HTTP ETag of body
+    s3_etag: Optional[str]  # validator for S3 revalidation
+    checked_at: float  # last time S3 confirmed this version
+
+
+def _http_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+class EvidenceReadCache:
+    """Thread-safe; callers run it in the threadpool (sync endpoint)."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int, revalidate_seconds: float, tier=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.tier = tier
+        self._memory: OrderedDict[str, CachedEvidence] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedEvidence]:
+        """The evidence at S3 key (cached or fetched), or None if there is none."""
+        now = time.time()
+        entry = self._lookup(key)
+        if entry is not None and now - entry.checked_at < self.revalidate_seconds:
+            self.hits += 1
+            return entry
+
+        result = s3_store.get_json_if_changed(key, entry.s3_etag if entry else None)
+        if result is None:
+            self._forget(key)
+            return None
+        if result.not_modified:
+            self.revalidated += 1
+            entry.checked_at = now
+        else:
+            self.misses += 1
+            body = EvidencePack.model_validate(result.data).model_dump_json().encode("utf-8")
+            entry = CachedEvidence(body=body, etag=_http_etag(body), s3_etag=result.etag, checked_at=now)
+        self._remember(key, entry, persist=not result.not_modified)
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        self._forget(key)
+
+    def _lookup(self, key: str) -> Optional[CachedEvidence]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        if self.tier is None:
+            return None
+        try:
+            stored = self.tier.get(key)
+        except Exception as e:
+            logger.warning("Evidence read cache tier read failed for %s: %s", key, e)
+            return None
+        if not stored or stored.get("key") != key:
+            return None
+        body = stored["body"].encode("utf-8")
+        # checked_at is not persisted: an entry from disk is always revalidated first
+        return CachedEvidence(body=body, etag=_http_etag(body), s3_etag=stored.get("s3_etag"), checked_at=0)
+
+    def _remember(self, key: str, entry: CachedEvidence, *, persist: bool) -> None:
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            if len(entry.body) <= self.max_bytes:
+                self._memory[key] = entry
+                self._bytes += len(entry.body)
+            while self._memory and (len(self._memory) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._memory.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        if self.tier is not None and persist:
+            try:
+                self.tier.put(key, {"key": key, "s3_etag": entry.s3_etag, "body": entry.body.decode("utf-8")})
+            except Exception as e:
+                logger.warning("Evidence read cache tier write failed for %s: %s", key, e)
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+        if self.tier is not None:
+            try:
+                self.tier.delete(key)
+            except Exception as e:
+                logger.warning("Evidence read cache tier delete failed for %s: %s", key, e)
+
+
+_cache: Optional[EvidenceReadCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_evidence_read_cache() -> Optional[EvidenceReadCache]:
+    """Process-wide cache, or None when EVIDENCE_READ_CACHE_ENABLED=false."""
+    global _cache
+    s = get_settings()
+    if not s.evidence_read_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                tier = None
+                if s.evidence_read_cache_dir:
+                    tier = DiskTier(s.evidence_read_cache_dir, s.evidence_read_cache_disk_max_entries)
+                _cache = EvidenceReadCache(
+                    max_entries=s.evidence_read_cache_max_entries,
+                    max_bytes=s.evidence_read_cache_max_bytes,
+                    revalidate_seconds=s.evidence_read_cache_revalidate_seconds,
+                    tier=tier,
+                )
+    return _cache
@@ -0,0 +1,91 @@
+"""
+Job progress as Server-Sent Events.
+
+Progress is persisted on the job row (status/stage), so any process can serve the
+stream. Within a process, publish() wakes waiting streams immediately; otherwise
+they re-read the row every JOB_EVENTS_POLL_SECONDS (e.g. progress written by a
+separate worker process).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+from app.config import get_settings
+from app.db import Job, get_job
+from app.models_twelvelabs.jobs import JobStatus
+
+TERMINAL_STATUSES = (JobStatus.DONE, JobStatus.FAILED)
+
+# Each waiting stream has its own event; removed when it wakes, times out or is cancelled
+_waiters: dict[str, set[asyncio.Event]] = {}
+
+
+def publish(job_id: str) -> None:
+    """Wake streams for job_id in this process (call after writing status/stage)."""
+    for event in _waiters.pop(job_id, ()):
+        event.set()
+
+
+async def _wait_for_change(job_id: str, timeout: float) -> None:
+    event = asyncio.Event()
+    waiters = _waiters.setdefault(job_id, set())
+    waiters.add(event)
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        waiters.discard(event)
+        if not waiters and _waiters.get(job_id) is waiters:
+            del _waiters[job_id]
+
+
+def job_event_payload(job: Job) -> dict:
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "stage": job.stage,
+        "video_id": job.video_id,
+        "error": job.error_message,
+    }
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_job_events(
+    job_id: str,
+    *,
+    poll_seconds: Optional[float] = None,
+    keepalive_seconds: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages: a "progress" event whenever status or stage changes, then a
+    final "done" or "failed" event. Idle periods get ": keep-alive" comments.
+    """
+    s = get_settings()
+    poll_seconds = poll_seconds or s.job_events_poll_seconds
+    keepalive_seconds = keepalive_seconds or s.job_events_keepalive_seconds
+    last_state = None
+    last_sent = time.monotonic()
+    while True:
+        job = await asyncio.to_thread(get_job, job_id)
+        if job is None:
+            yield format_sse("failed", {"job_id": job_id, "error": "Job not found"})
+            return
+        state = (job.status, job.stage)
+        if job.status in TERMINAL_STATUSES:
+            yield format_sse(job.status, job_event_payload(job))
+            return
+        if state != last_state:
+            yield format_sse("progress", job_event_payload(job))
+            last_state = state
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= keepalive_seconds:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await _wait_for_change(job_id, poll_seconds)
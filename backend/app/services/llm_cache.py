@@ -0,0 +1,239 @@
+"""
+Response cache for Backboard LLM calls, keyed by (model, whitespace-normalized prompt).
+
+Tiers: bounded in-memory LRU, then a SQLite file (survives restarts; shared by workers
+on one host). Entries expire after LLM_CACHE_TTL_SECONDS; the SQLite tier is pruned to
+LLM_CACHE_DISK_MAX_ENTRIES by last use. Inside `llm_cache_bypass()` reads are skipped
+(fresh responses are still stored).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def llm_cache_bypass(enabled: bool = True) -> Iterator[None]:
+    """Skip cache reads for LLM calls made in this context (and tasks started from it)."""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def llm_cache_key(model: str, prompt: str) -> str:
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class _SqliteTier:
+    def __init__(self, path: str | Path, max_entries: int):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)  # connect() won't create it
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_cache ("
+                        " key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL,"
+                        " created_at REAL NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used)")
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, key: str, now: float) -> Optional[tuple[str, float]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0], row[1]
+        finally:
+            conn.close()
+
+    def put(self, key: str, model: str, response: str, now: float, expires_at: float) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, now, expires_at, now),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            (count,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN"
+                    " (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, key: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class LLMCache:
+    """Two-tier LLM response cache with TTL, LRU/size eviction and hit/miss counters. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        path: Optional[str | Path] = None,
+        disk_max_entries: int = 20000,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.disk = _SqliteTier(path, disk_max_entries) if path else None
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+
+    def get(self, key: str) -> Optional[str]:
+        if _bypass.get():
+            self.bypassed += 1
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+        if self.disk is not None:
+            try:
+                entry = self.disk.get(key, now)
+            except sqlite3.Error as e:
+                logger.warning("LLM cache read failed: %s", e)
+                entry = None
+            if entry is not None:
+                self._remember(key, entry)
+                self.disk_hits += 1
+                return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self._remember(key, (response, expires_at))
+        self.stores += 1
+        if self.disk is not None:
+            try:
+                self.disk.put(key, model, response, now, expires_at)
+            except sqlite3.Error as e:
+                logger.warning("LLM cache write failed: %s", e)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.disk is not None:
+            try:
+                self.disk.delete(key)
+            except sqlite3.Error as e:
+                logger.warning("LLM cache delete failed: %s", e)
+
+    def _remember(self, key: str, entry: tuple[str, float]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    async def aget(self, key: str) -> Optional[str]:
+        if self.disk is None or _bypass.get():
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, model: str, response: str) -> None:
+        if self.disk is None:
+            self.put(key, model, response)
+        else:
+            await asyncio.to_thread(self.put, key, model, response)
+
+    async def adelete(self, key: str) -> None:
+        if self.disk is None:
+            self.delete(key)
+        else:
+            await asyncio.to_thread(self.delete, key)
+
+    def stats(self) -> dict[str, float]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "stores": self.stores,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache, or None when LLM_CACHE_ENABLED=false."""
+    global _cache
+    s = get_settings()
+    if not s.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = LLMCache(
+            ttl_seconds=s.llm_cache_ttl_seconds,
+            max_entries=s.llm_cache_max_entries,
+            path=s.llm_cache_path or None,
+            disk_max_entries=s.llm_cache_disk_max_entries,
+        )
+    return _cache
@@ -0,0 +1,153 @@
+"""
+Object storage behind s3_store: S3 (default) or a local directory (STORAGE_BACKEND=local).
+
+The local backend needs no AWS or network, for load tests and air-gapped installs. Writes
+go to a temp file in the target directory and are renamed into place, so readers never see
+a partial object; reads of objects over STORAGE_MMAP_MIN_BYTES are memory-mapped instead
+of copied. ETags are derived from mtime and size, so conditional reads work as with S3.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Protocol, Union
+
+from app.config import get_settings
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StoredObject:
+    body: Union[bytes, memoryview]  # empty when not_modified
+    etag: Optional[str]
+    content_encoding: Optional[str] = None
+    not_modified: bool = False
+
+
+class ObjectStore(Protocol):
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        content_type: str,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[dict[str, str]] = None,
+    ) -> None: ...
+
+    def get(self, key: str, *, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        """None if the object does not exist; not_modified=True if it still has ETag if_none_match."""
+        ...
+
+    def iter_chunks(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        """Stream the object in chunks without holding it in memory; None if it does not exist."""
+        ...
+
+    def presigned_url(self, key: str, expires: int = 3600) -> str: ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Filesystem path of the object, for backends that have one."""
+        ...
+
+
+class LocalObjectStore:
+    """Objects as files under root, at their key's path."""
+
+    def __init__(self, root: str | Path, *, mmap_min_bytes: int):
+        self.root = Path(root).resolve()
+        self.mmap_min_bytes = mmap_min_bytes
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if path == self.root or not path.is_relative_to(self.root):
+            raise ValueError(f"Invalid object key: {key!r}")
+        return path
+
+    @staticmethod
+    def _etag(st: os.stat_result) -> str:
+        return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        content_type: str,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[dict[str, str]] = None,
+    ) -> None:
+        # Content-Encoding is not stored: evidence_codec recognizes compressed bodies by their magic bytes
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str, *, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        try:
+            f = open(self._path(key), "rb")
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+        with f:
+            # fstat on the open file: a concurrent rename cannot pair this ETag with other bytes
+            st = os.fstat(f.fileno())
+            etag = self._etag(st)
+            if if_none_match == etag:
+                return StoredObject(body=b"", etag=etag, not_modified=True)
+            if st.st_size and st.st_size >= self.mmap_min_bytes:
+                # The mapping outlives the file handle; it is unmapped when the view is released
+                body: Union[bytes, memoryview] = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                body = f.read()
+        return StoredObject(body=body, etag=etag)
+
+    def iter_chunks(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        path = self._path(key)
+        if not path.is_file():
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with open(path, "rb") as f:
+                yield from iter(lambda: f.read(chunk_size), b"")
+
+        return chunks()
+
+    def presigned_url(self, key: str, expires: int = 3600) -> str:
+        return self._path(key).as_uri()
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self._path(key)
+
+
+_store: Optional[ObjectStore] = None
+_store_config: Optional[tuple] = None
+_lock = threading.Lock()
+
+
+def get_object_store() -> ObjectStore:
+    """Process-wide store for STORAGE_BACKEND (rebuilt if the storage settings change)."""
+    global _store, _store_config
+    s = get_settings()
+    config = (s.storage_backend, s.storage_local_root, s.storage_mmap_min_bytes)
+    if _store is None or _store_config != config:
+        with _lock:
+            if s.storage_backend == "local":
+                _store = LocalObjectStore(s.storage_local_root, mmap_min_bytes=s.storage_mmap_min_bytes)
+            else:
+                from app.services.s3_store import S3ObjectStore
+
+                _store = S3ObjectStore()
+            _store_config = config
+    return _store
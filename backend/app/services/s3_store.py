@@ -1,84 +1,276 @@
 """
-S3 utilities: presigned URLs, put/get JSON.
+Object storage utilities: presigned URLs, put/get JSON, object keys.
 Evidence path: projects/{project_id}/videos/{video_id}/evidence.json
 Job artifacts (optional): projects/{project_id}/jobs/{job_id}.json
+Direct uploads: projects/{project_id}/uploads/{upload}/video.<ext> (presigned multipart)
+JSON bodies are written through evidence_codec (compressed, Content-Encoding set).
+Objects live in S3 (S3ObjectStore) or, with STORAGE_BACKEND=local, in a local directory
+(see app.services.object_store); multipart uploads are S3 only.
 """
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Optional
+import re
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 
 from app.config import get_settings
+from app.services import evidence_codec
+from app.services.aws_clients import get_s3_client
+from app.services.object_store import STREAM_CHUNK_SIZE, StoredObject, get_object_store
 
 logger = logging.getLogger(__name__)
 
+_UPLOAD_SUFFIX = re.compile(r"^\.[A-Za-z0-9]{1,8}$")
+_UPLOAD_KEY = re.compile(r"^projects/[A-Za-z0-9_.-]+/uploads/[0-9a-f]{32}/video\.[A-Za-z0-9]{1,8}$")
+# S3 rejects these because of the request (bad upload id, ETags, part order or sizes)
+_CLIENT_UPLOAD_ERRORS = {"NoSuchUpload", "InvalidPart", "InvalidPartOrder", "EntityTooSmall"}
+# Object metadata holding the size given when a direct upload was started
+_DECLARED_SIZE_METADATA = "declared-bytes"
+
 
 def _client():
-    s = get_settings()
-    kwargs = {"region_name": s.aws_region}
-    if s.aws_access_key_id and s.aws_secret_access_key:
-        kwargs["aws_access_key_id"] = s.aws_access_key_id
-        kwargs["aws_secret_access_key"] = s.aws_secret_access_key
-    return boto3.client("s3", **kwargs)
+    return get_s3_client()
+
+
+def _not_found(e: ClientError) -> bool:
+    return e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")
+
+
+class S3ObjectStore:
+    """ObjectStore on the S3_BUCKET bucket."""
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        content_type: str,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[dict[str, str]] = None,
+    ) -> None:
+        extra: dict[str, Any] = {"ContentEncoding": content_encoding} if content_encoding else {}
+        if metadata:
+            extra["Metadata"] = metadata
+        try:
+            _client().put_object(
+                Bucket=get_settings().s3_bucket,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+                **extra,
+            )
+        except ClientError as e:
+            logger.exception("Failed to put key=%s", key)
+            raise RuntimeError(f"S3 put failed: {e}") from e
+
+    def get(self, key: str, *, if_none_match: Optional[str] = None) -> Optional[StoredObject]:
+        kwargs = {"IfNoneMatch": if_none_match} if if_none_match else {}
+        try:
+            resp = _client().get_object(Bucket=get_settings().s3_bucket, Key=key, **kwargs)
+        except ClientError as e:
+            if e.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 304:
+                return StoredObject(body=b"", etag=if_none_match, not_modified=True)
+            if _not_found(e):
+                logger.debug("S3 key not found: %s", key)
+                return None
+            logger.exception("Failed to get key=%s", key)
+            raise RuntimeError(f"S3 get failed: {e}") from e
+        return StoredObject(
+            body=resp["Body"].read(),
+            etag=resp.get("ETag"),
+            content_encoding=resp.get("ContentEncoding"),
+        )
+
+    def iter_chunks(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        try:
+            resp = _client().get_object(Bucket=get_settings().s3_bucket, Key=key)
+        except ClientError as e:
+            if _not_found(e):
+                return None
+            logger.exception("Failed to stream key=%s", key)
+            raise RuntimeError(f"S3 get failed: {e}") from e
+        return resp["Body"].iter_chunks(chunk_size)
+
+    def presigned_url(self, key: str, expires: int = 3600) -> str:
+        try:
+            return _client().generate_presigned_url(
+                "get_object",
+                Params={"Bucket": get_settings().s3_bucket, "Key": key},
+                ExpiresIn=expires,
+            )
+        except ClientError as e:
+            logger.exception("Failed to generate presigned URL for key=%s", key)
+            raise RuntimeError(f"S3 presigned URL failed: {e}") from e
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return None
 
 
 def get_presigned_url(s3_key: str, expires: int = 3600) -> str:
-    """Generate a presigned GET URL for the object."""
-    client = _client()
-    bucket = get_settings().s3_bucket
+    """Generate a presigned GET URL for the object (a file:// URL on the local backend)."""
+    return get_object_store().presigned_url(s3_key, expires)
+
+
+def put_json(key: str, data: Any) -> None:
+    """Store JSON-serializable data."""
+    encoded = evidence_codec.encode(data)
+    get_object_store().put(
+        key,
+        encoded.body,
+        content_type="application/json",
+        content_encoding=encoded.content_encoding,
+        metadata=encoded.metadata,
+    )
+    logger.info(
+        "Put key=%s bytes=%d encoding=%s",
+        key, len(encoded.body), encoded.content_encoding or "identity",
+    )
+
+
+def get_json(key: str) -> Optional[dict[str, Any]]:
+    """Load and parse stored JSON. Returns None if object does not exist."""
+    obj = get_object_store().get(key)
+    if obj is None:
+        return None
+    return evidence_codec.decode(obj.body, obj.content_encoding)
+
+
+@dataclass
+class JsonObject:
+    data: Any  # None when not_modified
+    etag: Optional[str]
+    not_modified: bool = False
+
+
+def get_json_if_changed(key: str, etag: Optional[str] = None) -> Optional[JsonObject]:
+    """
+    Conditional get_json: with etag, the store answers not modified (for S3 a 304, no body
+    transferred) if the object is unchanged. Returns None if the object does not exist.
+    """
+    obj = get_object_store().get(key, if_none_match=etag)
+    if obj is None:
+        return None
+    if obj.not_modified:
+        return JsonObject(data=None, etag=etag, not_modified=True)
+    return JsonObject(data=evidence_codec.decode(obj.body, obj.content_encoding), etag=obj.etag)
+
+
+def iter_object(key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+    """Stream a stored object (e.g. a video) in chunks; None if it does not exist."""
+    return get_object_store().iter_chunks(key, chunk_size)
+
+
+def local_path(key: str) -> Optional[Path]:
+    """Filesystem path of a stored object on the local backend, else None."""
+    return get_object_store().local_path(key)
+
+
+def evidence_key(project_id: str, video_id: str) -> str:
+    return f"projects/{project_id}/videos/{video_id}/evidence.json"
+
+
+def job_artifact_key(project_id: str, job_id: str) -> str:
+    return f"projects/{project_id}/jobs/{job_id}.json"
+
+
+def upload_key(project_id: str, filename: str) -> str:
+    """Fresh key for a direct upload; only the file extension of the client name is kept."""
+    suffix = Path(filename).suffix.lower()
+    if not _UPLOAD_SUFFIX.match(suffix):
+        suffix = ".mp4"
+    return f"projects/{project_id}/uploads/{uuid.uuid4().hex}/video{suffix}"
+
+
+def is_upload_key(key: str) -> bool:
+    return bool(_UPLOAD_KEY.match(key))
+
+
+# ---------- Presigned multipart uploads (browser → S3) ----------
+
+
+def _upload_error(action: str, key: str, e: ClientError) -> Exception:
+    code = e.response.get("Error", {}).get("Code")
+    if code in _CLIENT_UPLOAD_ERRORS:
+        return ValueError(f"S3 {action} rejected: {code}")
+    logger.exception("Failed to %s key=%s", action, key)
+    return RuntimeError(f"S3 {action} failed: {e}")
+
+
+def create_multipart_upload(key: str, content_type: str, size_bytes: int) -> str:
+    """Start a multipart upload of size_bytes (kept in object metadata); returns its upload id."""
     try:
-        url = client.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": bucket, "Key": s3_key},
-            ExpiresIn=expires,
+        resp = _client().create_multipart_upload(
+            Bucket=get_settings().s3_bucket,
+            Key=key,
+            ContentType=content_type,
+            Metadata={_DECLARED_SIZE_METADATA: str(size_bytes)},
         )
-        return url
     except ClientError as e:
-        logger.exception("Failed to generate presigned URL for key=%s", s3_key)
-        raise RuntimeError(f"S3 presigned URL failed: {e}") from e
+        raise _upload_error("create upload", key, e) from e
+    return resp["UploadId"]
 
 
-def put_json(key: str, data: Any) -> None:
-    """Upload JSON-serializable data to S3."""
+def presign_upload_parts(key: str, upload_id: str, part_numbers: list[int], expires: int = 3600) -> dict[int, str]:
+    """Presigned PUT URL per part number (signed locally; no S3 round trip)."""
     client = _client()
     bucket = get_settings().s3_bucket
-    body = json.dumps(data, default=str).encode("utf-8")
     try:
-        client.put_object(
-            Bucket=bucket,
+        return {
+            n: client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                ExpiresIn=expires,
+            )
+            for n in part_numbers
+        }
+    except ClientError as e:
+        raise _upload_error("sign upload parts", key, e) from e
+
+
+def complete_multipart_upload(key: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+    """Assemble uploaded parts ((part_number, etag) pairs); returns the object's ETag."""
+    try:
+        resp = _client().complete_multipart_upload(
+            Bucket=get_settings().s3_bucket,
             Key=key,
-            Body=body,
-            ContentType="application/json",
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [{"PartNumber": n, "ETag": etag} for n, etag in sorted(parts)],
+            },
         )
-        logger.info("Put S3 key=%s bucket=%s", key, bucket)
     except ClientError as e:
-        logger.exception("Failed to put_json key=%s", key)
-        raise RuntimeError(f"S3 put failed: {e}") from e
+        raise _upload_error("complete upload", key, e) from e
+    logger.info("Completed multipart upload key=%s parts=%d", key, len(parts))
+    return resp.get("ETag", "")
 
 
-def get_json(key: str) -> Optional[dict[str, Any]]:
-    """Download and parse JSON from S3. Returns None if object does not exist."""
-    client = _client()
-    bucket = get_settings().s3_bucket
+def abort_multipart_upload(key: str, upload_id: str) -> None:
+    """Discard an unfinished upload and its stored parts."""
     try:
-        resp = client.get_object(Bucket=bucket, Key=key)
-        body = resp["Body"].read().decode("utf-8")
-        return json.loads(body)
+        _client().abort_multipart_upload(Bucket=get_settings().s3_bucket, Key=key, UploadId=upload_id)
     except ClientError as e:
-        if e.response.get("Error", {}).get("Code") == "NoSuchKey":
-            logger.debug("S3 key not found: %s", key)
-            return None
-        logger.exception("Failed to get_json key=%s", key)
-        raise RuntimeError(f"S3 get failed: {e}") from e
+        raise _upload_error("abort upload", key, e) from e
 
 
-def evidence_key(project_id: str, video_id: str) -> str:
-    return f"projects/{project_id}/videos/{video_id}/evidence.json"
+def uploaded_size(key: str) -> tuple[int, Optional[int]]:
+    """(actual size, size declared when the upload started) of a completed direct upload."""
+    try:
+        resp = _client().head_object(Bucket=get_settings().s3_bucket, Key=key)
+    except ClientError as e:
+        logger.exception("Failed to head key=%s", key)
+        raise RuntimeError(f"S3 head failed: {e}") from e
+    declared = resp.get("Metadata", {}).get(_DECLARED_SIZE_METADATA)
+    return resp["ContentLength"], int(declared) if declared and declared.isdigit() else None
 
 
-def job_artifact_key(project_id: str, job_id: str) -> str:
-    return f"projects/{project_id}/jobs/{job_id}.json"
+def delete_object(key: str) -> None:
+    try:
+        _client().delete_object(Bucket=get_settings().s3_bucket, Key=key)
+    except ClientError as e:
+        logger.exception("Failed to delete key=%s", key)
+        raise RuntimeError(f"S3 delete failed: {e}") from e
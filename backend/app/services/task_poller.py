@@ -0,0 +1,304 @@
+"""
+Process-wide TwelveLabs task poller.
+
+Callers register a task_id and await its video_id (each on its own future, so one
+cancelled waiter does not cancel the others). A single asyncio scheduler polls
+every in-flight task: due times sit on a timer wheel (rounded up to tick slots, so
+polls that fall due together go out together), each task backs off with jitter, and
+when enough tasks are due at once their status comes from one list-tasks call per
+page instead of one GET per task.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+from app.config import get_settings
+from app.services import twelvelabs_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PolledTask:
+    task_id: str
+    future: asyncio.Future  # the task's outcome, copied to every waiter
+    deadline: float
+    timeout: float
+    interval: float
+    max_interval: float
+    last_status: Optional[str] = None
+    polls: int = field(default=0)
+    waiters: set[asyncio.Future] = field(default_factory=set)
+
+
+class TaskPoller:
+    """One scheduler for all TwelveLabs indexing tasks in this process."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, _PolledTask] = {}
+        self._wheel: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.requests_sent = 0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        """Start the scheduler on the running loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._runner is not None and not self._runner.done() and self._loop is loop:
+            return
+        if self._loop is not loop:
+            # Futures from another (closed) loop can't be resolved here.
+            self._tasks.clear()
+            self._wheel.clear()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._runner = loop.create_task(self._run(), name="twelvelabs-task-poller")
+
+    async def stop(self) -> None:
+        """Stop the scheduler and fail any task still waiting."""
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+        for entry in self._tasks.values():
+            if not entry.future.done():
+                entry.future.set_exception(RuntimeError("Task poller stopped"))
+        self._tasks.clear()
+        self._wheel.clear()
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    # ---------- registration ----------
+
+    def register(
+        self,
+        task_id: str,
+        *,
+        timeout_seconds: Optional[float] = None,
+        interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ) -> asyncio.Future:
+        """
+        Register a task; returns a future resolving to its video_id. Every call gets its
+        own future; polling stops once the task resolves or all its waiters are gone.
+        """
+        self.start()
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            s = get_settings()
+            timeout = timeout_seconds or s.twelvelabs_poll_timeout_seconds
+            entry = _PolledTask(
+                task_id=task_id,
+                future=self._loop.create_future(),
+                deadline=time.monotonic() + timeout,
+                timeout=timeout,
+                interval=interval or s.twelvelabs_poll_interval_seconds,
+                max_interval=max_interval or s.twelvelabs_poll_max_interval_seconds,
+            )
+            self._tasks[task_id] = entry
+            entry.future.add_done_callback(lambda f, e=entry: self._settle(e, f))
+            # First poll goes out on the next tick.
+            self._schedule(entry, 0.0)
+        waiter = self._loop.create_future()
+        entry.waiters.add(waiter)
+        waiter.add_done_callback(lambda w, e=entry: self._waiter_done(e, w))
+        return waiter
+
+    async def wait_until_ready(
+        self,
+        task_id: str,
+        *,
+        timeout_seconds: Optional[float] = None,
+        interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ) -> str:
+        future = self.register(
+            task_id,
+            timeout_seconds=timeout_seconds,
+            interval=interval,
+            max_interval=max_interval,
+        )
+        return await future
+
+    def _settle(self, entry: _PolledTask, future: asyncio.Future) -> None:
+        """The task resolved (or was abandoned): stop tracking it and pass the outcome on."""
+        if self._tasks.get(entry.task_id) is entry:
+            del self._tasks[entry.task_id]
+        for waiter in list(entry.waiters):
+            if waiter.done():
+                continue
+            if future.cancelled():
+                waiter.cancel()
+            elif future.exception() is not None:
+                waiter.set_exception(future.exception())
+            else:
+                waiter.set_result(future.result())
+
+    def _waiter_done(self, entry: _PolledTask, waiter: asyncio.Future) -> None:
+        entry.waiters.discard(waiter)
+        # The last waiter went away (e.g. client disconnect): stop polling the task too.
+        if not entry.waiters and not entry.future.done():
+            entry.future.cancel()
+
+    # ---------- scheduling ----------
+
+    def _schedule(self, entry: _PolledTask, delay: float) -> None:
+        tick = get_settings().twelvelabs_poll_tick_seconds
+        due = time.monotonic() + delay
+        due = min(math.ceil(due / tick) * tick, entry.deadline)
+        heapq.heappush(self._wheel, (due, next(self._seq), entry.task_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_delay(self, entry: _PolledTask) -> float:
+        jitter = get_settings().twelvelabs_poll_jitter
+        delay = entry.interval * (1 + random.uniform(-jitter, jitter))
+        entry.interval = min(entry.interval * 1.5, entry.max_interval)
+        return delay
+
+    async def _run(self) -> None:
+        while True:
+            if not self._wheel:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            due = self._wheel[0][0]
+            now = time.monotonic()
+            if due > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Take the whole current slot plus the next one, so tasks registered a few
+            # milliseconds apart still share a round.
+            horizon = now + get_settings().twelvelabs_poll_tick_seconds
+            task_ids: list[str] = []
+            while self._wheel and self._wheel[0][0] <= horizon:
+                _, _, task_id = heapq.heappop(self._wheel)
+                if task_id in self._tasks and task_id not in task_ids:
+                    task_ids.append(task_id)
+            if not task_ids:
+                continue
+            try:
+                await self._poll(task_ids)
+            except Exception:
+                logger.exception("Task poller round failed; rescheduling %d task(s)", len(task_ids))
+                for task_id in task_ids:
+                    entry = self._tasks.get(task_id)
+                    if entry is not None:
+                        self._schedule(entry, self._next_delay(entry))
+
+    # ---------- polling ----------
+
+    async def _poll(self, task_ids: list[str]) -> None:
+        statuses: dict[str, Any] = {}
+        s = get_settings()
+        if len(task_ids) >= s.twelvelabs_poll_batch_threshold and s.twelvelabs_index_id:
+            statuses = await self._list_statuses(set(task_ids), s.twelvelabs_index_id)
+
+        missing = [tid for tid in task_ids if tid not in statuses]
+        if missing:
+            results = await asyncio.gather(
+                *(twelvelabs_client.get_task_status_async(tid) for tid in missing),
+                return_exceptions=True,
+            )
+            self.requests_sent += len(missing)
+            statuses.update(zip(missing, results))
+
+        for task_id in task_ids:
+            entry = self._tasks.get(task_id)
+            if entry is not None:
+                self._apply(entry, statuses[task_id])
+
+    async def _list_statuses(self, wanted: set[str], index_id: str) -> dict[str, Any]:
+        """Look up many tasks via list-tasks pages; tasks not found are polled one by one."""
+        found: dict[str, Any] = {}
+        max_pages = get_settings().twelvelabs_poll_batch_max_pages
+        for page in range(1, max_pages + 1):
+            try:
+                data = await twelvelabs_client.list_tasks_async(index_id, page=page)
+            except Exception as e:
+                logger.warning("List tasks (page %d) failed, falling back to per-task polls: %s", page, e)
+                break
+            self.requests_sent += 1
+            for item in data.get("data") or []:
+                task_id = str(item.get("_id") or item.get("id") or "")
+                if task_id in wanted:
+                    found[task_id] = item
+            page_info = data.get("page_info") or {}
+            if len(found) == len(wanted) or page >= int(page_info.get("total_page") or 1):
+                break
+        return found
+
+    def _apply(self, entry: _PolledTask, result: Any) -> None:
+        entry.polls += 1
+        if entry.future.done():
+            return
+        if isinstance(result, BaseException):
+            if _is_permanent(result):
+                entry.future.set_exception(result)
+                return
+            logger.warning("Status poll for task %s failed (will retry): %s", entry.task_id, result)
+        else:
+            entry.last_status = (result.get("status") or "").lower()
+            try:
+                video_id = twelvelabs_client.video_id_if_done(entry.task_id, result)
+            except Exception as e:
+                entry.future.set_exception(e)
+                return
+            if video_id:
+                entry.future.set_result(video_id)
+                return
+
+        if time.monotonic() >= entry.deadline:
+            entry.future.set_exception(
+                TimeoutError(
+                    f"TwelveLabs task {entry.task_id} did not complete within {entry.timeout:g}s "
+                    f"(last status: {entry.last_status})"
+                )
+            )
+            return
+        delay = self._next_delay(entry)
+        logger.info("Task %s status=%s, next poll in %.1fs", entry.task_id, entry.last_status, delay)
+        self._schedule(entry, delay)
+
+
+def _is_permanent(error: BaseException) -> bool:
+    """Client errors other than rate limiting won't fix themselves by polling again."""
+    if isinstance(error, httpx.HTTPStatusError):
+        code = error.response.status_code
+        return 400 <= code < 500 and code != 429
+    return not isinstance(error, (httpx.HTTPError, OSError, asyncio.TimeoutError))
+
+
+_poller: Optional[TaskPoller] = None
+
+
+def get_task_poller() -> TaskPoller:
+    """Return the process-wide poller (started lazily on first registration)."""
+    global _poller
+    if _poller is None:
+        _poller = TaskPoller()
+    return _poller
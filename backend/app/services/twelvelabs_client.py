@@ -3,18 +3,28 @@ TwelveLabs API wrapper: create task, poll until ready, fetch transcript/summarie
 Isolated in one module; rest of app depends on EvidencePack, not API details.
 Uses exponential backoff for polling and a hard timeout.
 Supports: YouTube URL, public video URL, or local MP4 file (multipart upload).
+
+Each call has a sync and an ``*_async`` variant. The async variants share one
+pooled httpx.AsyncClient per process (opened/closed in the app lifespan via
+open_http_client / close_http_client) so polls and summarize calls reuse
+keep-alive connections instead of paying a TCP+TLS handshake each time.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import httpx
 
 from app.config import get_settings
+from app.deadline import NO_DEADLINE, Deadline, DeadlineExceeded
+from app.services.evidence_cache import cache_key_for_file, cache_key_for_url, get_evidence_cache
 from app.models_twelvelabs.evidence import (
     EvidencePack,
     EvidencePackSource,
@@ -22,6 +32,7 @@ from app.models_twelvelabs.evidence import (
     EvidenceEvent,
     EvidenceKeyQuote,
 )
+from app.models_twelvelabs.jobs import JobStage
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +59,80 @@ def _base_url() -> str:
     return get_settings().twelvelabs_base_url.rstrip("/")
 
 
+# ---------- Shared async HTTP client ----------
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    s = get_settings()
+    limits = httpx.Limits(
+        max_connections=s.twelvelabs_http_max_connections,
+        max_keepalive_connections=s.twelvelabs_http_max_keepalive_connections,
+        keepalive_expiry=s.twelvelabs_http_keepalive_expiry_seconds,
+    )
+    # Per-request timeouts are passed on each call; this is the fallback.
+    timeout = httpx.Timeout(
+        s.twelvelabs_summarize_timeout_seconds,
+        connect=s.twelvelabs_connect_timeout_seconds,
+    )
+    http2 = s.twelvelabs_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("TWELVELABS_HTTP2=true but h2 is not installed; using HTTP/1.1")
+            http2 = False
+    return httpx.AsyncClient(base_url=_base_url(), limits=limits, timeout=timeout, http2=http2)
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the process-wide TwelveLabs client (called from the app lifespan)."""
+    return get_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the process-wide TwelveLabs client and its pooled connections."""
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifespan (scripts, tests)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+def _timeout(seconds: float) -> httpx.Timeout:
+    return httpx.Timeout(seconds, connect=get_settings().twelvelabs_connect_timeout_seconds)
+
+
+def _mock_task() -> tuple[str, str]:
+    task_id = "mock-task-" + str(int(time.time()))
+    return task_id, "mock-video-" + task_id
+
+
+def _task_ids_from_response(data: dict[str, Any]) -> tuple[str, Optional[str]]:
+    task_id = data.get("_id") or data.get("id")
+    video_id = data.get("video_id")
+    if not task_id:
+        raise RuntimeError(f"TwelveLabs create task response missing task id: {data}")
+    logger.info("Created TwelveLabs task_id=%s video_id=%s", task_id, video_id)
+    return str(task_id), video_id
+
+
+def _log_create_failure(resp: httpx.Response) -> None:
+    if resp.status_code >= 400:
+        try:
+            logger.warning("TwelveLabs create task failed %s: %s", resp.status_code, resp.text[:500])
+        except Exception:
+            pass
+
+
 def create_video_task(
     *,
     youtube_url: Optional[str] = None,
@@ -61,9 +146,7 @@ def create_video_task(
     """
     settings = get_settings()
     if settings.twelvelabs_mock:
-        task_id = "mock-task-" + str(int(time.time()))
-        video_id = "mock-video-" + task_id
-        return task_id, video_id
+        return _mock_task()
 
     url = _base_url() + "/tasks"
     index_id = settings.twelvelabs_index_id
@@ -77,26 +160,21 @@ def create_video_task(
         with open(path, "rb") as f:
             files = {"video_file": (path.name, f, "video/mp4")}
             data = {"index_id": index_id}
-            with httpx.Client(timeout=120.0) as client:
+            with httpx.Client(timeout=settings.twelvelabs_upload_timeout_seconds) as client:
                 resp = client.post(
                     url,
                     data=data,
                     files=files,
                     headers={"x-api-key": settings.twelvelabs_api_key},
                 )
-        if resp.status_code >= 400:
-            try:
-                err_body = resp.text
-                logger.warning("TwelveLabs create task failed %s: %s", resp.status_code, err_body[:500])
-            except Exception:
-                pass
+        _log_create_failure(resp)
         resp.raise_for_status()
         data = resp.json()
     else:
         source = youtube_url or video_url
         if not source:
             raise ValueError("Provide one of: youtube_url, video_url, or video_file_path")
-        with httpx.Client(timeout=60.0) as client:
+        with httpx.Client(timeout=settings.twelvelabs_create_timeout_seconds) as client:
             resp = client.post(
                 url,
                 data={"index_id": index_id, "video_url": source},
@@ -105,12 +183,7 @@ def create_video_task(
         resp.raise_for_status()
         data = resp.json()
 
-    task_id = data.get("_id") or data.get("id")
-    video_id = data.get("video_id")
-    if not task_id:
-        raise RuntimeError(f"TwelveLabs create task response missing task id: {data}")
-    logger.info("Created TwelveLabs task_id=%s video_id=%s", task_id, video_id)
-    return str(task_id), video_id
+    return _task_ids_from_response(data)
 
 
 def get_task_status(task_id: str) -> dict[str, Any]:
@@ -120,7 +193,7 @@ def get_task_status(task_id: str) -> dict[str, Any]:
         return {"_id": task_id, "status": STATUS_READY, "video_id": "mock-video-" + task_id}
 
     url = f"{_base_url()}/tasks/{task_id}"
-    with httpx.Client(timeout=30.0) as client:
+    with httpx.Client(timeout=settings.twelvelabs_status_timeout_seconds) as client:
         resp = client.get(url, headers=_headers())
     resp.raise_for_status()
     return resp.json()
@@ -143,20 +216,12 @@ def poll_until_ready(
 
     while time.monotonic() < deadline:
         data = get_task_status(task_id)
-        status = (data.get("status") or "").lower()
-        last_status = status
-        video_id = data.get("video_id")
-
-        if status == STATUS_READY:
-            if not video_id:
-                raise RuntimeError("TwelveLabs task ready but no video_id in response")
-            logger.info("Task %s ready, video_id=%s", task_id, video_id)
-            return str(video_id)
-        if status == STATUS_FAILED:
-            msg = data.get("message") or data.get("error") or "Indexing failed"
-            raise RuntimeError(f"TwelveLabs task failed: {msg}")
-
-        logger.info("Task %s status=%s, waiting %.1fs", task_id, status, interval)
+        last_status = (data.get("status") or "").lower()
+        video_id = video_id_if_done(task_id, data)
+        if video_id:
+            return video_id
+
+        logger.info("Task %s status=%s, waiting %.1fs", task_id, last_status, interval)
         time.sleep(interval)
         interval = min(interval * 1.5, max_interval)
 
@@ -165,48 +230,111 @@ def poll_until_ready(
     )
 
 
+def video_id_if_done(task_id: str, data: dict[str, Any]) -> Optional[str]:
+    """Return video_id if the task is ready, raise if it failed, else None (keep polling)."""
+    status = (data.get("status") or "").lower()
+    video_id = data.get("video_id")
+    if status == STATUS_READY:
+        if not video_id:
+            raise RuntimeError("TwelveLabs task ready but no video_id in response")
+        logger.info("Task %s ready, video_id=%s", task_id, video_id)
+        return str(video_id)
+    if status == STATUS_FAILED:
+        msg = data.get("message") or data.get("error") or "Indexing failed"
+        raise RuntimeError(f"TwelveLabs task failed: {msg}")
+    return None
+
+
+def _mock_summarize(type_: str) -> dict[str, Any]:
+    if type_ == "summary":
+        return {"summarize_type": "summary", "summary": "Mock summary of the video."}
+    if type_ == "chapter":
+        return {
+            "summarize_type": "chapter",
+            "chapters": [
+                {
+                    "start_sec": 0.0,
+                    "end_sec": 30.0,
+                    "chapter_title": "Introduction",
+                    "chapter_summary": "Mock chapter.",
+                },
+            ],
+        }
+    if type_ == "highlight":
+        return {
+            "summarize_type": "highlight",
+            "highlights": [
+                {
+                    "start_sec": 10.0,
+                    "end_sec": 20.0,
+                    "highlight": "Key moment",
+                    "highlight_summary": "Mock highlight.",
+                },
+            ],
+        }
+    return {}
+
+
+def _summarize_payload(video_id: str, type_: str, prompt: Optional[str]) -> dict[str, Any]:
+    payload = {"video_id": video_id, "type": type_}
+    if prompt:
+        payload["prompt"] = prompt
+    return payload
+
+
 def _summarize(video_id: str, type_: str, prompt: Optional[str] = None) -> dict[str, Any]:
     """POST /summarize with video_id and type (summary | chapter | highlight)."""
     settings = get_settings()
     if settings.twelvelabs_mock:
-        if type_ == "summary":
-            return {"summarize_type": "summary", "summary": "Mock summary of the video."}
-        if type_ == "chapter":
-            return {
-                "summarize_type": "chapter",
-                "chapters": [
-                    {
-                        "start_sec": 0.0,
-                        "end_sec": 30.0,
-                        "chapter_title": "Introduction",
-                        "chapter_summary": "Mock chapter.",
-                    },
-                ],
-            }
-        if type_ == "highlight":
-            return {
-                "summarize_type": "highlight",
-                "highlights": [
-                    {
-                        "start_sec": 10.0,
-                        "end_sec": 20.0,
-                        "highlight": "Key moment",
-                        "highlight_summary": "Mock highlight.",
-                    },
-                ],
-            }
-        return {}
+        return _mock_summarize(type_)
 
     url = _base_url() + "/summarize"
-    payload = {"video_id": video_id, "type": type_}
-    if prompt:
-        payload["prompt"] = prompt
-    with httpx.Client(timeout=120.0) as client:
+    payload = _summarize_payload(video_id, type_, prompt)
+    with httpx.Client(timeout=settings.twelvelabs_summarize_timeout_seconds) as client:
         resp = client.post(url, json=payload, headers=_headers())
     resp.raise_for_status()
     return resp.json()
 
 
+_TRANSCRIPT_PROMPT = (
+    "Provide a detailed transcript of all spoken words and dialogue in this video, "
+    "with speaker identification if possible. Include timestamps where applicable."
+)
+_MOCK_TRANSCRIPT = "Mock transcript for demo. This is a placeholder."
+
+
+def _transcript_payload(video_id: str) -> dict[str, Any]:
+    return {
+        "video_id": video_id,
+        "prompt": _TRANSCRIPT_PROMPT,
+        "temperature": 0.2,
+        "stream": False,
+    }
+
+
+def _transcript_from_response(resp: httpx.Response) -> str:
+    if resp.status_code != 200:
+        logger.warning("Analyze (transcript) returned %s: %s", resp.status_code, resp.text)
+        return ""
+    data = resp.json()
+
+    # Response format from TwelveLabs: { "id": "...", "data": "text content", "finish_reason": "...", "usage": {...} }
+    if isinstance(data, str):
+        return data
+
+    if not isinstance(data, dict):
+        logger.warning("Unexpected response format: %s", type(data))
+        return ""
+
+    # The 'data' field contains the generated text
+    transcript = data.get("data", "")
+    if isinstance(transcript, str):
+        return transcript
+
+    # Fallback: try other possible fields
+    return data.get("text", "") or data.get("output", "") or data.get("response", "")
+
+
 def fetch_transcript(video_id: str) -> str:
     """
     Fetch transcript for video. Uses analyze endpoint with a transcript-style prompt.
@@ -214,39 +342,14 @@ def fetch_transcript(video_id: str) -> str:
     """
     settings = get_settings()
     if settings.twelvelabs_mock:
-        return "Mock transcript for demo. This is a placeholder."
+        return _MOCK_TRANSCRIPT
 
     # Use the /analyze endpoint for open-ended text generation
     url = _base_url() + "/analyze"
-    payload = {
-        "video_id": video_id,
-        "prompt": "Provide a detailed transcript of all spoken words and dialogue in this video, with speaker identification if possible. Include timestamps where applicable.",
-        "temperature": 0.2,
-        "stream": False,
-    }
     try:
-        with httpx.Client(timeout=120.0) as client:
-            resp = client.post(url, json=payload, headers=_headers())
-        if resp.status_code != 200:
-            logger.warning("Analyze (transcript) returned %s: %s", resp.status_code, resp.text)
-            return ""
-        data = resp.json()
-        
-        # Response format from TwelveLabs: { "id": "...", "data": "text content", "finish_reason": "...", "usage": {...} }
-        if isinstance(data, str):
-            return data
-        
-        if not isinstance(data, dict):
-            logger.warning("Unexpected response format: %s", type(data))
-            return ""
-        
-        # The 'data' field contains the generated text
-        transcript = data.get("data", "")
-        if isinstance(transcript, str):
-            return transcript
-        
-        # Fallback: try other possible fields
-        return data.get("text", "") or data.get("output", "") or data.get("response", "")
+        with httpx.Client(timeout=settings.twelvelabs_summarize_timeout_seconds) as client:
+            resp = client.post(url, json=_transcript_payload(video_id), headers=_headers())
+        return _transcript_from_response(resp)
     except Exception as e:
         logger.warning("Failed to fetch transcript for %s: %s", video_id, e)
         import traceback
@@ -279,20 +382,149 @@ def build_evidence_pack(
     source_url: str,
     *,
     raw_responses: Optional[dict[str, Any]] = None,
+    deadline: Deadline = NO_DEADLINE,
 ) -> EvidencePack:
     """
     Run transcript, chapters, highlights (and summary if needed), normalize into EvidencePack.
+    The four sections are fetched concurrently (at most twelvelabs_evidence_concurrency at
+    once); a section that fails or exceeds twelvelabs_section_timeout_seconds from its own
+    start (or the request deadline) is left empty and listed in raw_twelvelabs.
     """
     settings = get_settings()
     if settings.twelvelabs_mock:
         return _mock_evidence_pack(video_id, source_type, source_url)
 
-    transcript = fetch_transcript(video_id)
-    chapters_raw = fetch_chapters(video_id)
-    highlights_raw = fetch_highlights(video_id)
-    summary = fetch_summary(video_id)
+    fetchers = {
+        "transcript": fetch_transcript,
+        "chapters": fetch_chapters,
+        "highlights": fetch_highlights,
+        "summary": fetch_summary,
+    }
+    timeout = settings.twelvelabs_section_timeout_seconds
+    # As in the async path, each section's timeout starts when it gets one of the
+    # twelvelabs_evidence_concurrency slots, and a timed-out section gives its slot up.
+    slots = threading.Semaphore(settings.twelvelabs_evidence_concurrency)
+    changed = threading.Condition(threading.RLock())  # a section started or finished
+    released: set[str] = set()
+    abandoned: set[str] = set()
+    started_at: dict[str, float] = {}
+
+    def release(name: str) -> None:
+        with changed:
+            if name not in released:
+                released.add(name)
+                slots.release()
+
+    def run_section(name: str, fetch: Callable[[str], Any]) -> Any:
+        slots.acquire()
+        with changed:
+            if name in abandoned:
+                release(name)
+                return None
+            started_at[name] = time.monotonic()
+            changed.notify()
+        try:
+            return fetch(video_id)
+        finally:
+            release(name)
+
+    def notify(_future) -> None:
+        with changed:
+            changed.notify()
+
+    # Not a context manager: shutdown(wait=False) so a hung section can't hold the caller.
+    pool = ThreadPoolExecutor(max_workers=len(fetchers), thread_name_prefix="evidence")
+    outcomes: dict[str, Any] = {}
+    try:
+        futures = {name: pool.submit(run_section, name, fetch) for name, fetch in fetchers.items()}
+        for future in futures.values():
+            future.add_done_callback(notify)
+        with changed:
+            while len(outcomes) < len(futures):
+                now = time.monotonic()
+                for name, future in futures.items():
+                    if name in outcomes:
+                        continue
+                    if future.done():
+                        error = future.exception()
+                        outcomes[name] = error if error is not None else future.result()
+                        continue
+                    if deadline.expired:
+                        outcomes[name] = DeadlineExceeded(f"evidence {name}")
+                    elif name in started_at and now - started_at[name] >= timeout:
+                        outcomes[name] = TimeoutError(f"evidence {name} took over {timeout:g}s")
+                    else:
+                        continue
+                    abandoned.add(name)
+                    if name in started_at:
+                        release(name)
+                    future.cancel()
+                if len(outcomes) == len(futures):
+                    break
+                wake = [started_at[n] + timeout for n in futures if n in started_at and n not in outcomes]
+                if deadline.bounded:
+                    wake.append(deadline.expires_at)
+                changed.wait(timeout=max(0.0, min(wake) - now) if wake else None)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return _assemble_evidence_pack(
+        video_id,
+        source_type,
+        source_url,
+        raw_responses=raw_responses,
+        **_collect_sections(video_id, outcomes),
+    )
+
+
+_SECTION_DEFAULTS: dict[str, Any] = {
+    "transcript": "",
+    "chapters": [],
+    "highlights": [],
+    "summary": "",
+}
+
+
+def _collect_sections(video_id: str, outcomes: dict[str, Any]) -> dict[str, Any]:
+    """
+    Turn per-section results (value or exception) into _assemble_evidence_pack kwargs.
+    Failed sections fall back to their empty default and are reported under "degraded".
+    """
+    sections: dict[str, Any] = {}
+    degraded: dict[str, str] = {}
+    for name, default in _SECTION_DEFAULTS.items():
+        result = outcomes.get(name, default)
+        if isinstance(result, BaseException):
+            reason = f"{type(result).__name__}: {result}".rstrip(": ")
+            logger.warning("Evidence section %s failed for %s: %s", name, video_id, reason)
+            degraded[name] = reason
+            result = default
+        sections[name] = result
+    return {
+        "transcript": sections["transcript"],
+        "chapters_raw": sections["chapters"],
+        "highlights_raw": sections["highlights"],
+        "summary": sections["summary"],
+        "degraded_sections": degraded,
+    }
+
+
+def _assemble_evidence_pack(
+    video_id: str,
+    source_type: str,
+    source_url: str,
+    *,
+    transcript: str,
+    chapters_raw: list[dict[str, Any]],
+    highlights_raw: list[dict[str, Any]],
+    summary: str,
+    raw_responses: Optional[dict[str, Any]] = None,
+    degraded_sections: Optional[dict[str, str]] = None,
+) -> EvidencePack:
+    """Normalize raw TwelveLabs section responses into an EvidencePack."""
     if not transcript and summary:
         transcript = summary
+    if degraded_sections:
+        raw_responses = {**(raw_responses or {}), "degraded_sections": degraded_sections}
 
     chapters = [
         EvidenceChapter(
@@ -360,28 +592,339 @@ def run_analysis(
     source_type: str = "youtube",
     source_url_for_pack: Optional[str] = None,
     video_file_path: Optional[str | Path] = None,
+    *,
+    cache_key: Optional[str] = None,
+    use_cache: bool = True,
+    deadline: Deadline = NO_DEADLINE,
 ) -> EvidencePack:
     """
     Full flow: create task, poll until ready, build EvidencePack.
     Pass either (video_url + source_type + source_url_for_pack) or video_file_path.
     For local MP4: video_file_path=path, source_type="s3", source_url_for_pack=path (or path as string).
+    Checks the EvidencePack cache first, like run_analysis_async.
+    Polling and evidence building stop at the deadline (DeadlineExceeded / degraded sections).
+    """
+    settings = get_settings()
+    if video_file_path is not None:
+        path = Path(video_file_path)
+        display_url = source_url_for_pack or str(path)
+        src_type = source_type if source_url_for_pack else "s3"
+        task_source: dict[str, Any] = {"video_file_path": path}
+    else:
+        if not video_url or not source_url_for_pack:
+            raise ValueError("Provide video_url and source_url_for_pack, or video_file_path")
+        display_url = source_url_for_pack
+        src_type = source_type
+        task_source = {"video_url": video_url}
+
+    if settings.twelvelabs_mock:
+        task_id, video_id = create_video_task(**task_source)
+        time.sleep(settings.twelvelabs_mock_delay_seconds)
+        return _mock_evidence_pack(video_id, src_type, display_url)
+
+    cache = get_evidence_cache() if use_cache else None
+    if cache is not None:
+        if cache_key is None:
+            cache_key = cache_key_for_file(path) if video_file_path is not None else cache_key_for_url(video_url)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("Evidence cache hit %s (video_id=%s); skipping indexing", cache_key, cached.video_id)
+            return cached.model_copy(update={"source": EvidencePackSource(type=src_type, url=display_url)})
+
+    task_id, _ = create_video_task(**task_source)
+    video_id = _poll_within(task_id, deadline)
+    pack = build_evidence_pack(video_id, src_type, display_url, deadline=_evidence_deadline(deadline))
+    if cache is not None and _cacheable(pack):
+        cache.put(cache_key, pack)
+    return pack
+
+
+def _cacheable(pack: EvidencePack) -> bool:
+    """Partial packs are not cached so the next submission gets a chance at the full one."""
+    return not (pack.raw_twelvelabs or {}).get("degraded_sections")
+
+
+def _evidence_deadline(deadline: Deadline) -> Deadline:
+    """Evidence building stops early enough to leave the reserve for Backboard analysis."""
+    return deadline.reserve(get_settings().analysis_deadline_reserve_seconds)
+
+
+def _poll_within(task_id: str, deadline: Deadline) -> str:
+    deadline.check("indexing")
+    try:
+        return poll_until_ready(task_id, timeout_seconds=deadline.cap(get_settings().twelvelabs_poll_timeout_seconds))
+    except TimeoutError:
+        if deadline.expired:
+            raise DeadlineExceeded("indexing") from None
+        raise
+
+
+# ---------- Async API (shared pooled client) ----------
+
+
+async def create_video_task_async(
+    *,
+    youtube_url: Optional[str] = None,
+    video_url: Optional[str] = None,
+    video_file_path: Optional[str | Path] = None,
+    deadline: Deadline = NO_DEADLINE,
+) -> tuple[str, Optional[str]]:
+    """Async create_video_task on the shared client. Returns (task_id, video_id)."""
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return _mock_task()
+    deadline.check("upload")
+
+    index_id = settings.twelvelabs_index_id
+    if not index_id:
+        raise ValueError("TWELVELABS_INDEX_ID is required for create_video_task")
+    client = get_http_client()
+    headers = {"x-api-key": settings.twelvelabs_api_key}
+
+    if video_file_path is not None:
+        path = Path(video_file_path)
+        if not path.is_file():
+            raise FileNotFoundError(f"Video file not found: {path}")
+        with open(path, "rb") as f:
+            resp = await client.post(
+                "/tasks",
+                data={"index_id": index_id},
+                files={"video_file": (path.name, f, "video/mp4")},
+                headers=headers,
+                timeout=_timeout(deadline.cap(settings.twelvelabs_upload_timeout_seconds)),
+            )
+        _log_create_failure(resp)
+    else:
+        source = youtube_url or video_url
+        if not source:
+            raise ValueError("Provide one of: youtube_url, video_url, or video_file_path")
+        resp = await client.post(
+            "/tasks",
+            data={"index_id": index_id, "video_url": source},
+            headers=headers,
+            timeout=_timeout(deadline.cap(settings.twelvelabs_create_timeout_seconds)),
+        )
+    resp.raise_for_status()
+    return _task_ids_from_response(resp.json())
+
+
+async def get_task_status_async(task_id: str) -> dict[str, Any]:
+    """Async GET task by id on the shared client."""
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return {"_id": task_id, "status": STATUS_READY, "video_id": "mock-video-" + task_id}
+
+    resp = await get_http_client().get(
+        f"/tasks/{task_id}",
+        headers=_headers(),
+        timeout=_timeout(settings.twelvelabs_status_timeout_seconds),
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def list_tasks_async(index_id: str, *, page: int = 1, page_limit: int = 50) -> dict[str, Any]:
+    """GET /tasks for an index (newest first). Returns raw response with data and page_info."""
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return {"data": [], "page_info": {"page": page, "total_page": 1}}
+
+    resp = await get_http_client().get(
+        "/tasks",
+        params={"index_id": index_id, "page": page, "page_limit": page_limit},
+        headers=_headers(),
+        timeout=_timeout(settings.twelvelabs_status_timeout_seconds),
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def poll_until_ready_async(
+    task_id: str,
+    timeout_seconds: Optional[int] = None,
+    poll_interval_base: Optional[float] = None,
+    max_interval: Optional[float] = None,
+) -> str:
+    """
+    Async poll_until_ready. Registers the task with the process-wide TaskPoller, which
+    polls all in-flight tasks from one scheduler (batched, with backoff and jitter).
+    Returns video_id when ready; raises on timeout or failed status.
+    """
+    from app.services.task_poller import get_task_poller
+
+    return await get_task_poller().wait_until_ready(
+        task_id,
+        timeout_seconds=timeout_seconds,
+        interval=poll_interval_base,
+        max_interval=max_interval,
+    )
+
+
+async def _summarize_async(video_id: str, type_: str, prompt: Optional[str] = None) -> dict[str, Any]:
+    """Async POST /summarize on the shared client."""
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return _mock_summarize(type_)
+
+    resp = await get_http_client().post(
+        "/summarize",
+        json=_summarize_payload(video_id, type_, prompt),
+        headers=_headers(),
+        timeout=_timeout(settings.twelvelabs_summarize_timeout_seconds),
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def fetch_transcript_async(video_id: str) -> str:
+    """Async fetch_transcript. Returns empty string if endpoint not available or on error."""
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return _MOCK_TRANSCRIPT
+
+    try:
+        resp = await get_http_client().post(
+            "/analyze",
+            json=_transcript_payload(video_id),
+            headers=_headers(),
+            timeout=_timeout(settings.twelvelabs_summarize_timeout_seconds),
+        )
+        return _transcript_from_response(resp)
+    except Exception as e:
+        logger.warning("Failed to fetch transcript for %s: %s", video_id, e)
+        return ""
+
+
+async def fetch_chapters_async(video_id: str) -> list[dict[str, Any]]:
+    raw = await _summarize_async(video_id, "chapter")
+    chapters = raw.get("chapters") or []
+    return [c for c in chapters if isinstance(c, dict)]
+
+
+async def fetch_highlights_async(video_id: str) -> list[dict[str, Any]]:
+    raw = await _summarize_async(video_id, "highlight")
+    return raw.get("highlights") or []
+
+
+async def fetch_summary_async(video_id: str) -> str:
+    raw = await _summarize_async(video_id, "summary")
+    return raw.get("summary") or ""
+
+
+async def build_evidence_pack_async(
+    video_id: str,
+    source_type: str,
+    source_url: str,
+    *,
+    raw_responses: Optional[dict[str, Any]] = None,
+    deadline: Deadline = NO_DEADLINE,
+) -> EvidencePack:
+    """
+    Async build_evidence_pack: the four sections run concurrently (at most
+    twelvelabs_evidence_concurrency at once), each bounded by twelvelabs_section_timeout_seconds
+    and the request deadline.
+    """
+    settings = get_settings()
+    if settings.twelvelabs_mock:
+        return _mock_evidence_pack(video_id, source_type, source_url)
+
+    fetchers = {
+        "transcript": fetch_transcript_async,
+        "chapters": fetch_chapters_async,
+        "highlights": fetch_highlights_async,
+        "summary": fetch_summary_async,
+    }
+    semaphore = asyncio.Semaphore(settings.twelvelabs_evidence_concurrency)
+    timeout = settings.twelvelabs_section_timeout_seconds
+
+    async def fetch_section(name: str, fetch) -> Any:
+        async with semaphore:
+            return await deadline.run(fetch(video_id), f"evidence {name}", timeout=timeout)
+
+    results = await asyncio.gather(
+        *(fetch_section(name, fetch) for name, fetch in fetchers.items()),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return _assemble_evidence_pack(
+        video_id,
+        source_type,
+        source_url,
+        raw_responses=raw_responses,
+        **_collect_sections(video_id, dict(zip(fetchers, results))),
+    )
+
+
+async def run_analysis_async(
+    video_url: Optional[str] = None,
+    source_type: str = "youtube",
+    source_url_for_pack: Optional[str] = None,
+    video_file_path: Optional[str | Path] = None,
+    *,
+    cache_key: Optional[str] = None,
+    use_cache: bool = True,
+    on_stage: Optional[Callable[[str], None]] = None,
+    deadline: Deadline = NO_DEADLINE,
+) -> EvidencePack:
+    """
+    Async run_analysis: create task, poll until ready, build EvidencePack.
+    Checks the EvidencePack cache first (key: content hash of the file, canonical
+    YouTube id, or the given cache_key) so identical videos are not re-indexed.
+    on_stage, if given, is called with JobStage.INDEXING / BUILDING_EVIDENCE.
+    Upload and indexing raise DeadlineExceeded past the deadline; evidence sections
+    still missing at the deadline are left empty (degraded).
     """
     settings = get_settings()
     if video_file_path is not None:
         path = Path(video_file_path)
         display_url = source_url_for_pack or str(path)
         src_type = source_type if source_url_for_pack else "s3"
-        if settings.twelvelabs_mock:
-            task_id, video_id = create_video_task(video_file_path=path)
-            return _mock_evidence_pack(video_id, src_type, display_url)
-        task_id, _ = create_video_task(video_file_path=path)
-        video_id = poll_until_ready(task_id)
-        return build_evidence_pack(video_id, src_type, display_url)
-    if not video_url or not source_url_for_pack:
-        raise ValueError("Provide video_url and source_url_for_pack, or video_file_path")
+        task_source: dict[str, Any] = {"video_file_path": path}
+    else:
+        if not video_url or not source_url_for_pack:
+            raise ValueError("Provide video_url and source_url_for_pack, or video_file_path")
+        display_url = source_url_for_pack
+        src_type = source_type
+        task_source = {"video_url": video_url}
+
+    if on_stage:
+        on_stage(JobStage.INDEXING)
     if settings.twelvelabs_mock:
-        task_id, video_id = create_video_task(video_url=video_url)
-        return _mock_evidence_pack(video_id, source_type, source_url_for_pack)
-    task_id, _ = create_video_task(video_url=video_url)
-    video_id = poll_until_ready(task_id)
-    return build_evidence_pack(video_id, source_type, source_url_for_pack)
+        task_id, video_id = await create_video_task_async(**task_source)
+        await deadline.run(asyncio.sleep(settings.twelvelabs_mock_delay_seconds), "indexing")
+        if on_stage:
+            on_stage(JobStage.BUILDING_EVIDENCE)
+        return _mock_evidence_pack(video_id, src_type, display_url)
+
+    cache = get_evidence_cache() if use_cache else None
+    if cache is not None:
+        if cache_key is None:
+            if video_file_path is not None:
+                cache_key = await asyncio.to_thread(cache_key_for_file, path)
+            else:
+                cache_key = cache_key_for_url(video_url)
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logger.info("Evidence cache hit %s (video_id=%s); skipping indexing", cache_key, cached.video_id)
+            return cached.model_copy(update={"source": EvidencePackSource(type=src_type, url=display_url)})
+
+    try:
+        task_id, _ = await create_video_task_async(**task_source, deadline=deadline)
+        deadline.check("indexing")
+        video_id = await poll_until_ready_async(
+            task_id, timeout_seconds=deadline.cap(settings.twelvelabs_poll_timeout_seconds)
+        )
+    except DeadlineExceeded:
+        raise
+    except (TimeoutError, httpx.TimeoutException):
+        if deadline.expired:
+            raise DeadlineExceeded("indexing") from None
+        raise
+    if on_stage:
+        on_stage(JobStage.BUILDING_EVIDENCE)
+    pack = await build_evidence_pack_async(video_id, src_type, display_url, deadline=_evidence_deadline(deadline))
+    if cache is not None and _cacheable(pack):
+        await cache.aput(cache_key, pack)
+    return pack
@@ -0,0 +1,257 @@
+"""
+Memory-bounded upload handling for video files.
+
+spool_upload copies an UploadFile to a unique temp file in fixed-size chunks,
+hashing as it goes, so neither whole-file reads nor client filenames are involved.
+Routes using SpoolingRoute write multipart file parts straight into such a temp file
+(a HashingSpool) while the request is parsed, so spool_upload keeps it without a copy.
+MaxUploadSizeMiddleware rejects oversized multipart bodies with 413 from the
+Content-Length header, or as soon as a streamed body crosses the limit.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Coroutine, Optional
+
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartException, MultiPartParser, parse_options_header
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+_SAFE_SUFFIX = re.compile(r"^\.[A-Za-z0-9]{1,8}$")
+
+
+class UploadTooLarge(ValueError):
+    """Upload exceeded MAX_UPLOAD_BYTES."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+@dataclass
+class SpooledUpload:
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+
+    @property
+    def cache_key(self) -> str:
+        """EvidencePack cache key for these bytes (see evidence_cache.cache_key_for_file)."""
+        return "sha256:" + self.sha256
+
+    def cleanup(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _safe_suffix(filename: str) -> str:
+    suffix = Path(filename).suffix
+    return suffix if _SAFE_SUFFIX.match(suffix) else ".mp4"
+
+
+class HashingSpool:
+    """
+    Unique temp file that hashes bytes as they are written. Deleted on close() unless
+    keep() handed it over first.
+    """
+
+    def __init__(self, *, suffix: str, dir: Optional[str] = None):
+        fd, tmp = tempfile.mkstemp(prefix="noirvision_", suffix=suffix, dir=dir)
+        self.path = Path(tmp)
+        self._file = os.fdopen(fd, "w+b")
+        self._digest = hashlib.sha256()
+        self._kept = False
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        return self._file.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def keep(self) -> Path:
+        """Flush and hand the file over; the caller now deletes it."""
+        self._file.flush()
+        self._kept = True
+        return self.path
+
+    def close(self) -> None:
+        self._file.close()
+        if not self._kept:
+            self.path.unlink(missing_ok=True)
+
+
+class _SpoolingMultiPartParser(MultiPartParser):
+    """Starlette's parser, with file parts written into HashingSpools in UPLOAD_TMP_DIR."""
+
+    def on_headers_finished(self) -> None:
+        super().on_headers_finished()
+        upload = self._current_part.file
+        if upload is not None:
+            upload.file.close()  # the (still empty) SpooledTemporaryFile made by super()
+            upload.file = HashingSpool(
+                suffix=_safe_suffix(upload.filename or ""), dir=get_settings().upload_tmp_dir
+            )
+            self._files_to_close_on_error.append(upload.file)
+
+
+class _SpoolingRequest(Request):
+    async def _get_form(
+        self,
+        *,
+        max_files: int | float = 1000,
+        max_fields: int | float = 1000,
+        max_part_size: int = 1024 * 1024,
+    ) -> FormData:
+        content_type, _ = parse_options_header(self.headers.get("Content-Type"))
+        if self._form is None and content_type == b"multipart/form-data":
+            try:
+                async with aclosing(self.stream()) as stream:
+                    parser = _SpoolingMultiPartParser(
+                        self.headers,
+                        stream,
+                        max_files=max_files,
+                        max_fields=max_fields,
+                        max_part_size=max_part_size,
+                    )
+                    self._form = await parser.parse()
+            except MultiPartException as exc:
+                raise HTTPException(status_code=400, detail=exc.message)
+        return await super()._get_form(max_files=max_files, max_fields=max_fields, max_part_size=max_part_size)
+
+
+class SpoolingRoute(APIRoute):
+    """
+    APIRoute whose multipart uploads are written to disk once: file parts go straight
+    into HashingSpools instead of Starlette's SpooledTemporaryFile.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        handler = super().get_route_handler()
+
+        async def spooling_handler(request: Request) -> Response:
+            return await handler(_SpoolingRequest(request.scope, request.receive))
+
+        return spooling_handler
+
+
+def _copy_and_hash(src: BinaryIO, dst: BinaryIO, *, max_bytes: int, chunk_size: int) -> tuple[int, str]:
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+        dst.write(chunk)
+    return size, digest.hexdigest()
+
+
+async def spool_upload(
+    upload: UploadFile,
+    *,
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> SpooledUpload:
+    """
+    Stream an upload to a unique temp file (or keep the one SpoolingRoute wrote).
+    Caller must call .cleanup() when done.
+    """
+    s = get_settings()
+    max_bytes = max_bytes or s.max_upload_bytes
+    chunk_size = chunk_size or s.upload_chunk_bytes
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    filename = upload.filename or "upload.mp4"
+    if isinstance(upload.file, HashingSpool):
+        # Parsed by SpoolingRoute: the bytes are already in a hashed temp file of ours
+        if upload.size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        spool = upload.file
+        return SpooledUpload(path=spool.keep(), filename=filename, size=upload.size, sha256=spool.sha256)
+
+    fd, tmp = tempfile.mkstemp(prefix="noirvision_", suffix=_safe_suffix(filename), dir=s.upload_tmp_dir)
+    path = Path(tmp)
+    try:
+        await upload.seek(0)
+        with os.fdopen(fd, "wb") as dst:
+            # One thread hop for the whole copy rather than one per chunk
+            size, sha256 = await run_in_threadpool(
+                _copy_and_hash, upload.file, dst, max_bytes=max_bytes, chunk_size=chunk_size
+            )
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return SpooledUpload(path=path, filename=filename, size=size, sha256=sha256)
+
+
+class MaxUploadSizeMiddleware:
+    """Reject multipart request bodies larger than MAX_UPLOAD_BYTES with 413."""
+
+    def __init__(self, app: ASGIApp, max_bytes: Optional[int] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        # multipart framing adds a little on top of the file itself
+        limit = (self.max_bytes or get_settings().max_upload_bytes) + 64 * 1024
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await _send_413(send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def _send_413(send: Send) -> None:
+    body = b'{"detail":"Upload too large"}'
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
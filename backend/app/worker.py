@@ -0,0 +1,215 @@
+"""
+Queue worker for /api/videos/analyze jobs.
+
+Claims jobs from the jobs table (see app.job_queue), runs TwelveLabs indexing and stores
+the EvidencePack in S3. Runs inside the API process (JOB_WORKERS workers) or on its own,
+so API and processing capacity scale separately:
+
+    python -m app.worker [--concurrency N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Awaitable, Callable, Optional
+
+from app import job_queue
+from app.config import get_settings
+from app.db import Job
+from app.models_twelvelabs.jobs import JobKind
+from app.services import s3_store, twelvelabs_client
+from app.services.aws_clients import open_aws_clients, reset_aws_clients
+from app.services.evidence_cache import cache_key_for_s3
+from app.services.evidence_read_cache import get_evidence_read_cache
+from app.services.task_poller import get_task_poller
+
+logger = logging.getLogger(__name__)
+
+# Runs one job; returns its video_id
+JobHandler = Callable[[Job, Callable[[str], None]], Awaitable[Optional[str]]]
+
+
+async def run_evidence_job(job: Job, on_stage: Callable[[str], None]) -> str:
+    """Index the job's video with TwelveLabs and save the EvidencePack to object storage."""
+    settings = get_settings()
+    settings.require_s3()
+    source_type = job.source_type or "youtube"
+    source_url = job.source_url or ""
+    video_url = None
+    video_path = None if source_type == "youtube" else s3_store.local_path(source_url)
+    if source_type == "youtube":
+        video_url = source_url
+    elif video_path is not None:
+        # Local storage backend: TwelveLabs gets the file itself
+        if not video_path.is_file():
+            raise RuntimeError(f"Stored video not found: {source_url}")
+    else:
+        # S3: TwelveLabs needs a publicly accessible URL; use presigned (long expiry)
+        video_url = await asyncio.to_thread(s3_store.get_presigned_url, source_url, expires=7200)
+        if not video_url:
+            raise RuntimeError("Failed to generate presigned URL for S3 key")
+
+    pack = await twelvelabs_client.run_analysis_async(
+        video_url=video_url,
+        video_file_path=video_path,
+        source_type=source_type,
+        source_url_for_pack=source_url,
+        # Presigned URLs change per request; key S3 sources by object key instead.
+        cache_key=cache_key_for_s3(source_url) if source_type == "s3" else None,
+        on_stage=on_stage,
+    )
+    key = s3_store.evidence_key(job.project_id, pack.video_id)
+    await asyncio.to_thread(s3_store.put_json, key, pack.model_dump(mode="json"))
+    read_cache = get_evidence_read_cache()
+    if read_cache is not None:
+        read_cache.invalidate(key)  # re-analysis of the same video replaces the pack
+    return pack.video_id
+
+
+HANDLERS: dict[str, JobHandler] = {JobKind.EVIDENCE: run_evidence_job}
+
+
+class JobWorker:
+    """`concurrency` claim-and-run loops sharing one worker id (one lease owner)."""
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        worker_id: Optional[str] = None,
+        handlers: Optional[dict[str, JobHandler]] = None,
+    ):
+        self.concurrency = concurrency
+        self.worker_id = worker_id or job_queue.new_worker_id()
+        self.handlers = handlers or HANDLERS
+        self._slots: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        if self._slots:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._slots = [asyncio.create_task(self._slot()) for _ in range(self.concurrency)]
+        logger.info("Job worker %s started with %d slots", self.worker_id, self.concurrency)
+
+    def wake(self) -> None:
+        """A job was enqueued; safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def stop(self) -> None:
+        """Stop claiming; running jobs are cancelled and handed back to the queue."""
+        for slot in self._slots:
+            slot.cancel()
+        await asyncio.gather(*self._slots, return_exceptions=True)
+        self._slots = []
+
+    async def _slot(self) -> None:
+        poll_seconds = get_settings().job_poll_seconds
+        while True:
+            try:
+                job = await asyncio.to_thread(job_queue.claim_job, self.worker_id, tuple(self.handlers))
+            except Exception as e:
+                logger.warning("Claiming a job failed: %s", e)
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # Own task per job, so a lost lease cancels only that job
+            await asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job) -> None:
+        job_id = job.job_id
+        logger.info("Job %s claimed by %s (attempt %d)", job_id, self.worker_id, job.attempts)
+        try:
+            async with job_queue.keep_lease(job_id, self.worker_id):
+                stages = job_queue.StageRecorder(job_id)
+                video_id = await self.handlers[job.kind](job, stages)
+                await stages.flush()
+        except job_queue.LeaseLost:
+            logger.warning("Job %s: lease lost, another worker has it", job_id)
+        except asyncio.CancelledError:
+            # Shielded so a second cancel during shutdown can't lose the release
+            await asyncio.shield(asyncio.to_thread(job_queue.release_job, job_id, self.worker_id))
+            raise
+        except Exception as e:
+            logger.exception("Job %s failed: %s", job_id, e)
+            await asyncio.to_thread(job_queue.fail_job, job_id, self.worker_id, str(e))
+        else:
+            await asyncio.to_thread(job_queue.complete_job, job_id, self.worker_id, video_id=video_id)
+            logger.info("Job %s done, video_id=%s", job_id, video_id)
+
+
+_worker: Optional[JobWorker] = None
+
+
+def get_job_worker() -> Optional[JobWorker]:
+    """In-process worker started by the API lifespan, or None when JOB_WORKERS=0."""
+    return _worker
+
+
+async def start_job_worker() -> Optional[JobWorker]:
+    """Recover interrupted jobs and start JOB_WORKERS in-process workers."""
+    global _worker
+    await asyncio.to_thread(job_queue.recover_jobs)
+    workers = get_settings().job_workers
+    if workers and _worker is None:
+        _worker = JobWorker(concurrency=workers)
+        _worker.start()
+    return _worker
+
+
+async def stop_job_worker() -> None:
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
+
+
+async def _serve(concurrency: int) -> None:
+    await asyncio.to_thread(job_queue.recover_jobs)
+    await twelvelabs_client.open_http_client()
+    await asyncio.to_thread(open_aws_clients)
+    get_task_poller().start()
+    worker = JobWorker(concurrency=concurrency)
+    worker.start()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Job worker %s stopping", worker.worker_id)
+        await worker.stop()
+        await get_task_poller().stop()
+        await twelvelabs_client.close_http_client()
+        reset_aws_clients()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="NoirVision job worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Jobs run at once (default: JOB_WORKER_CONCURRENCY)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    asyncio.run(_serve(args.concurrency or get_settings().job_worker_concurrency))
+
+
+if __name__ == "__main__":
+    main()
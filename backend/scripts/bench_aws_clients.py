@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call cost of s3_store.get_json/put_json and dynamodb_users
+get_profile/list_incidents with the shared boto3 clients vs. building a new client on
+every call (the old behaviour, simulated by resetting the clients before each call).
+
+Runs against moto's server when moto is installed, otherwise a minimal local stand-in
+that answers just these four calls. No AWS account needed.
+
+Run from backend/: python -m scripts.bench_aws_clients [--calls 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Ensure backend/app is on path
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from app.config import Settings
+from app.services import aws_clients, dynamodb_users, s3_store
+
+BUCKET = "bench-bucket"
+TABLE = "bench_users"
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Just enough of S3 and DynamoDB for the benchmarked calls."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    objects: dict[str, bytes] = {}
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"bench"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.objects[self.path] = self.rfile.read(length)
+        self._reply(b"")
+
+    def do_GET(self) -> None:
+        self._reply(self.objects.get(self.path, b"{}"))
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        target = self.headers.get("X-Amz-Target", "")
+        if target.endswith(".GetItem"):
+            body = {"Item": {"user_id": {"S": "u1"}, "sk": {"S": "PROFILE"}, "email": {"S": "a@b.c"}}}
+        else:
+            body = {"Items": [], "Count": 0, "ScannedCount": 0}
+        self._reply(json.dumps(body).encode(), "application/x-amz-json-1.0")
+
+
+def _start_server(settings: Settings):
+    """Start a local endpoint, point settings at it; returns its stop function."""
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        settings.aws_endpoint_url = f"http://127.0.0.1:{server.server_address[1]}"
+        return server.shutdown
+
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    settings.aws_endpoint_url = f"http://{host}:{port}"
+    aws_clients.get_s3_client().create_bucket(Bucket=BUCKET)
+    aws_clients.get_dynamodb_table(TABLE).meta.client.create_table(
+        TableName=TABLE,
+        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}, {"AttributeName": "sk", "KeyType": "RANGE"}],
+        AttributeDefinitions=[
+            {"AttributeName": "user_id", "AttributeType": "S"},
+            {"AttributeName": "sk", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    return server.stop
+
+
+def _time(fn, calls: int, fresh: bool) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        if fresh:
+            aws_clients.reset_aws_clients()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared vs per-call boto3 clients")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    settings = Settings(
+        s3_bucket=BUCKET,
+        dynamodb_table_name=TABLE,
+        aws_access_key_id="bench",
+        aws_secret_access_key="bench",
+    )
+    for module in (aws_clients, s3_store, dynamodb_users):
+        module.get_settings = lambda: settings
+    stop = _start_server(settings)
+
+    key = s3_store.evidence_key("bench", "video")
+    s3_store.put_json(key, {"events": list(range(100))})
+    ops = {
+        "put_json": lambda: s3_store.put_json(key, {"events": list(range(100))}),
+        "get_json": lambda: s3_store.get_json(key),
+        "get_profile": lambda: dynamodb_users.get_profile("u1"),
+        "list_incidents": lambda: dynamodb_users.list_incidents("u1"),
+    }
+    print(f"endpoint {settings.aws_endpoint_url}, {args.calls} calls each (median ms)")
+    print(f"{'op':<16}{'per-call client':>16}{'shared client':>15}{'saved':>9}")
+    try:
+        for name, fn in ops.items():
+            fresh = statistics.median(_time(fn, args.calls, fresh=True)) * 1000
+            aws_clients.reset_aws_clients()
+            fn()  # warm the shared client
+            shared = statistics.median(_time(fn, args.calls, fresh=False)) * 1000
+            print(f"{name:<16}{fresh:>16.2f}{shared:>15.2f}{fresh - shared:>9.2f}")
+    finally:
+        aws_clients.reset_aws_clients()
+        stop()
+
+
+if __name__ == "__main__":
+    main()
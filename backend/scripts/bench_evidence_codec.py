@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark EvidencePack storage encodings: stored size vs. encode/decode time for the
+old plain json.dumps, orjson, gzip levels and (if zstandard is installed) zstd.
+
+Run from backend/: python -m scripts.bench_evidence_codec [--minutes 30] [--repeat 20]
+--minutes sets the transcript length (roughly 150 spoken words per minute).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Ensure backend/app is on path
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from app.config import Settings
+from app.models_twelvelabs.evidence import EvidenceEvent, EvidenceKeyQuote
+from app.services import evidence_codec, twelvelabs_client
+
+WORDS = (
+    "the officer approached vehicle driver said stop hands where can see them I did not "
+    "do anything sir please step out of car camera shows suspect running toward street "
+    "light red blue sirens witness yelled he has something in his hand"
+).split()
+
+
+def _pack(minutes: int) -> dict:
+    rng = random.Random(7)
+    pack = twelvelabs_client._mock_evidence_pack("bench-video", "s3", "uploads/bench.mp4")
+    pack.transcript = " ".join(rng.choice(WORDS) for _ in range(minutes * 150))
+    pack.events = [
+        EvidenceEvent(t=float(t), type="action", label=f"event {t}", evidence=" ".join(rng.sample(WORDS, 12)))
+        for t in range(0, minutes * 60, 5)
+    ]
+    pack.key_quotes = [
+        EvidenceKeyQuote(t=float(t), text=" ".join(rng.sample(WORDS, 10))) for t in range(0, minutes * 60, 20)
+    ]
+    return pack.model_dump(mode="json")
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EvidencePack size vs encode/decode time")
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings = Settings(s3_json_compress_min_bytes=0)
+    evidence_codec.get_settings = lambda: settings
+    data = _pack(args.minutes)
+
+    variants = {
+        "json (legacy)": (
+            lambda: json.dumps(data, default=str).encode("utf-8"),
+            lambda body: json.loads(body.decode("utf-8")),
+        ),
+    }
+    for compression, levels in (("none", [0]), ("gzip", [1, 6, 9]), ("zstd", [1, 3, 9])):
+        if compression == "zstd" and evidence_codec.zstandard is None:
+            continue
+        for level in levels:
+            def encode(compression=compression, level=level):
+                settings.s3_json_compression_level = level
+                return evidence_codec.encode(data, compression=compression)
+
+            encoded = encode()
+            name = compression if compression == "none" else f"{compression}-{level}"
+            variants[name] = (
+                lambda encode=encode: encode().body,
+                lambda body, enc=encoded.content_encoding: evidence_codec.decode(body, enc),
+            )
+
+    serializer = "orjson" if evidence_codec.orjson is not None else "stdlib json"
+    print(f"{args.minutes}-minute pack, serializer={serializer}, median of {args.repeat}")
+    print(f"{'variant':<16}{'bytes':>10}{'ratio':>8}{'encode ms':>11}{'decode ms':>11}")
+    baseline = None
+    for name, (encode, decode) in variants.items():
+        body = encode()
+        baseline = baseline or len(body)
+        assert decode(body) == data
+        enc_ms = _median_ms(encode, args.repeat)
+        dec_ms = _median_ms(lambda: decode(body), args.repeat)
+        print(f"{name:<16}{len(body):>10}{len(body) / baseline:>8.2f}{enc_ms:>11.2f}{dec_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SQLite job store under concurrent load: writer threads create jobs and
+step them through stages/statuses while reader threads poll get_job (like
+GET /api/videos/analyze/{job_id}). Reports throughput, latency and lock errors.
+
+Run from backend/: python -m scripts.bench_jobs_db [--writers 8] [--readers 32] [--seconds 10]
+Add --legacy to compare against a plain engine (rollback journal, no pragmas).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Ensure backend/app is on path
+_backend = Path(__file__).resolve().parent.parent
+if str(_backend) not in sys.path:
+    sys.path.insert(0, str(_backend))
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, create_engine
+
+from app import db
+from app.config import Settings
+from app.models_twelvelabs.jobs import JobStage, JobStatus
+
+STAGES = [JobStage.INDEXING, JobStage.BUILDING_EVIDENCE, JobStage.COMPARING, JobStage.COMPARING]
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def timed(self, op: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError as e:
+            with self.lock:
+                self.errors[op] = self.errors.get(op, 0) + 1
+            if "locked" not in str(e):
+                raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.latencies.setdefault(op, []).append(elapsed)
+
+
+def _writer(stats: Stats, job_ids: list[str], stop: threading.Event) -> None:
+    while not stop.is_set():
+        job = stats.timed("create", db.create_job, "bench", "claim", "youtube", "https://youtu.be/x")
+        if job is None:
+            continue
+        job_ids.append(job.job_id)
+        stats.timed("status", db.update_job_status, job.job_id, JobStatus.PROCESSING)
+        for stage in STAGES:
+            stats.timed("stage", db.update_job_stage, job.job_id, stage)
+        stats.timed("status", db.update_job_status, job.job_id, JobStatus.DONE, video_id="vid")
+
+
+def _reader(stats: Stats, job_ids: list[str], stop: threading.Event) -> None:
+    while not stop.is_set():
+        if not job_ids:
+            time.sleep(0.001)
+            continue
+        stats.timed("get", db.get_job, random.choice(job_ids))
+
+
+def _report(stats: Stats, seconds: float) -> None:
+    print(f"{'op':<8}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'locked':>8}")
+    for op, samples in sorted(stats.latencies.items()):
+        samples.sort()
+        p50 = statistics.median(samples) * 1000
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+        print(f"{op:<8}{len(samples) / seconds:>10.0f}{p50:>10.2f}{p99:>10.2f}{stats.errors.get(op, 0):>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test for the SQLite job store")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--legacy", action="store_true", help="Plain engine: rollback journal, no pragmas")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench_jobs.db'}"
+        settings = Settings(sqlite_database_url=url)
+        db.get_settings = lambda: settings
+        if args.legacy:
+            db._engine = create_engine(url, connect_args={"check_same_thread": False})
+            SQLModel.metadata.create_all(db._engine)
+        db.get_engine()
+
+        stats = Stats()
+        job_ids: list[str] = []
+        stop = threading.Event()
+        threads = [threading.Thread(target=_writer, args=(stats, job_ids, stop)) for _ in range(args.writers)]
+        threads += [threading.Thread(target=_reader, args=(stats, job_ids, stop)) for _ in range(args.readers)]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        db.get_engine().dispose()
+
+    mode = "legacy (rollback journal)" if args.legacy else "WAL + pool"
+    print(f"{mode}: {args.writers} writers, {args.readers} readers, {args.seconds:.0f}s")
+    _report(stats, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Tests for /analyze/complete/jobs: background job, stage tracking and SSE progress.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import os
+os.environ.setdefault("BACKBOARD_API_KEY", "test-key-for-pytest")
+
+import httpx
+import pytest
+
+from app import db, main, pipeline
+from app.config import Settings
+from app.models_twelvelabs.jobs import JobKind, JobStage, JobStatus
+from app.services import job_events, twelvelabs_client
+from tests.test_backboard_api import _mock_report
+
+
+@pytest.fixture
+def job_env(tmp_path, monkeypatch):
+    """Temp SQLite DB, in-memory S3, and a stub pipeline that reports every stage."""
+    settings = Settings(
+        sqlite_database_url=f"sqlite:///{tmp_path / 'jobs.db'}",
+        s3_bucket="test-bucket",
+        job_events_poll_seconds=0.05,
+    )
+    for module in (db, main, job_events):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_engine", None)
+
+    stored = {}
+    monkeypatch.setattr(main.s3_store, "put_json", lambda key, data: stored.__setitem__(key, data))
+    monkeypatch.setattr(main.s3_store, "get_json", lambda key: stored.get(key))
+
+    gate = {}  # holds an asyncio.Event created inside each test's loop
+
+    async def fake_run(**kwargs):
+        on_stage = kwargs["on_stage"]
+        on_stage(JobStage.INDEXING)
+        await gate["event"].wait()
+        on_stage(JobStage.BUILDING_EVIDENCE)
+        return twelvelabs_client._mock_evidence_pack("vid-1", "youtube", kwargs["source_url_for_pack"])
+
+    async def analyze(*, evidence, claim_text, case_id=None, on_stage=None, **kwargs):
+        on_stage(JobStage.PARSING_CLAIM)
+        on_stage(JobStage.COMPARING)
+        return _mock_report()
+
+    monkeypatch.setattr(pipeline, "run_analysis_async", fake_run)
+    noirvision = MagicMock()
+    noirvision.analyze_video_with_claim = AsyncMock(side_effect=analyze)
+    noirvision.generate_formatted_report = MagicMock(return_value="REPORT")
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+    monkeypatch.setattr(main, "noirvision", noirvision)
+    yield {"stored": stored, "gate": gate}
+    monkeypatch.setattr(db, "_engine", None)
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_complete_job_streams_stages_and_stores_report(job_env):
+    async def scenario():
+        job_env["gate"]["event"] = asyncio.Event()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            r = await client.post(
+                "/analyze/complete/jobs",
+                data={"claim": "He ran.", "video_url": "https://youtu.be/abc"},
+            )
+            assert r.status_code == 202
+            job_id = r.json()["job_id"]
+
+            await asyncio.sleep(0.05)
+            pending = (await client.get(f"/analyze/complete/jobs/{job_id}")).json()
+            assert pending["status"] == JobStatus.PROCESSING
+            assert pending["stage"] == JobStage.INDEXING
+            assert "result" not in pending
+
+            stream = asyncio.create_task(client.get(f"/analyze/complete/jobs/{job_id}/events"))
+            await asyncio.sleep(0.05)
+            job_env["gate"]["event"].set()
+            events = (await stream).text
+            done = (await client.get(f"/analyze/complete/jobs/{job_id}")).json()
+            return job_id, events, done
+
+    job_id, text, done = asyncio.run(scenario())
+    events = _parse_sse(text)
+    assert events[0][0] == "progress" and events[0][1]["stage"] == JobStage.INDEXING
+    assert events[-1][0] == JobStatus.DONE
+    stages = [data["stage"] for name, data in events if name == "progress"]
+    assert len(stages) == len(set(stages))  # one event per change
+    assert done["status"] == JobStatus.DONE and done["video_id"] == "vid-1"
+    assert done["result"]["formatted_report"] == "REPORT"
+    assert db.get_job(job_id).kind == JobKind.COMPLETE
+
+
+def test_complete_job_failure_is_reported(job_env):
+    main.noirvision.analyze_video_with_claim = AsyncMock(side_effect=RuntimeError("backboard down"))
+
+    async def scenario():
+        job_env["gate"]["event"] = asyncio.Event()
+        job_env["gate"]["event"].set()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            r = await client.post(
+                "/analyze/complete/jobs",
+                data={"claim": "He ran.", "video_url": "https://youtu.be/abc"},
+            )
+            job_id = r.json()["job_id"]
+            events = (await client.get(f"/analyze/complete/jobs/{job_id}/events")).text
+            return job_id, events
+
+    job_id, text = asyncio.run(scenario())
+    name, data = _parse_sse(text)[-1]
+    assert name == JobStatus.FAILED
+    assert data["error"] == "backboard down"
+
+
+def test_unknown_job_is_404(job_env):
+    async def get():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/analyze/complete/jobs/nope/events")
+
+    assert asyncio.run(get()).status_code == 404
+
+
+def test_complete_job_that_is_no_longer_pending_is_not_run(job_env):
+    job = db.create_job("p", "He ran.", "youtube", "https://youtu.be/abc", kind=JobKind.COMPLETE)
+    main.job_queue.take_lease(job.job_id, "other-process")
+    main.job_queue.fail_job(job.job_id, "other-process", "Server restarted", retry=False)
+
+    asyncio.run(main._run_complete_job(
+        job.job_id, "p", claim="He ran.", case_id=None, video_url="https://youtu.be/abc", upload=None,
+    ))
+    main.noirvision.analyze_video_with_claim.assert_not_called()
+    stored = db.get_job(job.job_id)
+    assert stored.status == JobStatus.FAILED and stored.error_message == "Server restarted"
+
+
+def test_event_waiters_are_removed_when_they_stop_waiting():
+    async def run():
+        woken = asyncio.create_task(job_events._wait_for_change("j1", timeout=5))
+        timed_out = asyncio.create_task(job_events._wait_for_change("j1", timeout=0.01))
+        cancelled = asyncio.create_task(job_events._wait_for_change("j2", timeout=5))
+        await asyncio.sleep(0.05)
+        assert len(job_events._waiters["j1"]) == 1  # the timed-out waiter is gone
+        job_events.publish("j1")
+        await woken
+        cancelled.cancel()
+        await asyncio.gather(timed_out, cancelled, return_exceptions=True)
+
+    asyncio.run(run())
+    assert job_events._waiters == {}
@@ -0,0 +1,80 @@
+"""
+Concurrency test for /analyze/complete: with mock TwelveLabs and a simulated
+indexing delay, other endpoints must keep responding while analyses run.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import os
+os.environ.setdefault("BACKBOARD_API_KEY", "test-key-for-pytest")
+
+import httpx
+import pytest
+
+from app import main
+from app.config import Settings
+from app.services import twelvelabs_client
+from tests.test_backboard_api import _mock_report
+
+INDEXING_DELAY = 0.5
+
+
+@pytest.fixture
+def slow_mock_pipeline(monkeypatch):
+    """Mock TwelveLabs with a simulated indexing delay and a canned Backboard report."""
+    settings = Settings(twelvelabs_mock=True, twelvelabs_mock_delay_seconds=INDEXING_DELAY)
+    monkeypatch.setattr(twelvelabs_client, "get_settings", lambda: settings)
+    noirvision = MagicMock()
+    noirvision.analyze_video_with_claim = AsyncMock(return_value=_mock_report())
+    noirvision.generate_formatted_report = MagicMock(return_value="REPORT")
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+    monkeypatch.setattr(main, "noirvision", noirvision)
+    return noirvision
+
+
+async def _analyze(client: httpx.AsyncClient) -> httpx.Response:
+    return await client.post(
+        "/analyze/complete",
+        data={"claim": "A man in a red hoodie ran down the alley.", "video_url": "https://youtu.be/abc"},
+    )
+
+
+def test_health_responds_while_analysis_is_indexing(slow_mock_pipeline):
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            analysis = asyncio.create_task(_analyze(client))
+            await asyncio.sleep(0.05)
+            started = time.monotonic()
+            health = await client.get("/health")
+            health_elapsed = time.monotonic() - started
+            assert not analysis.done()
+            return health, health_elapsed, await analysis
+
+    health, health_elapsed, analysis = asyncio.run(scenario())
+    assert health.status_code == 200
+    assert health_elapsed < INDEXING_DELAY / 2
+    assert analysis.status_code == 200
+    assert analysis.json()["video_id"].startswith("mock-video-")
+
+
+def test_concurrent_analyses_overlap(slow_mock_pipeline):
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.monotonic()
+            responses = await asyncio.gather(*(_analyze(client) for _ in range(5)))
+            return responses, time.monotonic() - started
+
+    responses, elapsed = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200] * 5
+    # Five serialized runs would take 5 * INDEXING_DELAY
+    assert elapsed < 2 * INDEXING_DELAY
+    assert slow_mock_pipeline.analyze_video_with_claim.await_count == 5
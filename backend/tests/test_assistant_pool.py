@@ -0,0 +1,105 @@
+"""
+Tests for the Backboard AssistantPool (shared assistant, pre-warmed single-use threads).
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+from app.backboard_agent import AssistantPool
+
+
+class FakeBackboard:
+    """Async stand-in for BackboardClient that records resource churn."""
+
+    def __init__(self, fail_threads: int = 0):
+        self.calls: list[str] = []
+        self.live_threads: set[str] = set()
+        self._next = 0
+        self._fail_threads = fail_threads
+
+    async def create_assistant(self, name, description):
+        self.calls.append("create_assistant")
+        await asyncio.sleep(0)
+        return SimpleNamespace(assistant_id="asst-1")
+
+    async def create_thread(self, assistant_id):
+        self.calls.append("create_thread")
+        await asyncio.sleep(0.01)
+        if self._fail_threads:
+            self._fail_threads -= 1
+            raise RuntimeError("429 Too Many Requests")
+        self._next += 1
+        thread_id = f"thread-{self._next}"
+        self.live_threads.add(thread_id)
+        return SimpleNamespace(thread_id=thread_id)
+
+    async def delete_thread(self, thread_id):
+        self.calls.append("delete_thread")
+        self.live_threads.discard(thread_id)
+
+    async def delete_assistant(self, assistant_id):
+        self.calls.append("delete_assistant")
+
+
+def test_pool_serves_prewarmed_threads_and_cleans_up_in_background():
+    client = FakeBackboard()
+    pool = AssistantPool(client, size=2)
+
+    async def scenario():
+        pool.start()
+        await asyncio.sleep(0.05)
+        assert len(pool._threads) == 2
+        before = len(client.calls)
+        used = []
+        for _ in range(3):
+            async with pool.thread() as thread_id:
+                used.append(thread_id)
+        # Only the third analysis found the pool empty and created a thread inline
+        assert client.calls[before:].count("create_thread") >= 1
+        await asyncio.sleep(0.05)
+        assert len(pool._threads) == 2
+        assert not set(used) & client.live_threads  # used threads were deleted
+        await pool.aclose()
+
+    asyncio.run(scenario())
+    assert client.calls.count("create_assistant") == 1
+    assert client.calls[-1] == "delete_assistant"
+    assert client.live_threads == set()
+
+
+def test_pool_without_prewarm_creates_on_demand():
+    client = FakeBackboard()
+    pool = AssistantPool(client, size=0)
+
+    async def scenario():
+        results = await asyncio.gather(*(pool.acquire() for _ in range(3)))
+        for thread_id in results:
+            pool.release(thread_id)
+        await pool.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert len(set(results)) == 3
+    assert client.calls.count("create_assistant") == 1
+    assert client.live_threads == set()
+
+
+def test_prewarm_failures_do_not_break_acquire():
+    client = FakeBackboard(fail_threads=2)
+    pool = AssistantPool(client, size=2)
+
+    async def scenario():
+        pool.start()
+        await asyncio.sleep(0.05)
+        assert pool._threads == []
+        thread_id = await pool.acquire()
+        await pool.aclose()
+        return thread_id
+
+    assert asyncio.run(scenario()).startswith("thread-")
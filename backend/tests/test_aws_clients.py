@@ -0,0 +1,64 @@
+"""
+Tests for the shared boto3 clients (no AWS calls are made).
+"""
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.config import Settings
+from app.services import aws_clients, dynamodb_users, s3_store
+
+
+@pytest.fixture
+def aws_settings(monkeypatch):
+    settings = Settings(
+        aws_region="us-east-2",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        aws_max_pool_connections=7,
+        aws_max_attempts=4,
+        aws_read_timeout_seconds=12,
+        dynamodb_table_name="users-test",
+    )
+    for module in (aws_clients, dynamodb_users):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    aws_clients.reset_aws_clients()
+    yield settings
+    aws_clients.reset_aws_clients()
+
+
+def test_s3_client_is_built_once_with_pool_and_retry_config(aws_settings):
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(s3_store._client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(c is clients[0] for c in clients)
+    config = clients[0].meta.config
+    assert config.max_pool_connections == 7
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 4}
+    assert config.read_timeout == 12
+    assert clients[0].meta.region_name == "us-east-2"
+
+
+def test_dynamodb_table_is_cached_per_thread(aws_settings):
+    table = dynamodb_users._table()
+    assert table.name == "users-test"
+    assert dynamodb_users._table() is table
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(dynamodb_users._table()))
+    t.start()
+    t.join()
+    assert other[0] is not table
+    assert other[0].meta.client.meta.config.max_pool_connections == 7
+
+
+def test_reset_builds_new_clients(aws_settings):
+    s3, table = s3_store._client(), dynamodb_users._table()
+    aws_clients.reset_aws_clients()
+    assert s3_store._client() is not s3
+    assert dynamodb_users._table() is not table
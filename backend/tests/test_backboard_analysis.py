@@ -0,0 +1,266 @@
+"""
+Tests for BackboardAnalyzer against a fake Backboard client: stepwise text steps
+run concurrently with fallbacks; structured mode validates, repairs, then falls back;
+a claim parse started during indexing is reused; steps past the deadline are skipped.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import pytest
+
+from app import backboard_agent, noirvision_analyzer, pipeline
+from app.backboard_agent import AssistantPool, BackboardAnalyzer
+from app.config import Settings
+from app.deadline import Deadline, DeadlineExceeded
+from app.models import VideoAnalysis, VideoDetection, WitnessClaim
+from app.models_twelvelabs.jobs import JobStage
+from app.noirvision_analyzer import NoirVisionAnalyzer
+from app.services import twelvelabs_client
+from tests.test_assistant_pool import FakeBackboard
+
+_COMPARISONS = """[
+  {"category": "Time Match", "match": true, "explanation": "Night"},
+  {"category": "Location Match", "match": true, "explanation": "Alley"},
+  {"category": "Suspect Description", "match": true, "explanation": "Red hoodie"},
+  {"category": "Weapon Match", "match": true, "explanation": "None"},
+  {"category": "Event Sequence", "match": false, "explanation": "Order differs"}
+]"""
+
+
+class FakeMessages(FakeBackboard):
+    """Answers each prompt type after `delay` seconds; `hang` names prompt types that never answer in time."""
+
+    def __init__(self, delay: float, hang: tuple[str, ...] = ()):
+        super().__init__()
+        self.delay = delay
+        self.hang = hang
+        self.threads_by_kind: dict[str, str] = {}
+        self.structured_replies: list[str] = []
+        self.prompts: list[str] = []
+
+    async def add_message(self, thread_id, content, **kwargs):
+        self.prompts.append(content)
+        if self.structured_replies and (
+            "ONE reply" in content or content.startswith("Your previous reply")
+        ):
+            return SimpleNamespace(content=self.structured_replies.pop(0))
+        if content.startswith("Analyze this witness statement"):
+            kind, reply = "parse", '{"time": "night", "location": "alley", "events": ["ran"]}'
+        elif content.startswith("You are a forensic analyst"):
+            kind, reply = "compare", _COMPARISONS
+        elif content.startswith("You are a detective"):
+            kind, reply = "recommendation", "→ Proceed."
+        elif content.startswith("Write a single short noir"):
+            kind, reply = "note", "The tape talked."
+        else:
+            kind, reply = "title", "The Midnight Frame"
+        self.threads_by_kind[kind] = thread_id
+        await asyncio.sleep(60 if kind in self.hang else self.delay)
+        return SimpleNamespace(content=reply)
+
+
+@pytest.fixture
+def make_analyzer(monkeypatch):
+    settings = Settings(backboard_generation_timeout_seconds=0.3, backboard_structured_max_repairs=1)
+    monkeypatch.setattr(backboard_agent, "get_settings", lambda: settings)
+    monkeypatch.setattr(backboard_agent, "get_llm_cache", lambda: None)
+
+    def make(client):
+        analyzer = BackboardAnalyzer.__new__(BackboardAnalyzer)
+        analyzer.client = client
+        analyzer.pool = AssistantPool(client, size=0)
+        return analyzer
+
+    return make
+
+
+def _analyze(analyzer, mode=None):
+    claim = WitnessClaim(claim_text="A man in a red hoodie ran down the alley.", case_id="C-1")
+    video = VideoAnalysis(
+        source="bodycam.mp4",
+        duration="1m 0s",
+        detections=[VideoDetection(timestamp="00:00:04", description="Man runs", objects=["person"])],
+    )
+
+    async def run():
+        start = time.perf_counter()
+        report = await analyzer.analyze_claim_vs_video(claim, video, mode=mode)
+        elapsed = time.perf_counter() - start
+        await analyzer.pool.aclose()
+        return report, elapsed
+
+    return asyncio.run(run())
+
+
+def test_text_steps_run_concurrently_on_separate_threads(make_analyzer):
+    client = FakeMessages(delay=0.1)
+    report, elapsed = _analyze(make_analyzer(client))
+    # parse + compare + one round for the three text steps (not three rounds)
+    assert elapsed < 0.38
+    assert report.recommendation == "→ Proceed."
+    assert report.detective_note == "The tape talked."
+    assert report.case_title == "The Midnight Frame"
+    threads = client.threads_by_kind
+    assert threads["recommendation"] == threads["compare"]
+    assert len({threads["recommendation"], threads["note"], threads["title"]}) == 3
+
+
+def test_default_pool_fits_concurrent_analyses(monkeypatch):
+    settings = Settings(backboard_max_concurrent_claims=3)
+    monkeypatch.setattr(backboard_agent, "get_settings", lambda: settings)
+    assert BackboardAnalyzer(api_key="k").pool.size == 3 * backboard_agent.THREADS_PER_ANALYSIS
+    settings.backboard_thread_pool_size = 2
+    assert BackboardAnalyzer(api_key="k").pool.size == 2
+
+
+def test_slow_step_times_out_to_fallback(make_analyzer):
+    client = FakeMessages(delay=0.01, hang=("title",))
+    report, elapsed = _analyze(make_analyzer(client))
+    assert elapsed < 1.0
+    assert report.verdict == "CLAIM SUPPORTED"
+    assert report.case_title == BackboardAnalyzer._fallback_case_title(report.verdict)
+    assert report.detective_note == "The tape talked."
+
+
+_STRUCTURED = {
+    "claim_facts": {"time": "night", "location": "alley", "events": ["ran"]},
+    "comparisons": json.loads(_COMPARISONS),
+    "recommendation": "→ Proceed; sequence needs review.",
+    "detective_note": "\"The tape talked, mostly.\"",
+    "case_title": "Hoodie in the Dark",
+}
+
+
+def test_structured_mode_builds_report_from_one_reply(make_analyzer):
+    client = FakeMessages(delay=0.01)
+    client.structured_replies = ["Here you go:\n" + json.dumps(_STRUCTURED)]
+    report, _ = _analyze(make_analyzer(client), mode="structured")
+    assert len(client.prompts) == 1
+    assert report.credibility_score == 80 and report.verdict == "CLAIM SUPPORTED"
+    assert report.case_title == "The Hoodie in the Dark"
+    assert report.detective_note == "The tape talked, mostly."
+    assert report.evidence_summary["Event Sequence"] == {"match": False, "detail": "Order differs"}
+
+
+def test_structured_mode_repairs_invalid_reply(make_analyzer):
+    client = FakeMessages(delay=0.01)
+    broken = dict(_STRUCTURED, comparisons=[{"category": "Time Match", "match": "maybe"}])
+    client.structured_replies = [json.dumps(broken), json.dumps(_STRUCTURED)]
+    report, _ = _analyze(make_analyzer(client), mode="structured")
+    assert len(client.prompts) == 2
+    assert client.prompts[1].startswith("Your previous reply") and "comparisons" in client.prompts[1]
+    assert report.case_title == "The Hoodie in the Dark"
+
+
+def test_structured_mode_repairs_partial_comparisons(make_analyzer):
+    client = FakeMessages(delay=0.01)
+    partial = dict(_STRUCTURED, comparisons=json.loads(_COMPARISONS)[:1])
+    client.structured_replies = [json.dumps(partial), json.dumps(_STRUCTURED)]
+    report, _ = _analyze(make_analyzer(client), mode="structured")
+    assert len(client.prompts) == 2
+    assert "'Location Match' appears 0 times" in client.prompts[1]
+    assert len(report.comparisons) == 5 and report.credibility_score == 80
+
+
+def test_structured_mode_falls_back_to_stepwise(make_analyzer):
+    client = FakeMessages(delay=0.01)
+    client.structured_replies = ["not json", "still not json"]
+    report, _ = _analyze(make_analyzer(client), mode="structured")
+    # 2 structured attempts, then parse + compare + 3 text steps
+    assert len(client.prompts) == 7
+    assert report.case_title == "The Midnight Frame"
+
+
+def test_claim_parsed_during_indexing_is_reused(make_analyzer, monkeypatch):
+    client = FakeMessages(delay=0.05)
+    analyzer = make_analyzer(client)
+    settings = Settings(triage_tier="llm", backboard_speculative_parse=True)
+    monkeypatch.setattr(noirvision_analyzer, "get_settings", lambda: settings)
+    parses_before_evidence = []
+
+    async def fake_run(**kwargs):
+        await asyncio.sleep(0.2)
+        parses_before_evidence.extend(p for p in client.prompts if p.startswith("Analyze this witness"))
+        return twelvelabs_client._mock_evidence_pack("vid-1", "youtube", kwargs["source_url_for_pack"])
+
+    monkeypatch.setattr(pipeline, "run_analysis_async", fake_run)
+    stages = []
+
+    async def run():
+        result = await pipeline.run_complete_analysis(
+            NoirVisionAnalyzer(backboard=analyzer),
+            claim="A man in a red hoodie ran down the alley.",
+            video_url="https://youtu.be/abc",
+            on_stage=stages.append,
+        )
+        await analyzer.pool.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert len(parses_before_evidence) == 1
+    assert sum(p.startswith("Analyze this witness") for p in client.prompts) == 1
+    assert JobStage.PARSING_CLAIM not in stages and JobStage.COMPARING in stages
+    assert result["report"]["case_title"] == "The Midnight Frame"
+
+
+def test_failed_speculative_parse_is_retried_inline(make_analyzer):
+    client = FakeMessages(delay=0.01)
+    analyzer = make_analyzer(client)
+    claim = WitnessClaim(claim_text="A man ran.", case_id="C-1")
+    video = VideoAnalysis(source="a.mp4", duration="1m 0s", detections=[])
+
+    async def failed_parse():
+        raise RuntimeError("backboard hiccup")
+
+    async def run():
+        report = await analyzer.analyze_claim_vs_video(claim, video, parsed_claim=failed_parse())
+        await analyzer.pool.aclose()
+        return report
+
+    report = asyncio.run(run())
+    assert sum(p.startswith("Analyze this witness") for p in client.prompts) == 1
+    assert report.case_id == "C-1"
+
+
+def _analyze_within(analyzer, seconds: float):
+    claim = WitnessClaim(claim_text="A man in a red hoodie ran down the alley.", case_id="C-1")
+    video = VideoAnalysis(source="a.mp4", duration="1m 0s", detections=[])
+
+    async def run():
+        start = time.perf_counter()
+        try:
+            return await analyzer.analyze_claim_vs_video(claim, video, deadline=Deadline.after(seconds)), time.perf_counter() - start
+        finally:
+            await analyzer.pool.aclose()
+
+    return asyncio.run(run())
+
+
+def test_deadline_skips_late_steps_and_marks_report_partial(make_analyzer):
+    client = FakeMessages(delay=0.05, hang=("note",))
+    report, elapsed = _analyze_within(make_analyzer(client), 0.2)
+    # Cut at the deadline, not at the 0.3s generation timeout
+    assert elapsed < 0.28
+    assert report.partial
+    assert report.skipped_stages == ["detective_note"]
+    assert report.case_title == "The Midnight Frame"
+
+
+def test_deadline_during_comparison_raises(make_analyzer):
+    client = FakeMessages(delay=0.05, hang=("compare",))
+    with pytest.raises(DeadlineExceeded, match="comparison"):
+        _analyze_within(make_analyzer(client), 0.2)
+
+
+def test_full_report_is_not_partial(make_analyzer):
+    report, _ = _analyze(make_analyzer(FakeMessages(delay=0.01)))
+    assert not report.partial and report.skipped_stages == []
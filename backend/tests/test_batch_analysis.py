@@ -0,0 +1,91 @@
+"""
+Tests for /analyze/batch: one indexing run, many claims evaluated concurrently.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import os
+os.environ.setdefault("BACKBOARD_API_KEY", "test-key-for-pytest")
+
+import httpx
+import pytest
+
+from app import main, noirvision_analyzer, pipeline
+from app.config import Settings
+from app.noirvision_analyzer import NoirVisionAnalyzer
+from app.services import twelvelabs_client
+from tests.test_backboard_api import _mock_report
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    """Real NoirVisionAnalyzer over a fake Backboard; counts indexing runs and overlap."""
+    settings = Settings(backboard_max_concurrent_claims=2)
+    monkeypatch.setattr(noirvision_analyzer, "get_settings", lambda: settings)
+    stats = {"indexed": 0, "running": 0, "peak": 0, "claims": []}
+
+    async def fake_run(**kwargs):
+        stats["indexed"] += 1
+        return twelvelabs_client._mock_evidence_pack("vid-1", "youtube", kwargs["source_url_for_pack"])
+
+    async def analyze_claim_vs_video(claim, video_analysis, **kwargs):
+        stats["running"] += 1
+        stats["peak"] = max(stats["peak"], stats["running"])
+        stats["claims"].append((claim.claim_text, claim.case_id, id(video_analysis)))
+        await asyncio.sleep(0.02)
+        stats["running"] -= 1
+        if "lie" in claim.claim_text:
+            raise RuntimeError("LLM unavailable")
+        return _mock_report().model_copy(update={"witness_claim": claim.claim_text})
+
+    monkeypatch.setattr(pipeline, "run_analysis_async", fake_run)
+    analyzer = NoirVisionAnalyzer.__new__(NoirVisionAnalyzer)
+    analyzer.backboard = MagicMock()
+    analyzer.backboard.analyze_claim_vs_video = analyze_claim_vs_video
+    analyzer.backboard._generate_case_id = MagicMock(return_value="2026-01-01-001")
+    monkeypatch.setattr(main, "noirvision", analyzer)
+    return stats
+
+
+def _post(data):
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/analyze/batch", data=data)
+    return asyncio.run(post())
+
+
+def test_batch_indexes_once_and_caps_concurrency(batch_env):
+    claims = [f"Witness {i} saw a red car." for i in range(5)]
+    r = _post({"claims": claims, "video_url": "https://youtu.be/abc"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["video_id"] == "vid-1"
+    assert [res["claim"] for res in body["results"]] == claims
+    assert all(res["report"]["witness_claim"] == res["claim"] for res in body["results"])
+    assert batch_env["indexed"] == 1
+    assert batch_env["peak"] == 2
+    # One VideoAnalysis and one case ID shared by every claim
+    assert len({video for _, _, video in batch_env["claims"]}) == 1
+    assert {case for _, case, _ in batch_env["claims"]} == {"2026-01-01-001"}
+
+
+def test_batch_reports_per_claim_errors(batch_env):
+    r = _post({"claims": ["He ran.", "It's a lie.", "He stopped."], "video_url": "https://youtu.be/abc"})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert "report" in results[0] and "report" in results[2]
+    assert results[1] == {"claim": "It's a lie.", "error": "LLM unavailable"}
+
+
+def test_batch_rejects_too_many_claims(batch_env, monkeypatch):
+    monkeypatch.setattr(main, "get_settings", lambda: Settings(batch_max_claims=2))
+    r = _post({"claims": ["a", "b", "c"], "video_url": "https://youtu.be/abc"})
+    assert r.status_code == 400
+    assert batch_env["indexed"] == 0
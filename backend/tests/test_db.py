@@ -0,0 +1,116 @@
+"""
+Tests for the SQLite job store: connection pragmas, coalesced stage writes, indexes
+and the paginated job listing.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+
+import httpx
+import pytest
+
+from app import db, main
+from app.config import Settings
+from app.models_twelvelabs.jobs import JobStage, JobStatus
+
+
+@pytest.fixture
+def db_settings(tmp_path, monkeypatch):
+    settings = Settings(sqlite_database_url=f"sqlite:///{tmp_path / 'jobs.db'}", sqlite_busy_timeout_ms=1234)
+    monkeypatch.setattr(db, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_engine", None)
+    yield settings
+    monkeypatch.setattr(db, "_engine", None)
+
+
+def test_file_database_uses_wal_and_busy_timeout(db_settings):
+    with db.get_engine().connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_repeated_stage_is_not_rewritten(db_settings):
+    job = db.create_job("proj", "claim", "youtube", "https://youtu.be/abc")
+    assert job.status == JobStatus.PENDING  # readable after the session closed
+    assert db.update_job_stage(job.job_id, JobStage.COMPARING)
+    first = db.get_job(job.job_id).updated_at
+    assert not db.update_job_stage(job.job_id, JobStage.COMPARING)
+    assert db.get_job(job.job_id).updated_at == first
+    assert db.update_job_stage(job.job_id, JobStage.RENDERING)
+    assert not db.update_job_stage("missing", JobStage.RENDERING)
+
+
+def test_concurrent_writers_and_pollers_do_not_lock(db_settings):
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(20):
+                job = db.create_job("proj", "claim", "youtube", "https://youtu.be/abc")
+                db.update_job_stage(job.job_id, JobStage.INDEXING)
+                db.update_job_status(job.job_id, JobStatus.DONE, video_id="vid")
+                db.get_job(job.job_id)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_old_database_gets_indexes(db_settings):
+    path = db_settings.sqlite_database_url.removeprefix("sqlite:///")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (job_id VARCHAR PRIMARY KEY, project_id VARCHAR, claim VARCHAR, status VARCHAR, "
+        "video_id VARCHAR, source_type VARCHAR, source_url VARCHAR, error_message VARCHAR, "
+        "created_at DATETIME, updated_at DATETIME)"
+    )
+    conn.commit()
+    conn.close()
+    with db.get_engine().connect() as conn:
+        indexes = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(jobs)")}
+        plan = " ".join(
+            str(row[-1])
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE video_id = 'v'")
+        )
+    assert {"ix_jobs_video_id", "ix_jobs_project_created", "ix_jobs_status_created"} <= indexes
+    assert "ix_jobs_video_id" in plan
+
+
+def test_list_jobs_pages_through_the_api(db_settings):
+    for i in range(5):
+        job = db.create_job("proj-a", f"claim {i}", "youtube", "https://youtu.be/abc")
+        if i % 2:
+            db.update_job_status(job.job_id, JobStatus.DONE)
+    db.create_job("proj-b", "other", "youtube", "https://youtu.be/abc")
+
+    async def fetch_all(params):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            pages, cursor = [], None
+            while True:
+                query = dict(params, limit=2, **({"cursor": cursor} if cursor else {}))
+                body = (await client.get("/api/videos/jobs", params=query)).json()
+                pages.append([job["claim"] for job in body["jobs"]])
+                cursor = body["next_cursor"]
+                if cursor is None:
+                    return pages
+
+    pages = asyncio.run(fetch_all({"project_id": "proj-a"}))
+    assert pages == [["claim 4", "claim 3"], ["claim 2", "claim 1"], ["claim 0"]]
+    done = asyncio.run(fetch_all({"project_id": "proj-a", "status": JobStatus.DONE}))
+    assert done == [["claim 3", "claim 1"]]
+
+    async def bad_cursor():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/api/videos/jobs", params={"cursor": "nope"})).status_code
+
+    assert asyncio.run(bad_cursor()) == 400
@@ -0,0 +1,125 @@
+"""
+Tests for the per-request Deadline and partial reports when the time budget runs out.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import pytest
+
+from app import noirvision_analyzer, pipeline
+from app.config import Settings
+from app.deadline import Deadline, DeadlineExceeded
+from app.models import CredibilityReport
+from app.noirvision_analyzer import NoirVisionAnalyzer
+from app.report_generator import ReportGenerator
+from app.services import twelvelabs_client as tl
+
+
+def test_deadline_caps_and_reserves():
+    unbounded = Deadline.after(0)
+    assert not unbounded.bounded and not unbounded.expired
+    assert unbounded.cap(30) == 30 and unbounded.cap(None) is None
+    assert unbounded.reserve(10) is unbounded
+
+    deadline = Deadline.after(5)
+    assert deadline.cap(30) <= 5
+    assert deadline.cap(1) == 1
+    assert 2.5 < deadline.reserve(2).remaining() <= 3
+    # A reserve larger than the budget still leaves half of it
+    assert 2 < deadline.reserve(10).remaining() <= 2.5
+    with pytest.raises(DeadlineExceeded, match="comparison"):
+        Deadline(time.monotonic()).reserve(10).check("comparison")
+
+
+def test_run_distinguishes_deadline_from_step_timeout():
+    async def run():
+        with pytest.raises(DeadlineExceeded):
+            await Deadline.after(0.05).run(asyncio.sleep(1), "indexing")
+        with pytest.raises(asyncio.TimeoutError) as info:
+            await Deadline.after(5).run(asyncio.sleep(1), "indexing", timeout=0.05)
+        assert not isinstance(info.value, DeadlineExceeded)
+        assert await Deadline.after(5).run(asyncio.sleep(0, result="ok"), "indexing") == "ok"
+
+    asyncio.run(run())
+
+
+def test_late_evidence_sections_are_degraded_at_the_deadline(monkeypatch):
+    settings = Settings(twelvelabs_api_key="k", twelvelabs_index_id="idx", twelvelabs_mock=False)
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+
+    async def slow_transcript(video_id):
+        await asyncio.sleep(5)
+        return "never"
+
+    monkeypatch.setattr(tl, "fetch_transcript_async", slow_transcript)
+    monkeypatch.setattr(tl, "fetch_chapters_async", AsyncMock(return_value=[]))
+    monkeypatch.setattr(tl, "fetch_highlights_async", AsyncMock(return_value=[]))
+    monkeypatch.setattr(tl, "fetch_summary_async", AsyncMock(return_value="A man runs."))
+
+    start = time.perf_counter()
+    pack = asyncio.run(tl.build_evidence_pack_async("vid-1", "youtube", "u", deadline=Deadline.after(0.2)))
+    assert time.perf_counter() - start < 1.0
+    degraded = pack.raw_twelvelabs["degraded_sections"]
+    assert list(degraded) == ["transcript"]
+    assert "DeadlineExceeded" in degraded["transcript"]
+    assert pack.transcript == "A man runs."
+
+
+def test_pipeline_raises_when_indexing_outlives_the_budget(monkeypatch):
+    settings = Settings(
+        twelvelabs_mock=True,
+        twelvelabs_mock_delay_seconds=5,
+        analysis_deadline_seconds=0.5,
+        analysis_deadline_reserve_seconds=0.3,
+    )
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+    monkeypatch.setattr(pipeline, "get_settings", lambda: settings)
+    noirvision = MagicMock()
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+
+    start = time.perf_counter()
+    with pytest.raises(DeadlineExceeded, match="indexing"):
+        asyncio.run(pipeline.run_complete_analysis(noirvision, claim="A man ran.", video_url="https://youtu.be/abc"))
+    # The Backboard reserve only shortens evidence building; indexing runs to the deadline
+    assert 0.45 < time.perf_counter() - start < 1.0
+    noirvision.analyze_video_with_claim.assert_not_called()
+
+
+def test_reserve_at_or_above_the_budget_still_runs_the_pipeline(monkeypatch):
+    settings = Settings(
+        twelvelabs_mock=True,
+        twelvelabs_mock_delay_seconds=0.05,
+        analysis_deadline_seconds=10,
+        analysis_deadline_reserve_seconds=30,
+    )
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+    monkeypatch.setattr(pipeline, "get_settings", lambda: settings)
+    noirvision = MagicMock()
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+    noirvision.analyze_video_with_claim = AsyncMock(side_effect=RuntimeError("reached analysis"))
+
+    with pytest.raises(RuntimeError, match="reached analysis"):
+        asyncio.run(pipeline.run_complete_analysis(noirvision, claim="A man ran.", video_url="https://youtu.be/abc"))
+
+
+def test_comparison_out_of_time_falls_back_to_rules(monkeypatch):
+    settings = Settings(triage_tier="llm", evidence_index_enabled=False)
+    monkeypatch.setattr(noirvision_analyzer, "get_settings", lambda: settings)
+    analyzer = NoirVisionAnalyzer(backboard=MagicMock())
+    analyzer.backboard.analyze_claim_vs_video = AsyncMock(side_effect=DeadlineExceeded("comparison"))
+    pack = tl._mock_evidence_pack("vid-1", "youtube", "https://youtu.be/abc")
+    pack = pack.model_copy(update={"raw_twelvelabs": {"degraded_sections": {"highlights": "DeadlineExceeded"}}})
+
+    report = asyncio.run(analyzer.analyze_video_with_claim(pack, "A man ran out of the alley.", case_id="C-1"))
+    assert isinstance(report, CredibilityReport)
+    assert report.partial
+    assert report.skipped_stages == ["evidence_highlights", "llm_comparison"]
+    assert report.analysis_tier == "fast"
+    assert "PARTIAL REPORT" in ReportGenerator.generate_report(report)
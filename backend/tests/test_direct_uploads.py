@@ -0,0 +1,146 @@
+"""
+Tests for presigned multipart uploads (/api/videos/uploads).
+"""
+from __future__ import annotations
+
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import boto3
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+
+from app import main
+from app.config import Settings
+from app.routers import videos
+from app.services import s3_store
+
+
+class FakeS3:
+    """Multipart bookkeeping like S3; presigning is done by a real (offline) boto3 client."""
+
+    def __init__(self):
+        self.signer = boto3.client(
+            "s3", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test"
+        )
+        self.uploads = {}
+        self.completed = {}
+        self.objects = {}
+        self.bytes_per_part = 64 * 1024**2  # what the "browser" PUT for each part
+
+    def create_multipart_upload(self, *, Bucket, Key, ContentType, Metadata):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"key": Key, "content_type": ContentType, "metadata": Metadata}
+        return {"UploadId": upload_id}
+
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return self.signer.generate_presigned_url(method, Params=Params, ExpiresIn=ExpiresIn)
+
+    def complete_multipart_upload(self, *, Bucket, Key, UploadId, MultipartUpload):
+        if UploadId not in self.uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload"}}, "CompleteMultipartUpload")
+        self.completed[Key] = MultipartUpload["Parts"]
+        upload = self.uploads.pop(UploadId)
+        self.objects[Key] = {
+            "ContentLength": self.bytes_per_part * len(MultipartUpload["Parts"]),
+            "Metadata": upload["metadata"],
+        }
+        return {"ETag": '"abc-2"'}
+
+    def head_object(self, *, Bucket, Key):
+        return self.objects[Key]
+
+    def delete_object(self, *, Bucket, Key):
+        del self.objects[Key]
+
+    def abort_multipart_upload(self, *, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    settings = Settings(s3_bucket="test-bucket", direct_upload_max_bytes=10 * 1024**3)
+    for module in (videos, s3_store):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    fake = FakeS3()
+    monkeypatch.setattr(s3_store, "_client", lambda: fake)
+    return fake
+
+
+def _call(requests):
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.request(method, url, **kwargs) for method, url, kwargs in requests]
+
+    return asyncio.run(run())
+
+
+def test_create_sign_complete_then_analyze_key(s3):
+    (created,) = _call([("POST", "/api/videos/uploads", {"json": {
+        "project_id": "case-7", "filename": "../../bodycam.MOV", "size_bytes": 150 * 1024**2,
+    }})])
+    assert created.status_code == 200
+    body = created.json()
+    key, upload_id = body["s3_key"], body["upload_id"]
+    assert key.startswith("projects/case-7/uploads/") and key.endswith("/video.mov")
+    assert body["part_size"] == 64 * 1024**2 and body["part_count"] == 3
+
+    signed, completed = _call([
+        ("POST", f"/api/videos/uploads/{upload_id}/parts", {"json": {"s3_key": key, "part_numbers": [3, 1, 2, 1]}}),
+        ("POST", f"/api/videos/uploads/{upload_id}/complete", {"json": {"s3_key": key, "parts": [
+            {"part_number": 2, "etag": '"e2"'}, {"part_number": 1, "etag": '"e1"'},
+        ]}}),
+    ])
+    parts = signed.json()["parts"]
+    assert [p["part_number"] for p in parts] == [1, 2, 3]
+    query = parse_qs(urlsplit(parts[1]["url"]).query)
+    assert query["partNumber"] == ["2"] and query["uploadId"] == [upload_id]
+    assert completed.json() == {"s3_key": key, "etag": '"abc-2"'}
+    assert s3.completed[key] == [{"PartNumber": 1, "ETag": '"e1"'}, {"PartNumber": 2, "ETag": '"e2"'}]
+    assert key in s3.objects
+
+
+def test_uploads_larger_than_declared_are_deleted(s3):
+    (created,) = _call([("POST", "/api/videos/uploads", {"json": {"project_id": "p", "size_bytes": 1024}})])
+    key, upload_id = created.json()["s3_key"], created.json()["upload_id"]
+    assert created.json()["part_count"] == 1
+    (completed,) = _call([("POST", f"/api/videos/uploads/{upload_id}/complete", {"json": {"s3_key": key, "parts": [
+        {"part_number": n, "etag": f'"e{n}"'} for n in (1, 2, 3)
+    ]}})])
+    assert completed.status_code == 413 and "at most 1024" in completed.json()["detail"]
+    assert key not in s3.objects
+
+
+def test_huge_files_get_larger_parts(s3):
+    (created,) = _call([("POST", "/api/videos/uploads", {"json": {
+        "project_id": "p", "size_bytes": 1000 * 1024**3,
+    }})])
+    assert created.status_code == 413
+    s3_store.get_settings().direct_upload_max_bytes = 2000 * 1024**3
+    (created,) = _call([("POST", "/api/videos/uploads", {"json": {
+        "project_id": "p", "size_bytes": 1000 * 1024**3,
+    }})])
+    body = created.json()
+    assert body["part_count"] <= 10000 and body["part_size"] % (1024 * 1024) == 0
+
+
+def test_rejects_foreign_keys_and_unknown_uploads(s3):
+    bad_key, unknown, aborted = _call([
+        ("POST", "/api/videos/uploads/u/parts", {"json": {"s3_key": "projects/p/videos/v/evidence.json", "part_numbers": [1]}}),
+        ("POST", "/api/videos/uploads/missing/complete", {"json": {
+            "s3_key": "projects/p/uploads/" + "0" * 32 + "/video.mp4", "parts": [{"part_number": 1, "etag": "x"}],
+        }}),
+        ("DELETE", "/api/videos/uploads/missing", {"params": {"s3_key": "projects/p/uploads/" + "0" * 32 + "/video.mp4"}}),
+    ])
+    assert bad_key.status_code == 400
+    assert unknown.status_code == 400 and "NoSuchUpload" in unknown.json()["detail"]
+    assert aborted.status_code == 204
+
+
+def test_local_backend_has_no_direct_uploads(s3):
+    s3_store.get_settings().storage_backend = "local"
+    (created,) = _call([("POST", "/api/videos/uploads", {"json": {"project_id": "p", "size_bytes": 1024}})])
+    assert created.status_code == 501
+    assert s3.uploads == {}
@@ -0,0 +1,135 @@
+"""
+Tests for the content-addressed EvidencePack cache (keys, LRU/TTL, disk tier)
+and its use in run_analysis and run_analysis_async.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+
+import pytest
+
+from app.config import Settings
+from app.models_twelvelabs.evidence import EvidencePack, EvidencePackSource
+from app.services import evidence_cache as ec
+from app.services import twelvelabs_client as tl
+
+
+def _pack(video_id: str = "vid-1") -> EvidencePack:
+    return EvidencePack(
+        video_id=video_id,
+        source=EvidencePackSource(type="youtube", url="https://youtu.be/abc"),
+        transcript="Stop right there.",
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+        "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+        "https://youtube.com/shorts/dQw4w9WgXcQ?si=xyz",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    ],
+)
+def test_youtube_urls_share_one_key(url):
+    assert ec.cache_key_for_url(url) == "youtube:dQw4w9WgXcQ"
+
+
+def test_other_urls_are_canonicalized():
+    a = ec.cache_key_for_url("HTTPS://Example.com/v.mp4?b=2&a=1#frag")
+    b = ec.cache_key_for_url("https://example.com/v.mp4?a=1&b=2")
+    assert a == b and a.startswith("url:")
+
+
+def test_file_key_is_streaming_sha256(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"x" * (ec.HASH_CHUNK_SIZE * 2 + 7))
+    key = ec.cache_key_for_file(path)
+    assert key == "sha256:" + ec.hash_stream(io.BytesIO(path.read_bytes()))
+
+
+def test_memory_tier_lru_and_ttl(monkeypatch):
+    cache = ec.EvidenceCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", _pack("a"))
+    cache.put("b", _pack("b"))
+    assert cache.get("a").video_id == "a"  # a is now most recent
+    cache.put("c", _pack("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    later = time.time() + 61
+    monkeypatch.setattr(ec.time, "time", lambda: later)
+    assert cache.get("a") is None
+    assert cache.hits == 3 and cache.misses == 2
+
+
+def test_disk_tier_survives_new_process_and_prunes(tmp_path):
+    tier = ec.DiskTier(tmp_path, max_entries=2)
+    ec.EvidenceCache(ttl_seconds=60, max_entries=4, tier=tier).put("a", _pack("a"))
+
+    fresh = ec.EvidenceCache(ttl_seconds=60, max_entries=4, tier=tier)
+    assert fresh.get("a").video_id == "a"
+
+    fresh.put("b", _pack("b"))
+    fresh.put("c", _pack("c"))
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_run_analysis_async_skips_indexing_on_hit(monkeypatch):
+    settings = Settings(twelvelabs_api_key="k", twelvelabs_index_id="idx", twelvelabs_mock=False)
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+    cache = ec.EvidenceCache(ttl_seconds=60, max_entries=4)
+    monkeypatch.setattr(tl, "get_evidence_cache", lambda: cache)
+    created: list[str] = []
+
+    async def create_video_task_async(**kwargs):
+        created.append(kwargs["video_url"])
+        return "task-1", None
+
+    async def poll_until_ready_async(task_id, **kwargs):
+        return "vid-1"
+
+    async def build_evidence_pack_async(video_id, source_type, source_url, **kwargs):
+        return _pack(video_id)
+
+    monkeypatch.setattr(tl, "create_video_task_async", create_video_task_async)
+    monkeypatch.setattr(tl, "poll_until_ready_async", poll_until_ready_async)
+    monkeypatch.setattr(tl, "build_evidence_pack_async", build_evidence_pack_async)
+
+    first = asyncio.run(tl.run_analysis_async(
+        video_url="https://youtu.be/abc", source_url_for_pack="https://youtu.be/abc",
+    ))
+    second = asyncio.run(tl.run_analysis_async(
+        video_url="https://www.youtube.com/watch?v=abc", source_url_for_pack="https://www.youtube.com/watch?v=abc",
+    ))
+    assert created == ["https://youtu.be/abc"]
+    assert second.video_id == first.video_id == "vid-1"
+    assert second.source.url == "https://www.youtube.com/watch?v=abc"
+
+
+def test_sync_run_analysis_uses_the_cache(monkeypatch, tmp_path):
+    settings = Settings(twelvelabs_api_key="k", twelvelabs_index_id="idx", twelvelabs_mock=False)
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+    cache = ec.EvidenceCache(ttl_seconds=60, max_entries=4)
+    monkeypatch.setattr(tl, "get_evidence_cache", lambda: cache)
+    created: list[str] = []
+
+    def create_video_task(**kwargs):
+        created.append(str(kwargs["video_file_path"]))
+        return "task-1", None
+
+    monkeypatch.setattr(tl, "create_video_task", create_video_task)
+    monkeypatch.setattr(tl, "poll_until_ready", lambda task_id, **kwargs: "vid-1")
+    monkeypatch.setattr(tl, "build_evidence_pack", lambda video_id, *args, **kwargs: _pack(video_id))
+    first, second = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    first.write_bytes(b"same video")
+    second.write_bytes(b"same video")
+
+    tl.run_analysis(video_file_path=first)
+    pack = tl.run_analysis(video_file_path=second, source_url_for_pack="uploads/b.mp4")
+    assert created == [str(first)]
+    assert pack.video_id == "vid-1" and pack.source.url == "uploads/b.mp4"
+    assert asyncio.run(cache.aget(ec.cache_key_for_file(first))) is not None
@@ -0,0 +1,95 @@
+"""
+Tests for the S3 JSON codec: compression, Content-Encoding metadata and legacy reads.
+"""
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.config import Settings
+from app.services import evidence_codec, s3_store, twelvelabs_client
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, *, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = dict(kwargs, Body=Body)
+
+    def get_object(self, *, Bucket, Key):
+        obj = self.objects[Key]
+        return {"Body": io.BytesIO(obj["Body"]), "ContentEncoding": obj.get("ContentEncoding")}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    settings = Settings(s3_bucket="test-bucket", s3_json_compress_min_bytes=256)
+    for module in (s3_store, evidence_codec):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    fake = FakeS3()
+    monkeypatch.setattr(s3_store, "_client", lambda: fake)
+    return fake
+
+
+def _pack() -> dict:
+    pack = twelvelabs_client._mock_evidence_pack("vid-1", "youtube", "https://youtu.be/abc")
+    pack.transcript = " ".join(f"Officer approaches the vehicle at {i} seconds." for i in range(200))
+    return pack.model_dump(mode="json")
+
+
+def test_large_objects_are_compressed_and_tagged(s3):
+    data = _pack()
+    s3_store.put_json("evidence.json", data)
+    stored = s3.objects["evidence.json"]
+    assert stored["ContentEncoding"] == "gzip"
+    assert stored["Metadata"] == {evidence_codec.METADATA_KEY: evidence_codec.CODEC_VERSION}
+    assert len(stored["Body"]) < len(json.dumps(data)) / 5
+    assert s3_store.get_json("evidence.json") == data
+
+
+def test_small_objects_stay_plain_json(s3):
+    s3_store.put_json("small.json", {"status": "done", "at": datetime(2026, 1, 2)})
+    stored = s3.objects["small.json"]
+    assert "ContentEncoding" not in stored
+    assert json.loads(stored["Body"]) == {"status": "done", "at": "2026-01-02 00:00:00"}
+
+
+def test_legacy_and_untagged_objects_are_readable(s3):
+    data = _pack()
+    s3.objects["legacy.json"] = {"Body": json.dumps(data, default=str).encode("utf-8")}
+    assert s3_store.get_json("legacy.json") == data
+    # Compressed body whose Content-Encoding was lost (e.g. copied without metadata)
+    s3.objects["copied.json"] = {"Body": evidence_codec.encode(data, compression="gzip").body}
+    assert s3_store.get_json("copied.json") == data
+
+
+def test_zstd_without_zstandard_falls_back_to_gzip(s3, monkeypatch):
+    monkeypatch.setattr(evidence_codec, "zstandard", None)
+    s3_store.get_settings().s3_json_compression = "zstd"
+    s3_store.put_json("evidence.json", _pack())
+    assert s3.objects["evidence.json"]["ContentEncoding"] == "gzip"
+
+
+def test_zstd_levels_are_rejected_for_gzip_and_clamped_on_fallback(s3, monkeypatch):
+    with pytest.raises(ValueError, match="0-9 for gzip"):
+        Settings(s3_json_compression="gzip", s3_json_compression_level=19)
+    monkeypatch.setattr(evidence_codec, "zstandard", None)
+    settings = s3_store.get_settings()
+    settings.s3_json_compression, settings.s3_json_compression_level = "zstd", 19
+    data = _pack()
+    s3_store.put_json("evidence.json", data)
+    assert s3.objects["evidence.json"]["ContentEncoding"] == "gzip"
+    assert s3_store.get_json("evidence.json") == data
+
+
+def test_stdlib_json_path_matches_orjson(s3, monkeypatch):
+    data = _pack()
+    fast = evidence_codec.encode(data)
+    monkeypatch.setattr(evidence_codec, "orjson", None)
+    slow = evidence_codec.encode(data)
+    assert evidence_codec.decode(slow.body, slow.content_encoding) == data
+    assert evidence_codec.decode(fast.body, fast.content_encoding) == data
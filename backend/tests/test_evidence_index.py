@@ -0,0 +1,99 @@
+"""
+Tests for the local evidence vector index (chunking, retrieval, persistence).
+"""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from app.config import Settings
+from app.models import VideoAnalysis
+from app.models_twelvelabs.evidence import (
+    EvidenceChapter,
+    EvidenceEvent,
+    EvidenceKeyQuote,
+    EvidencePack,
+    EvidencePackSource,
+)
+from app.services import evidence_index
+from app.services.evidence_index import EvidenceIndex, HashingEmbedder, chunk_evidence
+
+
+def _long_pack(n: int = 200) -> EvidencePack:
+    chapters = [
+        EvidenceChapter(start=i * 10, end=i * 10 + 10, summary=f"Traffic passes the intersection, frame {i}")
+        for i in range(n)
+    ]
+    chapters.append(EvidenceChapter(start=1500, end=1510, summary="Man in a red hoodie grabs a bag near the dumpster"))
+    return EvidencePack(
+        video_id="vid-long",
+        source=EvidencePackSource(type="youtube", url="https://youtu.be/abc"),
+        transcript="Engine noise. " * 100 + "Someone yells about a stolen bag.",
+        chapters=chapters,
+        events=[EvidenceEvent(t=1505, type="action", label="Runs", evidence="Man runs out of the alley")],
+        key_quotes=[EvidenceKeyQuote(t=1506, text="Stop, thief!")],
+    )
+
+
+def test_chunk_evidence_covers_every_source():
+    segments = chunk_evidence(_long_pack(3), max_chars=200)
+    kinds = {s.kind for s in segments}
+    assert kinds == {"transcript", "event", "chapter", "quote"}
+    assert all(len(s.text) <= 220 for s in segments if s.kind == "transcript")
+    assert sum(s.kind == "chapter" for s in segments) == 4
+
+
+def test_search_ranks_relevant_segment_first():
+    index = EvidenceIndex.build(chunk_evidence(_long_pack()), HashingEmbedder(256))
+    segment, score = index.search("a man in a red hoodie grabbed my bag", k=3)[0]
+    assert "red hoodie" in segment.text
+    assert score > 0
+
+
+def test_focus_keeps_only_retrieved_segments_in_time_order():
+    index = EvidenceIndex.build(chunk_evidence(_long_pack()), HashingEmbedder(256))
+    video = VideoAnalysis(source="a.mp4", duration="25m", detections=[])
+    focused = index.focus(video, ["red hoodie grabbed a bag", "he ran out of the alley", "stop thief"], k=2)
+    assert 0 < len(focused.detections) <= 6
+    descriptions = " ".join(d.description for d in focused.detections)
+    assert "red hoodie" in descriptions and "runs out of the alley" in descriptions
+    timestamps = [d.timestamp for d in focused.detections if d.timestamp != "--:--:--"]
+    assert timestamps == sorted(timestamps)
+    assert focused.speech_transcription[0]["text"] == "Stop, thief!"
+    assert focused.source == "a.mp4"
+
+
+def test_saved_index_is_reused_without_re_embedding(tmp_path):
+    settings = Settings(evidence_cache_dir=str(tmp_path), evidence_index_dim=128)
+    pack = _long_pack(20)
+    with patch.object(evidence_index, "get_settings", lambda: settings):
+        first = evidence_index.get_or_build_index(pack)
+        embedder = HashingEmbedder(128)
+        with patch.object(embedder, "embed", wraps=embedder.embed) as embed:
+            second = evidence_index.get_or_build_index(pack, embedder)
+    assert list((tmp_path / "index").glob("*.npz"))
+    assert len(second) == len(first)
+    assert (second.vectors == first.vectors).all()
+    embed.assert_not_called()
+
+
+def test_index_from_another_embedder_is_ignored(tmp_path):
+    index = EvidenceIndex.build(chunk_evidence(_long_pack(5)), HashingEmbedder(64))
+    index.save(tmp_path / "idx.npz")
+    assert EvidenceIndex.load(tmp_path / "idx.npz", HashingEmbedder(128)) is None
+    assert EvidenceIndex.load(tmp_path / "missing.npz", HashingEmbedder(64)) is None
+
+
+def test_focus_without_matches_keeps_all_evidence():
+    index = EvidenceIndex.build(chunk_evidence(_long_pack(5)), HashingEmbedder(256))
+    video = VideoAnalysis(source="a.mp4", duration="1m", detections=[], speech_transcription=[{"text": "hi"}])
+    assert index.focus(video, ["", "   "], k=3) is video
+
+
+def test_saved_indexes_are_pruned_by_last_use(tmp_path):
+    settings = Settings(evidence_cache_dir=str(tmp_path), evidence_index_dim=64, evidence_index_max_entries=2)
+    packs = [_long_pack(n).model_copy(update={"video_id": f"vid-{n}"}) for n in (1, 2, 3)]
+    with patch.object(evidence_index, "get_settings", lambda: settings):
+        for pack in packs:
+            evidence_index.get_or_build_index(pack)
+    assert len(list((tmp_path / "index").glob("*.npz"))) == 2
+    assert not list((tmp_path / "index").glob("*.tmp"))
@@ -0,0 +1,151 @@
+"""
+Tests for the evidence read cache: S3 revalidation, disk tier, bounds and HTTP ETag/304.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+
+from app import db, main
+from app.config import Settings
+from app.services import evidence_codec, evidence_read_cache, s3_store, twelvelabs_client
+from app.services.evidence_cache import DiskTier
+
+
+class FakeS3:
+    """put_object/get_object with ETags and If-None-Match; counts body downloads."""
+
+    def __init__(self):
+        self.objects = {}
+        self.version = 0
+        self.downloads = 0
+        self.not_modified = 0
+
+    def put_object(self, *, Bucket, Key, Body, **kwargs):
+        self.version += 1
+        self.objects[Key] = (Body, kwargs.get("ContentEncoding"), f'"v{self.version}"')
+
+    def get_object(self, *, Bucket, Key, IfNoneMatch=None):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        body, encoding, etag = self.objects[Key]
+        if IfNoneMatch == etag:
+            self.not_modified += 1
+            raise ClientError(
+                {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPStatusCode": 304}}, "GetObject"
+            )
+        self.downloads += 1
+        return {"Body": io.BytesIO(body), "ContentEncoding": encoding, "ETag": etag}
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    settings = Settings(
+        sqlite_database_url=f"sqlite:///{tmp_path / 'jobs.db'}",
+        s3_bucket="test-bucket",
+        evidence_read_cache_revalidate_seconds=60,
+    )
+    for module in (db, s3_store, evidence_codec, evidence_read_cache):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_engine", None)
+    monkeypatch.setattr(evidence_read_cache, "_cache", None)
+    fake = FakeS3()
+    monkeypatch.setattr(s3_store, "_client", lambda: fake)
+
+    job = db.create_job("proj", "claim", "youtube", "https://youtu.be/abc")
+    db.update_job_status(job.job_id, "done", video_id="vid-1")
+    key = s3_store.evidence_key("proj", "vid-1")
+    s3_store.put_json(key, _pack("First transcript.").model_dump(mode="json"))
+    yield {"settings": settings, "s3": fake, "key": key}
+    monkeypatch.setattr(db, "_engine", None)
+
+
+def _pack(transcript: str):
+    pack = twelvelabs_client._mock_evidence_pack("vid-1", "youtube", "https://youtu.be/abc")
+    pack.transcript = transcript
+    return pack
+
+
+def _get(headers_list: list[dict]) -> list[httpx.Response]:
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get("/api/videos/vid-1/evidence", headers=h) for h in headers_list]
+
+    return asyncio.run(run())
+
+
+def test_repeat_fetches_hit_the_cache_and_304(env):
+    first, second = _get([{}, {}])
+    assert first.status_code == 200 and first.json()["transcript"] == "First transcript."
+    assert first.headers["etag"] == second.headers["etag"]
+    assert second.content == first.content
+    assert env["s3"].downloads == 1
+
+    (not_modified,) = _get([{"If-None-Match": first.headers["etag"]}])
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert env["s3"].downloads == 1
+
+
+def test_stale_entries_revalidate_with_s3(env):
+    env["settings"].evidence_read_cache_revalidate_seconds = 0
+    first, second = _get([{}, {}])
+    assert env["s3"].downloads == 1 and env["s3"].not_modified == 1
+    assert second.headers["etag"] == first.headers["etag"]
+
+    s3_store.put_json(env["key"], _pack("Updated transcript.").model_dump(mode="json"))
+    (changed,) = _get([{"If-None-Match": first.headers["etag"]}])
+    assert changed.status_code == 200 and changed.json()["transcript"] == "Updated transcript."
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_disk_tier_survives_restart_with_a_conditional_get(env, tmp_path):
+    tier = DiskTier(tmp_path / "read_cache", max_entries=10)
+    cache = evidence_read_cache.EvidenceReadCache(max_entries=10, max_bytes=10**6, revalidate_seconds=60, tier=tier)
+    body = cache.get(env["key"]).body
+
+    restarted = evidence_read_cache.EvidenceReadCache(
+        max_entries=10, max_bytes=10**6, revalidate_seconds=60, tier=tier
+    )
+    assert restarted.get(env["key"]).body == body
+    assert env["s3"].downloads == 1 and env["s3"].not_modified == 1
+
+
+def test_invalidate_survives_a_failing_disk_tier(env, tmp_path, monkeypatch):
+    tier = DiskTier(tmp_path / "read_cache", max_entries=10)
+    cache = evidence_read_cache.EvidenceReadCache(max_entries=10, max_bytes=10**6, revalidate_seconds=60, tier=tier)
+    cache.get(env["key"])
+
+    def broken(key):
+        raise PermissionError("read-only filesystem")
+
+    monkeypatch.setattr(tier, "delete", broken)
+    cache.invalidate(env["key"])
+    assert env["key"] not in cache._memory
+
+
+def test_memory_tier_is_bounded_by_bytes(env):
+    cache = evidence_read_cache.EvidenceReadCache(max_entries=10, max_bytes=1500, revalidate_seconds=60)
+    for i in range(3):
+        key = f"projects/p/videos/v{i}/evidence.json"
+        s3_store.put_json(key, _pack("x" * 400).model_dump(mode="json"))
+        cache.get(key)
+    assert cache._bytes <= 1500 and len(cache._memory) < 3
+    assert "projects/p/videos/v2/evidence.json" in cache._memory
+
+
+def test_missing_evidence_is_404(env):
+    del env["s3"].objects[env["key"]]
+    (response,) = _get([{}])
+    assert response.status_code == 404
+
+
+def test_etag_matching():
+    assert evidence_read_cache.etag_matches('"a", W/"b"', '"b"')
+    assert evidence_read_cache.etag_matches("*", '"b"')
+    assert not evidence_read_cache.etag_matches('"a"', '"b"')
+    assert not evidence_read_cache.etag_matches(None, '"b"')
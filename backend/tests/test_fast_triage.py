@@ -0,0 +1,131 @@
+"""
+Tests for the rule-based fast triage engine and tier selection in NoirVisionAnalyzer.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+from app import fast_triage
+from app.models_twelvelabs.evidence import (
+    EvidenceChapter,
+    EvidenceEvent,
+    EvidenceKeyQuote,
+    EvidencePack,
+    EvidencePackSource,
+)
+from app.noirvision_analyzer import NoirVisionAnalyzer
+from tests.test_backboard_api import _mock_report
+
+CATEGORIES = ["Time Match", "Location Match", "Suspect Description", "Weapon Match", "Event Sequence"]
+
+
+def _pack() -> EvidencePack:
+    return EvidencePack(
+        video_id="vid-1",
+        source=EvidencePackSource(type="youtube", url="https://youtu.be/abc"),
+        transcript="Dark alley lit by a single streetlight. A man in a red hoodie waits by a dumpster.",
+        chapters=[
+            EvidenceChapter(start=0, end=20, summary="Man in red hoodie waits in the alley at night"),
+            EvidenceChapter(start=20, end=45, summary="Man grabs a bag and runs toward the street"),
+        ],
+        events=[
+            EvidenceEvent(t=22, type="action", label="Grab", evidence="Man grabs a woman's bag"),
+            EvidenceEvent(t=25, type="action", label="Runs", evidence="Man runs out of the alley"),
+        ],
+        key_quotes=[EvidenceKeyQuote(t=23, text="Stop! Give it back!")],
+    )
+
+
+def test_supported_claim_matches_all_categories():
+    claim = "Around 11pm a man in a red hoodie grabbed my bag in the alley and ran. He was unarmed."
+    results = fast_triage.triage_claim(claim, _pack())
+    assert [r.category for r in results] == CATEGORIES
+    assert all(r.match for r in results), [(r.category, r.explanation) for r in results]
+
+
+def test_contradicted_claim():
+    claim = "At 9am a tall woman in a blue jacket pulled a knife on me outside the bank, then drove off."
+    results = {r.category: r for r in fast_triage.triage_claim(claim, _pack())}
+    assert not results["Time Match"].match
+    assert not results["Location Match"].match and "bank" in results["Location Match"].explanation
+    assert not results["Suspect Description"].match
+    assert not results["Weapon Match"].match and "blade" in results["Weapon Match"].explanation
+    assert not results["Event Sequence"].match
+
+
+def test_out_of_order_events_do_not_match():
+    claim = "The man ran off and then grabbed the bag."
+    sequence = fast_triage.triage_claim(claim, _pack())[-1]
+    assert not sequence.match and "out of claimed order" in sequence.explanation
+
+
+def test_fast_triage_is_fast():
+    claim = "Around 11pm a man in a red hoodie grabbed my bag in the alley and ran."
+    pack = _pack()
+    start = time.perf_counter()
+    for _ in range(200):
+        fast_triage.triage_claim(claim, pack)
+    assert (time.perf_counter() - start) / 200 < 0.005
+
+
+def _analyzer() -> NoirVisionAnalyzer:
+    analyzer = NoirVisionAnalyzer.__new__(NoirVisionAnalyzer)
+    analyzer.backboard = MagicMock()
+    analyzer.backboard.analyze_claim_vs_video = AsyncMock(return_value=_mock_report())
+    return analyzer
+
+
+def test_fast_tier_never_calls_backboard():
+    analyzer = _analyzer()
+    report = asyncio.run(analyzer.analyze_video_with_claim(
+        _pack(), "Around 11pm a man in a red hoodie grabbed my bag in the alley and ran. He was unarmed.",
+        tier="fast",
+    ))
+    assert report.analysis_tier == "fast"
+    assert report.verdict == "CLAIM SUPPORTED" and report.credibility_score == 100
+    analyzer.backboard.analyze_claim_vs_video.assert_not_awaited()
+
+
+def test_auto_tier_escalates_only_inconclusive():
+    analyzer = _analyzer()
+    # 2 of 5 categories match (time, location) -> 40 -> INCONCLUSIVE -> Backboard
+    report = asyncio.run(analyzer.analyze_video_with_claim(
+        _pack(), "It happened at night in the alley; a tall woman in a blue coat with a gun.", tier="auto",
+    ))
+    assert report.analysis_tier == "llm"
+    analyzer.backboard.analyze_claim_vs_video.assert_awaited_once()
+
+    analyzer = _analyzer()
+    report = asyncio.run(analyzer.analyze_video_with_claim(
+        _pack(), "Around 11pm a man in a red hoodie grabbed my bag in the alley and ran. He was unarmed.",
+        tier="auto",
+    ))
+    assert report.analysis_tier == "fast"
+    analyzer.backboard.analyze_claim_vs_video.assert_not_awaited()
+
+
+def test_am_in_speech_is_not_a_morning_cue():
+    pack = _pack().model_copy(update={"transcript": "I am calling the police. I am scared."})
+    pack.chapters = []
+    time_match = fast_triage.triage_claim("It was early in the morning when he ran.", pack)[0]
+    assert not time_match.match
+
+
+def test_auto_tier_escalates_contradictions_on_unmentioned_facts():
+    analyzer = _analyzer()
+    # Only the action is mentioned (and matches); four "claim says nothing" mismatches -> 20
+    report = asyncio.run(analyzer.analyze_video_with_claim(_pack(), "He grabbed it.", tier="auto"))
+    assert report.analysis_tier == "llm"
+    analyzer.backboard.analyze_claim_vs_video.assert_awaited_once()
+
+    analyzer = _analyzer()
+    claim = "At 9am a tall woman in a blue jacket pulled a knife on me outside the bank, then drove off."
+    report = asyncio.run(analyzer.analyze_video_with_claim(_pack(), claim, tier="auto"))
+    assert report.analysis_tier == "fast" and report.verdict.startswith("CLAIM CONTRADICTED")
+    analyzer.backboard.analyze_claim_vs_video.assert_not_awaited()
@@ -0,0 +1,201 @@
+"""
+Tests for the durable job queue (leases, retries, recovery) and the job worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, job_queue, worker
+from app.config import Settings
+from app.models_twelvelabs.jobs import JobKind, JobStatus
+
+
+@pytest.fixture
+def queue_settings(tmp_path, monkeypatch):
+    settings = Settings(
+        sqlite_database_url=f"sqlite:///{tmp_path / 'jobs.db'}",
+        job_lease_seconds=30,
+        job_max_attempts=2,
+        job_retry_backoff_seconds=0,
+        job_poll_seconds=0.05,
+    )
+    for module in (db, job_queue, worker):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_engine", None)
+    yield settings
+    monkeypatch.setattr(db, "_engine", None)
+
+
+def _job(kind: str = JobKind.EVIDENCE) -> str:
+    return db.create_job("proj", "claim", "youtube", "https://youtu.be/abc", kind=kind).job_id
+
+
+def _set(job_id: str, **values) -> None:
+    with db.session() as s:
+        job = s.get(db.Job, job_id)
+        for name, value in values.items():
+            setattr(job, name, value)
+        s.add(job)
+        s.commit()
+
+
+def test_each_job_is_claimed_once(queue_settings):
+    first, second = _job(), _job()
+    _job(kind=JobKind.COMPLETE)  # never claimed by queue workers
+    claimed = [job_queue.claim_job("w1"), job_queue.claim_job("w2"), job_queue.claim_job("w3")]
+    assert [j.job_id for j in claimed[:2]] == [first, second]
+    assert claimed[2] is None
+    job = db.get_job(first)
+    assert job.status == JobStatus.PROCESSING and job.lease_owner == "w1" and job.attempts == 1
+
+
+def test_failure_is_retried_with_backoff_then_fails(queue_settings):
+    queue_settings.job_retry_backoff_seconds = 60
+    job_id = _job()
+    job_queue.claim_job("w1")
+    assert job_queue.fail_job(job_id, "w1", "TwelveLabs 503")
+    job = db.get_job(job_id)
+    assert job.status == JobStatus.PENDING and job.error_message == "TwelveLabs 503"
+    assert job.available_at > datetime.utcnow() + timedelta(seconds=50)
+    assert job_queue.claim_job("w1") is None  # not due yet
+
+    _set(job_id, available_at=datetime.utcnow())
+    assert job_queue.claim_job("w2").attempts == 2
+    job_queue.fail_job(job_id, "w2", "TwelveLabs 503 again")
+    job = db.get_job(job_id)
+    assert job.status == JobStatus.FAILED and job.lease_owner is None
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cannot_finish(queue_settings):
+    job_id = _job()
+    job_queue.claim_job("dead-worker")
+    _set(job_id, lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    assert job_queue.claim_job("w2").job_id == job_id
+    assert not job_queue.renew_lease(job_id, "dead-worker")
+    assert not job_queue.complete_job(job_id, "dead-worker", video_id="stale")
+    assert job_queue.complete_job(job_id, "w2", video_id="vid-1")
+    job = db.get_job(job_id)
+    assert job.status == JobStatus.DONE and job.video_id == "vid-1"
+
+
+def test_recover_requeues_unleased_jobs_and_fails_orphaned_complete_jobs(queue_settings):
+    legacy = _job()
+    _set(legacy, status=JobStatus.PROCESSING)  # run via BackgroundTasks before a restart
+    orphan = _job(kind=JobKind.COMPLETE)
+    _set(orphan, status=JobStatus.PROCESSING, updated_at=datetime.utcnow() - timedelta(hours=1))
+    fresh = _job(kind=JobKind.COMPLETE)  # another API process is about to lease it
+
+    assert job_queue.recover_jobs() == 1
+    assert db.get_job(legacy).status == JobStatus.PENDING
+    assert db.get_job(orphan).status == JobStatus.FAILED
+    assert db.get_job(fresh).status == JobStatus.PENDING
+
+
+def test_worker_runs_jobs_with_bounded_concurrency_and_retries(queue_settings):
+    job_ids = [_job() for _ in range(4)]
+    running = 0
+    peak = 0
+    calls: dict[str, int] = {}
+
+    async def handler(job, on_stage):
+        nonlocal running, peak
+        calls[job.job_id] = calls.get(job.job_id, 0) + 1
+        running += 1
+        peak = max(peak, running)
+        try:
+            on_stage("indexing")
+            await asyncio.sleep(0.05)
+            if job.job_id == job_ids[0] and job.attempts == 1:
+                raise RuntimeError("flaky")
+            return "vid-" + job.job_id[:4]
+        finally:
+            running -= 1
+
+    async def run():
+        w = worker.JobWorker(concurrency=2, handlers={JobKind.EVIDENCE: handler})
+        w.start()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if all(db.get_job(j).status == JobStatus.DONE for j in job_ids):
+                break
+            await asyncio.sleep(0.02)
+        await w.stop()
+
+    asyncio.run(run())
+    assert [db.get_job(j).status for j in job_ids] == [JobStatus.DONE] * 4
+    assert peak == 2
+    assert calls[job_ids[0]] == 2
+    assert db.get_job(job_ids[1]).stage == "indexing"
+
+
+def test_lost_lease_cancels_the_job(queue_settings):
+    queue_settings.job_lease_seconds = 0.15
+    job_id = _job()
+    cancelled = asyncio.Event()
+
+    async def handler(job, on_stage):
+        # Someone else takes the job over while we are still working on it
+        _set(job.job_id, lease_owner="other-worker")
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        w = worker.JobWorker(concurrency=1, handlers={JobKind.EVIDENCE: handler})
+        job = job_queue.claim_job(w.worker_id)
+        await asyncio.wait_for(w._execute(job), timeout=2)
+
+    asyncio.run(run())
+    assert cancelled.is_set()
+    assert db.get_job(job_id).lease_owner == "other-worker"
+
+
+def test_stopping_the_worker_hands_running_jobs_back(queue_settings):
+    job_id = _job()
+    started = asyncio.Event()
+
+    async def handler(job, on_stage):
+        started.set()
+        await asyncio.sleep(5)
+
+    async def run():
+        w = worker.JobWorker(concurrency=1, handlers={JobKind.EVIDENCE: handler})
+        w.start()
+        await asyncio.wait_for(started.wait(), timeout=2)
+        await w.stop()
+
+    asyncio.run(run())
+    job = db.get_job(job_id)
+    assert job.status == JobStatus.PENDING and job.attempts == 0 and job.lease_owner is None
+
+
+def test_stage_recorder_writes_off_the_loop_in_order(queue_settings, monkeypatch):
+    job_id = _job()
+    written, changes = [], []
+    original = job_queue.update_job_stage
+
+    def slow_write(job, stage):
+        time.sleep(0.05 if stage == "indexing" else 0)  # first write is the slowest
+        written.append(stage)
+        return original(job, stage)
+
+    monkeypatch.setattr(job_queue, "update_job_stage", slow_write)
+
+    async def run():
+        stages = job_queue.StageRecorder(job_id, on_change=lambda: changes.append(job_id))
+        started = time.monotonic()
+        for stage in ("indexing", "comparing", "comparing", "rendering"):
+            stages(stage)
+        assert time.monotonic() - started < 0.04  # the loop was not blocked
+        await stages.flush()
+
+    asyncio.run(run())
+    assert written == ["indexing", "comparing", "comparing", "rendering"]
+    assert changes == [job_id] * 3  # the repeated stage changed nothing
+    assert db.get_job(job_id).stage == "rendering"
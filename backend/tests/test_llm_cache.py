@@ -0,0 +1,120 @@
+"""
+Tests for the LLM response cache and its use in BackboardAnalyzer._send_message.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+from app import backboard_agent
+from app.backboard_agent import BackboardAnalyzer
+from app.services.llm_cache import LLMCache, llm_cache_bypass, llm_cache_key
+
+
+def test_key_normalizes_whitespace_and_includes_model():
+    assert llm_cache_key("gpt-4o-mini", "Parse  this\n claim") == llm_cache_key("gpt-4o-mini", " Parse this claim ")
+    assert llm_cache_key("gpt-4o-mini", "x") != llm_cache_key("gpt-4o", "x")
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = tmp_path / "llm.db"
+    first = LLMCache(ttl_seconds=60, max_entries=10, path=path)
+    first.put("k", "gpt-4o-mini", "answer")
+    second = LLMCache(ttl_seconds=60, max_entries=10, path=path)
+    assert second.get("k") == "answer"
+    assert second.get("k") == "answer"
+    assert (second.disk_hits, second.memory_hits, second.misses) == (1, 1, 0)
+
+
+def test_sqlite_tier_creates_missing_directories(tmp_path):
+    cache = LLMCache(ttl_seconds=60, max_entries=10, path=tmp_path / "sub" / "dir" / "llm.db")
+    cache.put("k", "gpt-4o-mini", "answer")
+    assert (tmp_path / "sub" / "dir" / "llm.db").is_file()
+    assert LLMCache(ttl_seconds=60, max_entries=10, path=tmp_path / "sub" / "dir" / "llm.db").get("k") == "answer"
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMCache(ttl_seconds=0.05, max_entries=2, path=tmp_path / "llm.db", disk_max_entries=3)
+    cache.put("old", "m", "1")
+    time.sleep(0.06)
+    assert cache.get("old") is None
+
+    cache = LLMCache(ttl_seconds=60, max_entries=2, path=tmp_path / "llm2.db", disk_max_entries=3)
+    for i in range(5):
+        cache.put(f"k{i}", "m", str(i))
+        time.sleep(0.001)
+    assert list(cache._memory) == ["k3", "k4"]
+    fresh = LLMCache(ttl_seconds=60, max_entries=2, path=tmp_path / "llm2.db", disk_max_entries=3)
+    assert [fresh.get(f"k{i}") for i in range(5)] == [None, None, "2", "3", "4"]
+
+
+def test_bypass_skips_reads_but_stores():
+    cache = LLMCache(ttl_seconds=60, max_entries=10)
+    cache.put("k", "m", "old")
+    with llm_cache_bypass():
+        assert cache.get("k") is None
+        cache.put("k", "m", "new")
+    assert cache.get("k") == "new"
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_send_message_uses_cache(monkeypatch):
+    cache = LLMCache(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(backboard_agent, "get_llm_cache", lambda: cache)
+    calls = []
+
+    async def add_message(thread_id, content, **kwargs):
+        calls.append(content)
+        return SimpleNamespace(content=f"reply {len(calls)}")
+
+    analyzer = BackboardAnalyzer.__new__(BackboardAnalyzer)
+    analyzer.client = SimpleNamespace(add_message=add_message)
+
+    async def scenario():
+        first = await analyzer._send_message("t1", "Parse: he ran")
+        again = await analyzer._send_message("t2", "Parse:  he ran")
+        with llm_cache_bypass():
+            fresh = await analyzer._send_message("t3", "Parse: he ran")
+        uncached = await analyzer._send_message("t4", "Parse: he ran", cacheable=False)
+        return first, again, fresh, uncached
+
+    assert asyncio.run(scenario()) == ("reply 1", "reply 1", "reply 2", "reply 3")
+    assert len(calls) == 3
+
+
+def test_send_message_caches_only_parsed_replies(monkeypatch):
+    cache = LLMCache(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(backboard_agent, "get_llm_cache", lambda: cache)
+    replies = iter(["not json", '{"time": "night"}'])
+    calls = []
+
+    async def add_message(thread_id, content, **kwargs):
+        calls.append(thread_id)
+        return SimpleNamespace(content=next(replies))
+
+    analyzer = BackboardAnalyzer.__new__(BackboardAnalyzer)
+    analyzer.client = SimpleNamespace(add_message=add_message)
+
+    async def scenario():
+        first = await analyzer._parse_claim("t1", "he ran at night")
+        second = await analyzer._parse_claim("t2", "he ran at night")
+        third = await analyzer._parse_claim("t3", "he ran at night")
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == BackboardAnalyzer._unparsed_claim()
+    assert second == third == {"time": "night"}
+    assert calls == ["t1", "t2"]
+
+    # A bad reply already in the cache is evicted and the prompt sent to the thread
+    key = next(iter(cache._memory))
+    cache.put(key, "gpt-4o-mini", "still not json")
+    replies = iter(['{"time": "dawn"}'])
+    assert asyncio.run(analyzer._parse_claim("t4", "he ran at night")) == {"time": "dawn"}
+    assert calls[-1] == "t4" and cache.get(key) == '{"time": "dawn"}'
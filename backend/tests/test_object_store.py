@@ -0,0 +1,100 @@
+"""
+Tests for the pluggable object store and its local filesystem backend.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app import db, worker
+from app.config import Settings
+from app.services import evidence_codec, object_store, s3_store, twelvelabs_client
+
+
+@pytest.fixture
+def local(tmp_path, monkeypatch):
+    settings = Settings(
+        storage_backend="local",
+        storage_local_root=str(tmp_path / "store"),
+        storage_mmap_min_bytes=4096,
+        s3_json_compress_min_bytes=1024,
+        sqlite_database_url=f"sqlite:///{tmp_path / 'jobs.db'}",
+    )
+    for module in (object_store, s3_store, evidence_codec, db, worker):
+        monkeypatch.setattr(module, "get_settings", lambda: settings)
+    monkeypatch.setattr(db, "_engine", None)
+    yield settings
+    monkeypatch.setattr(db, "_engine", None)
+
+
+def _pack(words: int) -> dict:
+    pack = twelvelabs_client._mock_evidence_pack("vid-1", "s3", "uploads/a.mp4")
+    pack.transcript = " ".join(f"word{i}" for i in range(words))
+    return pack.model_dump(mode="json")
+
+
+def test_json_round_trip_without_aws(local, tmp_path):
+    small, large = _pack(10), _pack(5000)
+    s3_store.put_json("projects/p/videos/v/small.json", small)
+    s3_store.put_json("projects/p/videos/v/evidence.json", large)
+    assert s3_store.get_json("projects/p/videos/v/small.json") == small
+    assert s3_store.get_json("projects/p/videos/v/evidence.json") == large
+    assert s3_store.get_json("projects/p/videos/v/missing.json") is None
+
+    files = sorted(p.name for p in (tmp_path / "store" / "projects/p/videos/v").iterdir())
+    assert files == ["evidence.json", "small.json"]  # no temp files left behind
+    assert (tmp_path / "store/projects/p/videos/v/evidence.json").read_bytes()[:2] == b"\x1f\x8b"
+
+
+def test_large_objects_are_memory_mapped(local, monkeypatch):
+    store = object_store.get_object_store()
+    body = b'{"transcript": "' + b"x" * 10000 + b'"}'
+    store.put("big.json", body, content_type="application/json")
+    store.put("tiny.json", b"{}", content_type="application/json")
+    big = store.get("big.json")
+    assert isinstance(big.body, memoryview) and big.body.nbytes == len(body)
+    assert isinstance(store.get("tiny.json").body, bytes)
+    assert evidence_codec.decode(big.body)["transcript"] == "x" * 10000
+    monkeypatch.setattr(evidence_codec, "orjson", None)
+    assert evidence_codec.decode(big.body)["transcript"] == "x" * 10000
+
+
+def test_conditional_reads_and_streaming(local):
+    store = object_store.get_object_store()
+    store.put("a/obj.bin", b"one", content_type="application/octet-stream")
+    first = store.get("a/obj.bin")
+    assert store.get("a/obj.bin", if_none_match=first.etag).not_modified
+    store.put("a/obj.bin", b"second", content_type="application/octet-stream")
+    changed = store.get("a/obj.bin", if_none_match=first.etag)
+    assert not changed.not_modified and changed.body == b"second"
+
+    assert b"".join(store.iter_chunks("a/obj.bin", chunk_size=2)) == b"second"
+    assert store.iter_chunks("a/missing.bin") is None
+    assert s3_store.get_presigned_url("a/obj.bin").startswith("file://")
+
+
+def test_keys_cannot_escape_the_root(local):
+    store = object_store.get_object_store()
+    with pytest.raises(ValueError):
+        store.put("../outside.json", b"{}", content_type="application/json")
+    with pytest.raises(ValueError):
+        store.get("/etc/passwd")
+
+
+def test_worker_indexes_local_videos_from_disk(local, monkeypatch):
+    store = object_store.get_object_store()
+    store.put("projects/p/uploads/clip.mp4", b"fake video", content_type="video/mp4")
+    job = db.create_job("p", "claim", "s3", "projects/p/uploads/clip.mp4")
+    calls = {}
+
+    async def fake_run(**kwargs):
+        calls.update(kwargs)
+        return twelvelabs_client._mock_evidence_pack("vid-9", "s3", kwargs["source_url_for_pack"])
+
+    monkeypatch.setattr(twelvelabs_client, "run_analysis_async", fake_run)
+    video_id = asyncio.run(worker.run_evidence_job(job, lambda stage: None))
+    assert video_id == "vid-9"
+    assert calls["video_url"] is None
+    assert calls["video_file_path"] == store.local_path("projects/p/uploads/clip.mp4")
+    assert s3_store.get_json(s3_store.evidence_key("p", "vid-9"))["video_id"] == "vid-9"
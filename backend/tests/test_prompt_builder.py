@@ -0,0 +1,72 @@
+"""
+Tests for the token-budgeted evidence prompt builder.
+"""
+from __future__ import annotations
+
+from app.models import VideoAnalysis, VideoDetection
+from app.prompt_builder import EvidencePromptBuilder, estimate_tokens
+
+
+def _ts(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _long_video(n: int = 600) -> VideoAnalysis:
+    detections = [
+        VideoDetection(timestamp=_ts(i * 6), description=f"Traffic passes intersection camera frame {i}", objects=["car"])
+        for i in range(n)
+    ]
+    detections.append(VideoDetection(
+        timestamp=_ts(1800), description="Man in red hoodie grabs a bag and runs", objects=["person", "bag"],
+    ))
+    return VideoAnalysis(
+        source="bodycam.mp4",
+        duration="60m 0s",
+        detections=detections,
+        on_screen_text="CAM 3",
+        speech_transcription=[{"timestamp": _ts(1801), "speaker": "Person", "text": "Stop, thief!"}],
+    )
+
+
+def test_small_evidence_is_rendered_in_full_and_in_order():
+    video = VideoAnalysis(
+        source="a.mp4",
+        duration="10s",
+        detections=[
+            VideoDetection(timestamp="00:00:01", description="Scene: Alley at night", objects=["scene_change"]),
+            VideoDetection(timestamp="00:00:05", description="Runs: Man runs", objects=["Runs"]),
+        ],
+        speech_transcription=[{"timestamp": "00:00:06", "speaker": "Person", "text": "Hey!"}],
+    )
+    built = EvidencePromptBuilder(2000).build(video, "a man ran")
+    assert built.dropped == []
+    assert built.text.index("Alley at night") < built.text.index("Man runs")
+    assert "Objects: Runs" in built.text
+    assert "Speech transcription:\n- Person: Hey!" in built.text
+
+
+def test_budget_is_enforced_and_relevant_items_survive():
+    built = EvidencePromptBuilder(1000).build(_long_video(), "A man in a red hoodie grabbed my bag and ran")
+    assert estimate_tokens(built.text) <= 1000
+    assert "red hoodie grabs a bag" in built.text
+    assert "Stop, thief!" in built.text
+    assert "On-screen text: CAM 3" in built.text
+    assert any(d["reason"] == "budget" for d in built.dropped)
+    assert "omitted for length" in built.text
+
+
+def test_near_duplicates_are_merged():
+    video = VideoAnalysis(
+        source="a.mp4",
+        duration="1m",
+        detections=[
+            VideoDetection(timestamp="00:00:20", description="Scene: Man grabs bag and runs", objects=["scene_change"]),
+            VideoDetection(timestamp="00:00:22", description="Man grabs bag and runs away", objects=["Grab"]),
+            VideoDetection(timestamp="00:09:00", description="Man grabs bag and runs", objects=["Grab"]),
+        ],
+    )
+    built = EvidencePromptBuilder(2000).build(video)
+    assert built.merged == 1
+    assert built.text.count("grabs bag") == 2  # the one nine minutes later is a separate event
+    assert "- 00:00:20: Man grabs bag and runs away\n  Objects: Grab, scene_change" in built.text
+    assert built.dropped[0]["reason"] == "duplicate"
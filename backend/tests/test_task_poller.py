@@ -0,0 +1,169 @@
+"""
+Tests for the process-wide TwelveLabs TaskPoller (batched, backoff, timeouts).
+Status lookups are faked; no network needed.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.config import Settings
+from app.services import task_poller as tp
+from app.services import twelvelabs_client as tl
+
+
+def _settings(**overrides) -> Settings:
+    values = {
+        "twelvelabs_api_key": "test-key",
+        "twelvelabs_index_id": "test-index",
+        "twelvelabs_mock": False,
+        "twelvelabs_poll_interval_seconds": 0.02,
+        "twelvelabs_poll_jitter": 0.0,
+        "twelvelabs_poll_tick_seconds": 0.01,
+        "twelvelabs_poll_batch_threshold": 3,
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+class FakeTwelveLabs:
+    """Tasks become ready after `ready_after` polls; counts per-task and list calls."""
+
+    def __init__(self, ready_after: int = 2, failed: tuple[str, ...] = ()):
+        self.ready_after = ready_after
+        self.failed = set(failed)
+        self.seen: dict[str, int] = {}
+        self.get_calls = 0
+        self.list_calls = 0
+        self.known: list[str] = []
+
+    def _status(self, task_id: str) -> dict:
+        self.seen[task_id] = self.seen.get(task_id, 0) + 1
+        if task_id in self.failed:
+            return {"_id": task_id, "status": "failed", "message": "bad codec"}
+        if self.seen[task_id] >= self.ready_after:
+            return {"_id": task_id, "status": "ready", "video_id": "vid-" + task_id}
+        return {"_id": task_id, "status": "indexing"}
+
+    async def get_task_status_async(self, task_id: str) -> dict:
+        self.get_calls += 1
+        return self._status(task_id)
+
+    async def list_tasks_async(self, index_id: str, *, page: int = 1, page_limit: int = 50) -> dict:
+        self.list_calls += 1
+        chunk = self.known[(page - 1) * page_limit: page * page_limit]
+        total = max(1, -(-len(self.known) // page_limit))
+        return {"data": [self._status(t) for t in chunk], "page_info": {"page": page, "total_page": total}}
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeTwelveLabs()
+    settings = _settings()
+    monkeypatch.setattr(tp, "get_settings", lambda: settings)
+    monkeypatch.setattr(tl, "get_task_status_async", fake.get_task_status_async)
+    monkeypatch.setattr(tl, "list_tasks_async", fake.list_tasks_async)
+    return fake
+
+
+def test_many_tasks_share_batched_polls(fake):
+    task_ids = [f"t{i}" for i in range(60)]
+    fake.known = list(task_ids)
+
+    async def scenario():
+        poller = tp.TaskPoller()
+        try:
+            return await asyncio.gather(
+                *(poller.wait_until_ready(t, timeout_seconds=5) for t in task_ids)
+            ), poller
+        finally:
+            await poller.stop()
+
+    video_ids, poller = asyncio.run(scenario())
+    assert video_ids == ["vid-" + t for t in task_ids]
+    assert fake.get_calls == 0
+    # 60 tasks x 2 polls each, served by a handful of paged list calls
+    assert fake.list_calls <= 6
+    assert poller.requests_sent == fake.list_calls
+    assert poller.pending == 0
+
+
+def test_few_tasks_use_per_task_polls(fake):
+    async def scenario():
+        poller = tp.TaskPoller()
+        try:
+            return await poller.wait_until_ready("solo", timeout_seconds=5)
+        finally:
+            await poller.stop()
+
+    assert asyncio.run(scenario()) == "vid-solo"
+    assert fake.list_calls == 0
+    assert fake.get_calls == 2
+
+
+def test_tasks_missing_from_list_fall_back_to_get(fake):
+    fake.known = ["a", "b"]
+
+    async def scenario():
+        poller = tp.TaskPoller()
+        try:
+            return await asyncio.gather(*(poller.wait_until_ready(t, timeout_seconds=5) for t in ["a", "b", "c"]))
+        finally:
+            await poller.stop()
+
+    assert asyncio.run(scenario()) == ["vid-a", "vid-b", "vid-c"]
+    assert fake.seen["c"] == 2 and fake.get_calls == 2
+
+
+def test_failed_task_raises(fake):
+    fake.failed = {"bad"}
+
+    async def scenario():
+        poller = tp.TaskPoller()
+        try:
+            await poller.wait_until_ready("bad", timeout_seconds=5)
+        finally:
+            await poller.stop()
+
+    with pytest.raises(RuntimeError, match="bad codec"):
+        asyncio.run(scenario())
+
+
+def test_timeout_raises(fake):
+    fake.ready_after = 10_000
+
+    async def scenario():
+        poller = tp.TaskPoller()
+        try:
+            await poller.wait_until_ready("slow", timeout_seconds=0.1)
+        finally:
+            await poller.stop()
+
+    with pytest.raises(TimeoutError, match="last status: indexing"):
+        asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_others(fake):
+    fake.ready_after = 4
+
+    async def run():
+        poller = tp.TaskPoller()
+        first = asyncio.ensure_future(poller.wait_until_ready("t-1"))
+        second = asyncio.ensure_future(poller.wait_until_ready("t-1"))
+        await asyncio.sleep(0.03)
+        first.cancel()
+        video_id = await second
+        assert poller.pending == 0
+
+        # Once every waiter is gone the task is no longer polled
+        third = asyncio.ensure_future(poller.wait_until_ready("t-2"))
+        await asyncio.sleep(0.03)
+        third.cancel()
+        await asyncio.sleep(0.01)
+        pending = poller.pending
+        await poller.stop()
+        return first.cancelled(), video_id, pending
+
+    assert asyncio.run(run()) == (True, "vid-t-1", 0)
+    assert fake.get_calls >= 4
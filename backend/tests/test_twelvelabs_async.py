@@ -0,0 +1,215 @@
+"""
+Tests for the async TwelveLabs client (shared pooled httpx.AsyncClient).
+Uses httpx.MockTransport so no network or API key is needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.services import twelvelabs_client as tl
+
+
+def _settings(**overrides) -> Settings:
+    values = {
+        "twelvelabs_api_key": "test-key",
+        "twelvelabs_index_id": "test-index",
+        "twelvelabs_mock": False,
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+def _fake_twelvelabs(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/tasks") and request.method == "POST":
+        return httpx.Response(200, json={"_id": "task-1"})
+    if path.endswith("/tasks/task-1"):
+        return httpx.Response(200, json={"_id": "task-1", "status": "ready", "video_id": "vid-1"})
+    if path.endswith("/analyze"):
+        return httpx.Response(200, json={"data": "Officer: stop right there."})
+    if path.endswith("/summarize"):
+        type_ = json.loads(request.content)["type"]
+        if type_ == "chapter":
+            return httpx.Response(200, json={"chapters": [{"start_sec": 0, "end_sec": 12, "chapter_title": "Alley"}]})
+        if type_ == "highlight":
+            return httpx.Response(
+                200,
+                json={"highlights": [{"start_sec": 4, "highlight": "Suspect runs", "highlight_summary": "Man in red hoodie runs"}]},
+            )
+        return httpx.Response(200, json={"summary": "A chase in an alley."})
+    return httpx.Response(404)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Install a mock-transport AsyncClient as the shared client and record requests."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return _fake_twelvelabs(request)
+
+    settings = _settings()
+    monkeypatch.setattr(tl, "get_settings", lambda: settings)
+    monkeypatch.setattr(tl, "get_evidence_cache", lambda: None)
+    client = httpx.AsyncClient(base_url=tl._base_url(), transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(tl, "_http_client", client)
+    yield seen
+    asyncio.run(client.aclose())
+
+
+def test_run_analysis_async_reuses_shared_client(fake_client):
+    """Every call in the async pipeline goes through the one shared client."""
+    shared = tl.get_http_client()
+    pack = asyncio.run(
+        tl.run_analysis_async(
+            video_url="https://youtu.be/abc",
+            source_type="youtube",
+            source_url_for_pack="https://youtu.be/abc",
+        )
+    )
+    assert tl.get_http_client() is shared
+    assert pack.video_id == "vid-1"
+    assert pack.transcript == "Officer: stop right there."
+    assert [c.summary for c in pack.chapters] == ["Alley"]
+    assert pack.events[0].label == "Suspect runs"
+    paths = [r.url.path for r in fake_client]
+    assert paths[0].endswith("/tasks") and paths[1].endswith("/tasks/task-1")
+    assert all(r.headers["x-api-key"] == "test-key" for r in fake_client)
+
+
+def test_close_http_client_reopens_lazily(monkeypatch):
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings())
+    monkeypatch.setattr(tl, "_http_client", None)
+
+    async def cycle():
+        first = await tl.open_http_client()
+        await tl.close_http_client()
+        assert first.is_closed
+        second = tl.get_http_client()
+        assert second is not first and not second.is_closed
+        await tl.close_http_client()
+
+    asyncio.run(cycle())
+
+
+def test_build_evidence_pack_async_fetches_sections_concurrently(monkeypatch):
+    """Sections overlap in time; total time tracks the slowest section, not the sum."""
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings())
+    running = 0
+    peak = 0
+
+    def slow(value):
+        async def fetch(video_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return value
+        return fetch
+
+    monkeypatch.setattr(tl, "fetch_transcript_async", slow("words"))
+    monkeypatch.setattr(tl, "fetch_chapters_async", slow([{"start_sec": 0, "end_sec": 5, "chapter_title": "A"}]))
+    monkeypatch.setattr(tl, "fetch_highlights_async", slow([]))
+    monkeypatch.setattr(tl, "fetch_summary_async", slow("summary"))
+
+    pack = asyncio.run(tl.build_evidence_pack_async("vid-1", "youtube", "https://youtu.be/abc"))
+    assert peak == 4
+    assert pack.transcript == "words"
+    assert pack.raw_twelvelabs is None
+
+
+def test_build_evidence_pack_async_degrades_only_failed_sections(monkeypatch):
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings(twelvelabs_section_timeout_seconds=0.05))
+
+    async def hangs(video_id):
+        await asyncio.sleep(5)
+
+    async def boom(video_id):
+        raise httpx.HTTPStatusError("429", request=httpx.Request("POST", "http://x"), response=httpx.Response(429))
+
+    async def chapters(video_id):
+        return [{"start_sec": 0, "end_sec": 5, "chapter_title": "Alley"}]
+
+    async def summary(video_id):
+        return "A chase in an alley."
+
+    monkeypatch.setattr(tl, "fetch_transcript_async", hangs)
+    monkeypatch.setattr(tl, "fetch_highlights_async", boom)
+    monkeypatch.setattr(tl, "fetch_chapters_async", chapters)
+    monkeypatch.setattr(tl, "fetch_summary_async", summary)
+
+    pack = asyncio.run(tl.build_evidence_pack_async("vid-1", "youtube", "https://youtu.be/abc"))
+    assert [c.summary for c in pack.chapters] == ["Alley"]
+    assert pack.events == []
+    # Transcript timed out, so the summary stands in for it
+    assert pack.transcript == "A chase in an alley."
+    degraded = pack.raw_twelvelabs["degraded_sections"]
+    assert set(degraded) == {"transcript", "highlights"}
+    assert degraded["transcript"].startswith("TimeoutError")
+
+
+def test_poll_until_ready_waits_through_indexing(monkeypatch):
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings())
+    statuses = iter([
+        {"_id": "task-1", "status": "indexing"},
+        {"_id": "task-1", "status": "ready", "video_id": "vid-1"},
+    ])
+    monkeypatch.setattr(tl, "get_task_status", lambda task_id: next(statuses))
+    monkeypatch.setattr(tl.time, "sleep", lambda seconds: None)
+
+    assert tl.poll_until_ready("task-1", timeout_seconds=5) == "vid-1"
+
+
+def test_sync_sections_time_out_from_their_own_start(monkeypatch):
+    """With one slot, queued sections get their full timeout once they start."""
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings(
+        twelvelabs_evidence_concurrency=1, twelvelabs_section_timeout_seconds=0.3,
+    ))
+
+    def slow(value):
+        def fetch(video_id):
+            time.sleep(0.15)
+            return value
+        return fetch
+
+    def hangs(video_id):
+        time.sleep(2)
+
+    monkeypatch.setattr(tl, "fetch_transcript", slow("words"))
+    monkeypatch.setattr(tl, "fetch_chapters", slow([{"start_sec": 0, "end_sec": 5, "chapter_title": "A"}]))
+    monkeypatch.setattr(tl, "fetch_highlights", hangs)
+    monkeypatch.setattr(tl, "fetch_summary", slow("summary"))
+
+    start = time.perf_counter()
+    pack = tl.build_evidence_pack("vid-1", "youtube", "https://youtu.be/abc")
+    # 0.15 + 0.15 + 0.3 (highlights times out and frees its slot) + 0.15
+    assert time.perf_counter() - start < 1.2
+    assert pack.transcript == "words" and [c.summary for c in pack.chapters] == ["A"]
+    assert set(pack.raw_twelvelabs["degraded_sections"]) == {"highlights"}
+
+
+def test_sync_sections_hanging_together_time_out_together(monkeypatch):
+    monkeypatch.setattr(tl, "get_settings", lambda: _settings(
+        twelvelabs_evidence_concurrency=4, twelvelabs_section_timeout_seconds=0.3,
+    ))
+
+    def hangs(video_id):
+        time.sleep(2)
+
+    for name in ("transcript", "chapters", "highlights", "summary"):
+        monkeypatch.setattr(tl, f"fetch_{name}", hangs)
+
+    start = time.perf_counter()
+    pack = tl.build_evidence_pack("vid-1", "youtube", "https://youtu.be/abc")
+    assert time.perf_counter() - start < 0.6
+    degraded = pack.raw_twelvelabs["degraded_sections"]
+    assert set(degraded) == {"transcript", "chapters", "highlights", "summary"}
+    assert degraded["transcript"].startswith("TimeoutError")
@@ -0,0 +1,151 @@
+"""
+Tests for streamed upload spooling and the upload size limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+if "backboard" not in sys.modules:
+    sys.modules["backboard"] = MagicMock()
+
+import os
+os.environ.setdefault("BACKBOARD_API_KEY", "test-key-for-pytest")
+
+import httpx
+import pytest
+from fastapi import UploadFile
+
+from app import main, pipeline
+from app.config import Settings
+from app.services import twelvelabs_client, uploads
+from tests.test_backboard_api import _mock_report
+
+
+def _upload(data: bytes, filename: str = "bodycam.mp4") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename)
+
+
+def test_spool_upload_streams_to_unique_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(upload_tmp_dir=str(tmp_path)))
+    data = os.urandom(300_000)
+
+    async def spool_two():
+        return await asyncio.gather(
+            uploads.spool_upload(_upload(data), chunk_size=65536),
+            uploads.spool_upload(_upload(b"other"), chunk_size=65536),
+        )
+
+    first, second = asyncio.run(spool_two())
+    assert first.path != second.path
+    assert first.path.parent == tmp_path and first.path.suffix == ".mp4"
+    assert first.path.read_bytes() == data
+    assert first.size == len(data)
+    assert first.cache_key == "sha256:" + hashlib.sha256(data).hexdigest()
+    first.cleanup()
+    assert not first.path.exists()
+
+
+def test_spool_upload_ignores_unsafe_filenames(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(upload_tmp_dir=str(tmp_path)))
+    spooled = asyncio.run(uploads.spool_upload(_upload(b"abc", filename="../../etc/passwd")))
+    assert spooled.path.parent == tmp_path and spooled.path.suffix == ".mp4"
+    spooled.cleanup()
+
+
+def test_spool_upload_enforces_limit_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(upload_tmp_dir=str(tmp_path)))
+    with pytest.raises(uploads.UploadTooLarge):
+        asyncio.run(uploads.spool_upload(_upload(b"x" * 10_000), max_bytes=4096, chunk_size=4096))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_request_rejected_before_body_is_read(monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(max_upload_bytes=1024))
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/analyze/complete",
+                data={"claim": "x"},
+                files={"video_file": ("a.mp4", b"x" * 200_000, "video/mp4")},
+            )
+
+    r = asyncio.run(post())
+    assert r.status_code == 413
+
+
+def test_analyze_complete_upload_uses_content_hash_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(upload_tmp_dir=str(tmp_path)))
+    calls = []
+
+    async def fake_run(**kwargs):
+        calls.append(kwargs)
+        assert os.path.exists(kwargs["video_file_path"])
+        return twelvelabs_client._mock_evidence_pack("vid-1", "s3", kwargs["source_url_for_pack"])
+
+    monkeypatch.setattr(pipeline, "run_analysis_async", fake_run)
+    noirvision = MagicMock()
+    noirvision.analyze_video_with_claim = AsyncMock(return_value=_mock_report())
+    noirvision.generate_formatted_report = MagicMock(return_value="REPORT")
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+    monkeypatch.setattr(main, "noirvision", noirvision)
+    data = b"frame" * 1000
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/analyze/complete",
+                data={"claim": "He ran."},
+                files={"video_file": ("bodycam.mp4", data, "video/mp4")},
+            )
+
+    r = asyncio.run(post())
+    assert r.status_code == 200
+    assert calls[0]["cache_key"] == "sha256:" + hashlib.sha256(data).hexdigest()
+    assert calls[0]["source_url_for_pack"] == "bodycam.mp4"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_multipart_upload_is_written_to_disk_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "get_settings", lambda: Settings(upload_tmp_dir=str(tmp_path)))
+
+    def no_copy(*args, **kwargs):
+        raise AssertionError("upload was copied a second time")
+
+    monkeypatch.setattr(uploads, "_copy_and_hash", no_copy)
+    seen = []
+
+    async def fake_run(**kwargs):
+        seen.append((kwargs["video_file_path"], open(kwargs["video_file_path"], "rb").read()))
+        return twelvelabs_client._mock_evidence_pack("vid-1", "s3", kwargs["source_url_for_pack"])
+
+    monkeypatch.setattr(pipeline, "run_analysis_async", fake_run)
+    noirvision = MagicMock()
+    noirvision.analyze_video_with_claim = AsyncMock(return_value=_mock_report())
+    noirvision.generate_formatted_report = MagicMock(return_value="REPORT")
+    noirvision.start_claim_parse = MagicMock(return_value=None)
+    monkeypatch.setattr(main, "noirvision", noirvision)
+    data = os.urandom(3 * 1024 * 1024)  # past Starlette's 1MB in-memory spool
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/analyze/complete",
+                data={"claim": "He ran."},
+                files={"video_file": ("bodycam.mov", data, "video/quicktime")},
+            )
+
+    r = asyncio.run(post())
+    assert r.status_code == 200
+    (path, body), = seen
+    assert Path(path).parent == tmp_path and Path(path).suffix == ".mov"
+    assert body == data
+    assert list(tmp_path.iterdir()) == []